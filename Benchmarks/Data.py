@@ -0,0 +1,170 @@
+import datetime
+import decimal
+import random
+
+import MySQL
+import Payroll
+
+# Synthetic payroll data for the benchmarks. The same employee count, seed and years always produce the same
+# database, so timings from different commits are measured on identical data.
+
+Sizes = {"small": 10, "medium": 1000, "large": 50000}
+# Employees in each company size
+
+DefaultSeed = 1
+
+DefaultYears = 2
+# Years of payments generated
+
+EndYear = 2024
+# The last year of payments. Fixed instead of the current year, so a dataset does not change with the calendar
+
+PayIntervals = ("Weekly", "BiWeekly", "Monthly")
+IntervalWeights = (3, 4, 3)
+# How often employees are given each pay interval
+
+IntervalWeeks = {"Weekly": 1, "BiWeekly": 2, "Monthly": 4}
+# Weeks of hours in one paycheck of each interval, for hourly employees
+
+HourlyShare = .3
+# Fraction of employees paid by the hour instead of a salary
+
+SelfEmployedShare = .1
+# Fraction of employees paid as self-employed, like ministers
+
+HiddenShare = .05
+# Fraction of employees hidden after their payments are made, like former staff
+
+EmployeeBatch = 1000
+# Employees added per transaction
+
+PaymentTime = "09:00:00"
+
+Positions = (("Pastor", 52000, 18000), ("Associate Pastor", 41000, 12000), ("Secretary", 32000, 0),
+             ("Custodian", 0, 0), ("Music Director", 28000, 0), ("Youth Director", 30000, 6000))
+# (name, salary, housing allowance) of every position
+
+FirstNames = ("James", "Mary", "Robert", "Patricia", "John", "Jennifer", "Michael", "Linda", "David", "Elizabeth",
+              "William", "Barbara", "Richard", "Susan", "Joseph", "Jessica", "Thomas", "Sarah", "Carlos", "Karen",
+              "Daniel", "Lisa", "Matthew", "Nancy", "Anthony", "Betty", "Mark", "Sandra", "Wei", "Ashley")
+
+LastNames = ("Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez", "Martinez",
+             "Hernandez", "Lopez", "Gonzalez", "Wilson", "Anderson", "Thomas", "Taylor", "Moore", "Jackson", "Martin",
+             "Lee", "Perez", "Thompson", "White", "Harris", "Sanchez", "Clark", "Ramirez", "Lewis", "Nguyen")
+
+Streets = ("Main St", "Oak Ave", "Church Rd", "Maple Dr", "Cedar Ln", "Elm St", "Park Blvd", "Washington Ave")
+
+Cities = (("Springfield", "IL", "62701"), ("Franklin", "TN", "37064"), ("Greenville", "SC", "29601"),
+          ("Madison", "WI", "53703"), ("Salem", "OR", "97301"), ("Georgetown", "TX", "78626"))
+
+
+def money(rng, low, high):
+    # A random dollar amount from low to high, in cents
+    return decimal.Decimal(rng.randrange(low * 100, high * 100 + 1)) / 100
+
+
+def makeEmployee(rng, positions):
+    """ Returns the addEmployee() arguments of one random employee. positions is a list of (PositionID, salary,
+    housing allowance) """
+
+    PositionID, salary, housing = rng.choice(positions)
+    hourly = salary == 0 or rng.random() < HourlyShare
+    selfEmployed = rng.random() < SelfEmployedShare
+    salary = decimal.Decimal(0) if hourly else money(rng, int(salary) * 4 // 5, int(salary) * 6 // 5)
+    FN = rng.choice(FirstNames)
+    LN = rng.choice(LastNames)
+    city, state, ZIP = rng.choice(Cities)
+    return {
+        "EmployeeFN": FN,
+        "EmployeeLN": LN,
+        "PositionID": PositionID,
+        "EmployeeSalary": salary,
+        "EmployeeHourlyRate": money(rng, 12, 40) if hourly else decimal.Decimal(0),
+        "EmployeePayInterval": rng.choices(PayIntervals, IntervalWeights)[0],
+        "EmployeeIsSE": 1 if selfEmployed else 0,
+        "EmployeeHousingAllowance": decimal.Decimal(housing) if housing and not hourly else decimal.Decimal(0),
+        "EmployeeHSA": decimal.Decimal(rng.choice((0, 0, 0, 600, 1200))),
+        "EmployeeFedWH": (salary / 10).quantize(decimal.Decimal("0.01")),
+        "EmployeeSEWH": (salary * decimal.Decimal(".15")).quantize(decimal.Decimal("0.01")) if selfEmployed
+        else decimal.Decimal(0),
+        "EmployeeStreetNum": rng.randint(1, 9999),
+        "EmployeeStreetName": rng.choice(Streets),
+        "EmployeeCity": city,
+        "EmployeeState": state,
+        "EmployeeZIP": ZIP,
+        "EmployeePrimaryEmail": (FN + "." + LN + str(rng.randint(1, 999)) + "@example.com").lower(),
+        "EmployeeGender": rng.choice("MF"),
+        "EmployeeMaritalStatus": rng.choice("SM"),
+        "EmployeeBirthdate": datetime.date(rng.randint(1950, 2000), rng.randint(1, 12), rng.randint(1, 28)),
+    }
+
+
+def getPayDates(years):
+    """ Returns every (date, pay interval) of the last years years up to EndYear, in date order. Weekly employees are
+    paid every Friday, biweekly ones every other Friday and monthly ones on the 28th """
+
+    start = datetime.date(EndYear - years + 1, 1, 1)
+    end = datetime.date(EndYear, 12, 31)
+    # The first Friday
+    friday = start + datetime.timedelta((4 - start.weekday()) % 7)
+
+    payDates = []
+    week = 0
+    while friday <= end:
+        payDates.append((friday, "Weekly"))
+        if week % 2 == 0:
+            payDates.append((friday, "BiWeekly"))
+        friday += datetime.timedelta(7)
+        week += 1
+    for year in range(start.year, EndYear + 1):
+        for month in range(1, 13):
+            payDates.append((datetime.date(year, month, 28), "Monthly"))
+    payDates.sort()
+    return payDates
+
+
+def generate(employeeCount, seed=DefaultSeed, years=DefaultYears, progress=None):
+    """ Fills the current database, which must be migrated and empty, with a company of employeeCount employees and
+    years years of their payments. Payments are made through Payroll like a real pay run, so the running YTD totals
+    are filled in as well. progress is called as progress(text) between steps. Returns the number of payments made """
+
+    rng = random.Random(seed)
+
+    with MySQL.transaction():
+        for name, salary, housing in Positions:
+            MySQL.addPosition(name, decimal.Decimal(salary), decimal.Decimal(0), decimal.Decimal(housing),
+                              decimal.Decimal(0), decimal.Decimal(0), decimal.Decimal(0), "Monthly", 0)
+    positions = sorted(MySQL.getPositionPage(hidden=None), key=lambda position: position.PositionID)
+    positions = [(position.PositionID, position.PositionSalary, position.PositionHousingAllowance)
+                 for position in positions]
+
+    for first in range(0, employeeCount, EmployeeBatch):
+        with MySQL.transaction():
+            for index in range(first, min(first + EmployeeBatch, employeeCount)):
+                MySQL.addEmployee(**makeEmployee(rng, positions))
+        if progress is not None:
+            progress(str(min(first + EmployeeBatch, employeeCount)) + " of " + str(employeeCount) + " employees")
+
+    employees = sorted(MySQL.getEmployeePage(hidden=None), key=lambda employee: employee.EmployeeID)
+    byInterval = {interval: [employee for employee in employees if employee.EmployeePayInterval == interval]
+                  for interval in PayIntervals}
+
+    payments = 0
+    payDates = getPayDates(years)
+    for index, (payDate, interval) in enumerate(payDates):
+        paid = byInterval[interval]
+        hours = {}
+        for employee in paid:
+            if employee.EmployeeHourlyRate:
+                weeks = IntervalWeeks[interval]
+                hours[employee.EmployeeID] = decimal.Decimal(rng.randint(15 * weeks, 45 * weeks))
+        paychecks = Payroll.calculatePayroll(paid, hours)
+        payments += Payroll.submitPayroll(paychecks, payDate, PaymentTime)
+        if progress is not None and (index + 1) % 25 == 0:
+            progress(str(index + 1) + " of " + str(len(payDates)) + " pay runs, " + str(payments) + " payments")
+
+    with MySQL.transaction():
+        for employee in rng.sample(employees, int(len(employees) * HiddenShare)):
+            MySQL.hideEmployee(employee.EmployeeID)
+
+    return payments
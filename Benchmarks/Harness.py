@@ -0,0 +1,268 @@
+import datetime
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import time
+import mysql.connector
+
+import Cache
+import Diagnostics
+import Format
+import Generate
+import Migrations
+import MySQL
+import Payroll
+import Storage
+from Benchmarks import Data
+
+# Times OpenPay's slow paths without the GUI, against a generated company (see Data.py) in a SQLite file or a
+# separate MySQL database. Each benchmark is run Warmups times untimed, then Repeats times, starting from empty
+# record caches every time like the first open of a page.
+
+Repeats = 5
+Warmups = 1
+
+DataFolder = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+# Generated SQLite datasets, kept so later runs on the same size, seed and years skip generating them
+
+BenchmarkDatabase = "OpenPayBenchmark"
+# The MySQL database benchmarks run on. It is dropped and generated again, so never point this at real data
+
+PageSize = 100
+# Rows per page of the payments table, as buildPaymentsTable loads them
+
+ScrollPages = 3
+# Pages of the payments table loaded by one paymentsTable run: the first page and two scrolls
+
+SampleSize = 20
+# Payments looked up by the getYTD and paystubBatch benchmarks
+
+Benchmarks = {}
+# Benchmark functions by name, in the order they run. See benchmark()
+
+
+class Rollback(Exception):
+    """ Raised to roll back the pay run saved by the payRunSubmit benchmark """
+
+
+class Sample:
+    """ The records the benchmarks work on, picked with the dataset's seed so every run uses the same ones """
+
+    def __init__(self, seed):
+        rng = random.Random(seed)
+        self.year = Data.EndYear
+        # Payments are drawn by ID rather than loaded, since the large company has millions
+        lastID = MySQL.getMax("Payments", "PaymentID")
+        self.paymentIDs = []
+        while len(self.paymentIDs) < min(SampleSize, lastID):
+            payment = MySQL.getPayment(rng.randint(1, lastID))
+            if payment is not None and payment.EmployeeID is not None and payment.PaymentID not in self.paymentIDs:
+                self.paymentIDs.append(payment.PaymentID)
+        # A weekly employee has the longest payment history
+        employees = [employee for employee in MySQL.getEmployeePage(hidden=False)
+                     if employee.EmployeePayInterval == "Weekly"] or MySQL.getEmployeePage(hidden=False)
+        self.employeeID = min(employee.EmployeeID for employee in employees)
+        self.payDate = datetime.date(self.year + 1, 1, 7)
+
+
+def benchmark(function):
+    """ Decorator registering function(sample) as a benchmark named after it """
+
+    Benchmarks[function.__name__] = function
+    return function
+
+
+def loadPaymentPage(after, rowCount):
+    """ Loads one page of the payments table the way buildPaymentsTable's page loader (OpenPay.PaymentPages) does: the
+    payments and their employees' names, formatted for display. OpenPay.py opens a window when imported, so its loader
+    cannot be called without a display """
+
+    with MySQL.connection():
+        payments = MySQL.getPaymentPage(rowCount, hidden=False, after=after)
+        employees = MySQL.getEmployees([payment.EmployeeID for payment in payments])
+    rows = []
+    for payment in payments:
+        employee = employees.get(payment.EmployeeID)
+        rows.append((payment.PaymentID, [employee.getFN_LN() if employee is not None else None,
+                                         Format.formatDate(payment.PaymentDate),
+                                         Format.formatMoney(payment.PaymentGrossPay),
+                                         Format.formatMoney(payment.PaymentNetPay)]))
+    if not payments:
+        return rows, None
+    return rows, (payments[-1].PaymentDate, payments[-1].PaymentID)
+
+
+@benchmark
+def paymentsTable(sample):
+    """ Opening the payments table and scrolling it twice """
+
+    after = None
+    for page in range(ScrollPages):
+        rows, after = loadPaymentPage(after, PageSize)
+        if after is None:
+            break
+
+
+@benchmark
+def paymentHistory(sample):
+    """ The first page of one employee's payment history with running YTD totals """
+
+    MySQL.getPaymentHistory(sample.employeeID, PageSize)
+
+
+@benchmark
+def quarterlyTables(sample):
+    """ The data of buildQuarterlyTables: every month's totals for one year """
+
+    MySQL.getQuarterlyReport(sample.year)
+
+
+@benchmark
+def getYTD(sample):
+    """ The YTD totals of SampleSize payments, one lookup each as paystubs do """
+
+    for paymentID in sample.paymentIDs:
+        MySQL.getYTDTotals(paymentID)
+
+
+@benchmark
+def generatePaystub(sample):
+    """ Generate.generatePaystub, except the paystub is not opened """
+
+    Generate.savePaystub(sample.paymentIDs[0])
+
+
+@benchmark
+def paystubBatch(sample):
+    """ Generate.generatePaystubs for SampleSize payments, rendered in this process """
+
+    Generate.generatePaystubs(paymentIDs=sample.paymentIDs, processes=1)
+
+
+@benchmark
+def payRunPreview(sample):
+    """ Computing a pay run for every visible employee, as the Run Payroll page previews it """
+
+    Payroll.preparePayroll()
+
+
+@benchmark
+def payRunSubmit(sample):
+    """ Computing and saving a pay run for every visible employee. The run is rolled back afterwards, so every repeat
+    sees the same data; the rollback is part of the time """
+
+    try:
+        with MySQL.transaction():
+            Payroll.runPayroll(sample.payDate, Data.PaymentTime)
+            raise Rollback()
+    except Rollback:
+        pass
+
+
+def getDatasetName(size, seed, years):
+    # The name a dataset is saved under
+    return size + "-seed" + str(seed) + "-" + str(years) + "y"
+
+
+def openDataset(backend, size, seed=Data.DefaultSeed, years=Data.DefaultYears, progress=print):
+    """ Points MySQL.py at a generated company of the given size ("small", "medium" or "large"), generating it first
+    if needed. backend is "sqlite" for a file in DataFolder, or "mysql" for BenchmarkDatabase on the server in
+    MySQL.ServerLogin, which is generated again on every run """
+
+    if backend == "mysql":
+        MySQL.useBackend(Storage.MySQLBackend(MySQL.ServerLogin, MySQL.PoolSize, MySQL.ConnectAttempts,
+                                              MySQL.ReconnectDelay, onReset=MySQL.dropStatements,
+                                              database=BenchmarkDatabase))
+        dropDatabase()
+        buildDataset(size, seed, years, progress)
+        return
+
+    path = os.path.join(DataFolder, getDatasetName(size, seed, years) + ".db")
+    if not os.path.exists(path):
+        os.makedirs(DataFolder, exist_ok=True)
+        # Generated under another name and renamed when done, so an interrupted run is not mistaken for a dataset
+        partial = path + ".partial"
+        for leftover in (partial, partial + "-wal", partial + "-shm"):
+            if os.path.exists(leftover):
+                os.remove(leftover)
+        backend = Storage.SQLiteBackend(partial)
+        MySQL.useBackend(backend)
+        buildDataset(size, seed, years, progress)
+        backend.close()
+        os.replace(partial, path)
+    MySQL.useBackend(Storage.SQLiteBackend(path))
+
+
+def dropDatabase():
+    # Drops BenchmarkDatabase, to generate it again from nothing
+    backend = MySQL.getBackend()
+    serverConnection = mysql.connector.connect(**backend.login)
+    serverCursor = serverConnection.cursor()
+    serverCursor.execute("DROP DATABASE IF EXISTS " + backend.database)
+    serverCursor.close()
+    serverConnection.close()
+
+
+def buildDataset(size, seed, years, progress):
+    # Creates the schema and generates the company into the current database
+    start = time.perf_counter()
+    progress("Generating the " + size + " dataset (" + str(Data.Sizes[size]) + " employees, " + str(years) +
+             " years, seed " + str(seed) + ")")
+    Migrations.migrate()
+    payments = Data.generate(Data.Sizes[size], seed, years, progress)
+    progress("Generated " + str(payments) + " payments in " + str(round(time.perf_counter() - start, 1)) +
+             " seconds")
+
+
+def runBenchmark(name, sample, repeats=Repeats, warmups=Warmups):
+    """ Runs the benchmark called name and returns its results: wall time in milliseconds (median, min and max of the
+    repeats), and the queries and rows of one run as counted by Diagnostics """
+
+    function = Benchmarks[name]
+    for repeat in range(warmups):
+        Cache.clearAll()
+        function(sample)
+
+    times = []
+    queries = 0
+    rows = 0
+    for repeat in range(repeats):
+        Cache.clearAll()
+        Diagnostics.reset()
+        start = time.perf_counter()
+        with Diagnostics.action(name):
+            function(sample)
+        times.append(time.perf_counter() - start)
+        stats = Diagnostics.getReport()["actions"].get(name, {})
+        queries = max(queries, stats.get("queries", 0))
+        rows = max(rows, stats.get("rows", 0))
+
+    return {"ms": round(statistics.median(times) * 1000, 3), "minMs": round(min(times) * 1000, 3),
+            "maxMs": round(max(times) * 1000, 3), "repeats": repeats, "queries": queries, "rows": rows}
+
+
+def run(names=None, seed=Data.DefaultSeed, repeats=Repeats, progress=print):
+    """ Runs the benchmarks called names (every benchmark by default) on the current dataset. Returns {name: results}.
+    Paystubs are written to a temporary folder that is deleted afterwards """
+
+    sample = Sample(seed)
+    paystubFolder = Generate.PaystubFolder
+    Generate.PaystubFolder = tempfile.mkdtemp(prefix="OpenPayBenchmark")
+    try:
+        results = {}
+        for name in names or list(Benchmarks):
+            results[name] = runBenchmark(name, sample, repeats)
+            progress(formatResult(name, results[name]))
+        return results
+    finally:
+        shutil.rmtree(Generate.PaystubFolder, ignore_errors=True)
+        Generate.PaystubFolder = paystubFolder
+
+
+def formatResult(name, result):
+    """ Returns one line describing a benchmark's results """
+
+    return (name.ljust(16) + str(result["ms"]).rjust(12) + " ms  (min " + str(result["minMs"]) + ")  " +
+            str(result["queries"]).rjust(6) + " queries  " + str(result["rows"]).rjust(8) + " rows")
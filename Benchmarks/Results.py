@@ -0,0 +1,111 @@
+import datetime
+import json
+import os
+import platform
+import subprocess
+
+# Benchmark results are kept one run per line in ResultsFile, as JSON:
+#
+# {"commit": "1a2b3c4", "dirty": false, "time": "...", "python": "3.11.4", "machine": "...", "backend": "sqlite",
+#  "size": "medium", "employees": 1000, "seed": 1, "years": 2, "repeats": 5,
+#  "results": {"paymentsTable": {"ms": ..., "minMs": ..., "maxMs": ..., "repeats": 5, "queries": 6, "rows": 300}}}
+#
+# Appending a line per run keeps the history of every commit measured, and compare() checks a run against the last
+# run of another commit on the same machine, backend and dataset.
+
+ResultsFile = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results.jsonl")
+
+Tolerance = .2
+# Fraction a benchmark's median time may grow before compare() reports it as a regression. Query counts do not vary
+# between runs, so any increase in queries is reported
+
+
+def getCommit():
+    """ Returns (short commit hash, True if the working tree has uncommitted changes), or (None, False) outside a git
+    checkout """
+
+    folder = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=folder, capture_output=True, text=True,
+                                check=True).stdout.strip()
+        status = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=folder,
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None, False
+    return commit, bool(status)
+
+
+def makeRun(results, backend, size, employees, seed, years, repeats):
+    """ Returns the record of one benchmark run, with the commit and machine it ran on """
+
+    commit, dirty = getCommit()
+    return {"commit": commit, "dirty": dirty, "time": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(), "machine": platform.node() + " " + platform.machine(),
+            "backend": backend, "size": size, "employees": employees, "seed": seed, "years": years,
+            "repeats": repeats, "results": results}
+
+
+def save(run, path=ResultsFile):
+    """ Appends run to the results file """
+
+    with open(path, "a") as file:
+        file.write(json.dumps(run, sort_keys=True) + "\n")
+
+
+def load(path=ResultsFile):
+    """ Returns every run in the results file, oldest first """
+
+    if not os.path.exists(path):
+        return []
+    with open(path) as file:
+        return [json.loads(line) for line in file if line.strip()]
+
+
+def isComparable(run, other):
+    # Runs can only be compared on the same machine, backend and dataset
+    return all(run.get(key) == other.get(key) for key in ("machine", "backend", "size", "seed", "years"))
+
+
+def findBaseline(runs, run, commit=None):
+    """ Returns the latest run in runs comparable to run, from commit if given, else from any other commit than run's.
+    Returns None if there is none """
+
+    for other in reversed(runs):
+        if other is run or not isComparable(run, other):
+            continue
+        if commit is not None:
+            if other["commit"] is not None and other["commit"].startswith(commit):
+                return other
+        elif other["commit"] != run["commit"] or other["dirty"] != run["dirty"]:
+            return other
+    return None
+
+
+def compare(baseline, run, tolerance=Tolerance):
+    """ Compares run against baseline. Returns (lines describing each benchmark, names of the benchmarks that got
+    slower than tolerance allows or run more queries) """
+
+    lines = []
+    regressions = []
+    for name, result in run["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            lines.append(name.ljust(16) + " new")
+            continue
+        change = result["ms"] / before["ms"] - 1 if before["ms"] else 0
+        line = (name.ljust(16) + str(before["ms"]).rjust(12) + " -> " + str(result["ms"]).rjust(12) + " ms " +
+                ("%+.1f%%" % (change * 100)).rjust(8) + "   queries " + str(before["queries"]) + " -> " +
+                str(result["queries"]))
+        if change > tolerance or result["queries"] > before["queries"]:
+            line += "   REGRESSION"
+            regressions.append(name)
+        lines.append(line)
+    return lines, regressions
+
+
+def describe(run):
+    """ Returns a one line description of run """
+
+    return (str(run["commit"]) + ("+changes" if run["dirty"] else "") + " on " + run["time"] + ", " + run["backend"] +
+            " " + run["size"] + " (" + str(run["employees"]) + " employees, " + str(run["years"]) + " years, seed " +
+            str(run["seed"]) + ")")
@@ -0,0 +1,3 @@
+# OpenPay's performance benchmarks. Data.py generates companies to measure against, Harness.py times the slow paths of
+# OpenPay without its window, and Results.py keeps the results of every commit measured. Run python -m Benchmarks from
+# the OpenPay folder (see __main__.py).
@@ -0,0 +1,90 @@
+import argparse
+import sys
+
+from Benchmarks import Data
+from Benchmarks import Harness
+from Benchmarks import Results
+
+# Runs the benchmarks from a command prompt in the OpenPay folder:
+#
+#   py -m Benchmarks run --size medium             times every benchmark and saves the results
+#   py -m Benchmarks run --size small --only getYTD,paymentsTable
+#   py -m Benchmarks compare                       compares the last run against the last run of another commit
+#   py -m Benchmarks generate --size large         only generates a dataset
+#
+# compare exits with status 1 when a benchmark regressed, so it can gate a build.
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(prog="python -m Benchmarks", description="OpenPay performance benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    runParser = commands.add_parser("run", help="time the benchmarks and save the results")
+    generateParser = commands.add_parser("generate", help="generate a dataset without running benchmarks")
+    for command in (runParser, generateParser):
+        command.add_argument("--size", choices=list(Data.Sizes), default="small")
+        command.add_argument("--backend", choices=["sqlite", "mysql"], default="sqlite",
+                             help="sqlite (default) needs no server; mysql uses the " + Harness.BenchmarkDatabase +
+                                  " database, which is dropped and generated again")
+        command.add_argument("--seed", type=int, default=Data.DefaultSeed)
+        command.add_argument("--years", type=int, default=Data.DefaultYears)
+    runParser.add_argument("--repeats", type=int, default=Harness.Repeats)
+    runParser.add_argument("--only", help="comma separated benchmarks to run, from: " + ", ".join(Harness.Benchmarks))
+    runParser.add_argument("--results", default=Results.ResultsFile, help="results file to append to")
+    runParser.add_argument("--no-save", action="store_true", help="print the results without saving them")
+
+    compareParser = commands.add_parser("compare", help="compare the last run against an earlier commit")
+    compareParser.add_argument("--results", default=Results.ResultsFile)
+    compareParser.add_argument("--against", help="commit to compare against (default: the last other commit)")
+    compareParser.add_argument("--tolerance", type=float, default=Results.Tolerance)
+
+    arguments = parser.parse_args(arguments)
+
+    if arguments.command == "compare":
+        return compare(arguments)
+
+    Harness.openDataset(arguments.backend, arguments.size, arguments.seed, arguments.years)
+    if arguments.command == "generate":
+        return 0
+
+    names = None
+    if arguments.only:
+        names = [name.strip() for name in arguments.only.split(",")]
+        unknown = [name for name in names if name not in Harness.Benchmarks]
+        if unknown:
+            parser.error("unknown benchmarks: " + ", ".join(unknown))
+
+    results = Harness.run(names, arguments.seed, arguments.repeats)
+    run = Results.makeRun(results, arguments.backend, arguments.size, Data.Sizes[arguments.size], arguments.seed,
+                          arguments.years, arguments.repeats)
+    if not arguments.no_save:
+        Results.save(run, arguments.results)
+        print("Saved to " + arguments.results)
+    return 0
+
+
+def compare(arguments):
+    # The compare command
+    runs = Results.load(arguments.results)
+    if not runs:
+        print("No results in " + arguments.results + " yet. Use: python -m Benchmarks run")
+        return 0
+    run = runs[-1]
+    baseline = Results.findBaseline(runs, run, arguments.against)
+    if baseline is None:
+        print("No earlier run to compare " + Results.describe(run) + " against")
+        return 0
+
+    print("Before: " + Results.describe(baseline))
+    print("After:  " + Results.describe(run))
+    lines, regressions = Results.compare(baseline, run, arguments.tolerance)
+    for line in lines:
+        print(line)
+    if regressions:
+        print(str(len(regressions)) + " regressions: " + ", ".join(regressions))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,141 @@
+import collections
+import threading
+
+DefaultSize = 1024
+# Entries kept by a cache when no size is given
+
+Caches = {}
+# Every EntityCache by name, for statistics and clearAll()
+
+Missing = object()
+# Returned by EntityCache.get() for keys that are not cached, since None can be a cached value
+
+
+class EntityCache:
+    """ A bounded, least recently used cache of database rows, ex. Employee records by EmployeeID.
+
+    OpenPay is the only program writing its database, so entries stay valid until the MySQL.py function that changes
+    them calls invalidate(). When the cache is full, the entry used longest ago is evicted. Safe to use from
+    several threads.
+
+    A value read from the database can be out of date by the time it is put, if another thread changed and
+    invalidated its row in between. Callers take getGeneration() before reading and pass it to put(), which skips the
+    value if its key was invalidated (or the cache cleared) since """
+
+    def __init__(self, name, maxSize=DefaultSize):
+        self.name = name
+        self.maxSize = maxSize
+        self.entries = collections.OrderedDict()
+        self.lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.generation = 0
+        # Counts every invalidate() and clear()
+        self.invalidated = {}
+        # The generation each key was last invalidated at, since the last clear()
+        self.cleared = 0
+        # The generation of the last clear()
+        self.stale = 0
+
+    def get(self, key):
+        """ Returns the value cached for key, or Missing """
+
+        with self.lock:
+            value = self.entries.get(key, Missing)
+            if value is Missing:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self.entries.move_to_end(key)
+            return value
+
+    def getMany(self, keys):
+        """ Looks up every key in keys at once. Returns ({key: value} for the cached keys, [keys not cached]) """
+
+        found = {}
+        missing = []
+        with self.lock:
+            for key in keys:
+                value = self.entries.get(key, Missing)
+                if value is Missing:
+                    missing.append(key)
+                else:
+                    found[key] = value
+                    self.entries.move_to_end(key)
+            self.hits += len(found)
+            self.misses += len(missing)
+        return found, missing
+
+    def getGeneration(self):
+        """ Returns the current generation, to pass to put() for a value about to be read """
+
+        with self.lock:
+            return self.generation
+
+    def put(self, key, value, generation=None):
+        """ Caches value under key, evicting the least recently used entries if the cache is full. If generation (from
+        getGeneration() before value was read) is given and key was invalidated since, value is stale and not cached.
+        Returns whether value was cached """
+
+        with self.lock:
+            if generation is not None and (self.cleared > generation or self.invalidated.get(key, -1) > generation):
+                self.stale += 1
+                return False
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxSize:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+            return True
+
+    def invalidate(self, key):
+        """ Drops the entry for key, if it is cached, and keeps values of key read before now from being put """
+
+        with self.lock:
+            self.generation += 1
+            self.invalidated[key] = self.generation
+            if self.entries.pop(key, Missing) is not Missing:
+                self.invalidations += 1
+
+    def clear(self):
+        """ Drops every entry, and keeps values read before now from being put """
+
+        with self.lock:
+            self.generation += 1
+            self.cleared = self.generation
+            self.invalidated.clear()
+            self.invalidations += len(self.entries)
+            self.entries.clear()
+
+    def stats(self):
+        """ Returns the cache's counters as a dictionary, with the hit rate as a fraction of lookups """
+
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {"size": len(self.entries), "maxSize": self.maxSize, "hits": self.hits, "misses": self.misses,
+                    "hitRate": self.hits / lookups if lookups else 0.0, "evictions": self.evictions,
+                    "invalidations": self.invalidations, "stale": self.stale}
+
+
+def getCache(name, maxSize=DefaultSize):
+    """ Returns the EntityCache called name, creating it with maxSize entries on first use """
+
+    if name not in Caches:
+        Caches[name] = EntityCache(name, maxSize)
+    return Caches[name]
+
+
+def getStats():
+    """ Returns {cache name: statistics} for every cache """
+
+    return {name: cache.stats() for name, cache in Caches.items()}
+
+
+def clearAll():
+    """ Empties every cache. Used when a transaction is rolled back, since rows read inside it may not have been
+    saved """
+
+    for cache in Caches.values():
+        cache.clear()
@@ -0,0 +1,308 @@
+import bisect
+import contextlib
+import functools
+import json
+import re
+import threading
+import time
+
+# Records every statement MySQL.py runs: its fingerprint (the SQL with values and IN lists taken out, so repeated
+# queries of the same shape group together), how long it took, the rows it returned and the GUI action that caused
+# it. See getReport() for what is kept, and dump() to save it as JSON for comparing releases.
+
+Enabled = True
+# Turns recording off when False. Statements still run through Cursor, but are not timed
+
+NPlusOneThreshold = 10
+# Times one SELECT shape may run within a single action before the action is flagged as a likely N+1 query pattern,
+# ex. loading a table by fetching each row with its own query
+
+LatencyBuckets = (.1, .25, .5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+# Upper bounds, in milliseconds, of the latency histogram kept for each statement. Slower statements are counted
+# past the last bucket
+
+FingerprintCacheSize = 4096
+# Fingerprints kept for statements already seen, so each SQL string is normalized once
+
+NoAction = "(none)"
+# Action statements are recorded under when no action is running, ex. ones run from a Python console
+
+Fingerprints = {}
+# Fingerprints by statement
+
+Statements = {}
+# Statistics by fingerprint, as {"count", "rows", "seconds", "maxSeconds", "buckets", "actions": {action: count}}
+
+Actions = {}
+# Statistics by action, as {"runs", "queries", "rows", "seconds", "maxQueries"}
+
+Suspects = {}
+# Likely N+1 patterns by (action, fingerprint), as {"runs": actions flagged, "maxRepeats": most runs in one action}
+
+lock = threading.Lock()
+# Guards the statistics above, which every thread records into
+
+state = threading.local()
+# state.invocation is the Invocation of the action running on the calling thread
+
+
+class Invocation:
+    """ One run of a GUI action, ex. one click of View Payments. Work the action hands to a Worker.Worker carries its
+    Invocation along, so statements run on worker threads are counted against the action that asked for them """
+
+    __slots__ = ("name", "queries", "selects")
+
+    def __init__(self, name):
+        self.name = name
+        self.queries = 0
+        # SELECT fingerprint: times run, for N+1 detection
+        self.selects = {}
+
+
+def current():
+    """ Returns the Invocation running on the calling thread, or None """
+
+    return getattr(state, "invocation", None)
+
+
+@contextlib.contextmanager
+def within(invocation):
+    """ Runs the block as part of invocation (an Invocation from current(), or None), ex. on a worker thread """
+
+    previous = current()
+    state.invocation = invocation
+    try:
+        yield invocation
+    finally:
+        state.invocation = previous
+
+
+@contextlib.contextmanager
+def action(name):
+    """ Records the statements run inside the block, and by work it submits to a Worker, as one run of the action
+    called name. Inside another action the block is part of that one, so an action is named after what the user
+    did """
+
+    invocation = current()
+    if invocation is not None:
+        yield invocation
+        return
+
+    invocation = Invocation(name)
+    if Enabled:
+        with lock:
+            stats = Actions.get(name)
+            if stats is None:
+                stats = Actions[name] = {"runs": 0, "queries": 0, "rows": 0, "seconds": 0.0, "maxQueries": 0}
+            stats["runs"] += 1
+    with within(invocation):
+        yield invocation
+
+
+def tracked(function):
+    """ Decorator running every call of function as an action named after it, ex. OpenPay.openPayments """
+
+    @functools.wraps(function)
+    def run(*args, **kwargs):
+        with action(function.__name__):
+            return function(*args, **kwargs)
+    return run
+
+
+def fingerprint(statement):
+    """ Returns statement with its values replaced by ? and its IN lists by IN (...), so statements of the same shape
+    have the same fingerprint """
+
+    shape = Fingerprints.get(statement)
+    if shape is None:
+        shape = " ".join(statement.split())
+        shape = re.sub(r"'(?:[^'\\]|\\.)*'", "?", shape)
+        shape = re.sub(r"(?<![\w.])\d+(?:\.\d+)?\b", "?", shape)
+        shape = shape.replace("%s", "?")
+        shape = re.sub(r"\bIN \(\?(?:, \?)*\)", "IN (...)", shape)
+        if len(Fingerprints) >= FingerprintCacheSize:
+            Fingerprints.clear()
+        Fingerprints[statement] = shape
+    return shape
+
+
+def record(statement, seconds, rows):
+    """ Records one run of statement that took seconds and returned or changed rows rows """
+
+    shape = fingerprint(statement)
+    invocation = current()
+    name = NoAction if invocation is None else invocation.name
+    with lock:
+        stats = Statements.get(shape)
+        if stats is None:
+            stats = Statements[shape] = {"count": 0, "rows": 0, "seconds": 0.0, "maxSeconds": 0.0,
+                                         "buckets": [0] * (len(LatencyBuckets) + 1), "actions": {}}
+        stats["count"] += 1
+        stats["rows"] += rows
+        stats["seconds"] += seconds
+        stats["maxSeconds"] = max(stats["maxSeconds"], seconds)
+        stats["buckets"][bisect.bisect_left(LatencyBuckets, seconds * 1000)] += 1
+        stats["actions"][name] = stats["actions"].get(name, 0) + 1
+
+        actionStats = Actions.get(name)
+        if actionStats is None:
+            # Statements run outside any action
+            actionStats = Actions[name] = {"runs": 0, "queries": 0, "rows": 0, "seconds": 0.0, "maxQueries": 0}
+        actionStats["queries"] += 1
+        actionStats["rows"] += rows
+        actionStats["seconds"] += seconds
+
+        if invocation is not None:
+            invocation.queries += 1
+            actionStats["maxQueries"] = max(actionStats["maxQueries"], invocation.queries)
+            if shape.startswith("SELECT"):
+                repeats = invocation.selects[shape] = invocation.selects.get(shape, 0) + 1
+                if repeats >= NPlusOneThreshold:
+                    suspect = Suspects.get((name, shape))
+                    if suspect is None:
+                        suspect = Suspects[(name, shape)] = {"runs": 0, "maxRepeats": 0}
+                    if repeats == NPlusOneThreshold:
+                        suspect["runs"] += 1
+                    suspect["maxRepeats"] = max(suspect["maxRepeats"], repeats)
+
+
+def addRows(statement, seconds, rows):
+    """ Adds rows fetched after statement ran, and the seconds spent fetching them, to its last run """
+
+    shape = fingerprint(statement)
+    invocation = current()
+    name = NoAction if invocation is None else invocation.name
+    with lock:
+        stats = Statements.get(shape)
+        if stats is not None:
+            stats["rows"] += rows
+            stats["seconds"] += seconds
+        actionStats = Actions.get(name)
+        if actionStats is not None:
+            actionStats["rows"] += rows
+            actionStats["seconds"] += seconds
+
+
+class Cursor:
+    """ Wraps a database cursor from Storage, recording every statement it runs. MySQL.py wraps each cursor it hands
+    out, so every execution path is recorded """
+
+    def __init__(self, cursor):
+        self.cursor = cursor
+        self.statement = None
+
+    def __getattr__(self, name):
+        return getattr(self.cursor, name)
+
+    def __iter__(self):
+        return iter(self.fetchall())
+
+    def execute(self, statement, params=()):
+        if not Enabled:
+            return self.cursor.execute(statement, params)
+        self.statement = statement
+        start = time.perf_counter()
+        try:
+            return self.cursor.execute(statement, params)
+        finally:
+            # Rows of a SELECT are counted as they are fetched
+            returnsRows = getattr(self.cursor, "description", None) is not None
+            record(statement, time.perf_counter() - start, 0 if returnsRows else max(self.cursor.rowcount or 0, 0))
+
+    def executemany(self, statement, rows):
+        if not Enabled:
+            return self.cursor.executemany(statement, rows)
+        self.statement = None
+        start = time.perf_counter()
+        try:
+            return self.cursor.executemany(statement, rows)
+        finally:
+            record(statement, time.perf_counter() - start, max(self.cursor.rowcount or 0, 0))
+
+    def fetchone(self):
+        start = time.perf_counter()
+        row = self.cursor.fetchone()
+        if Enabled and self.statement is not None:
+            addRows(self.statement, time.perf_counter() - start, 0 if row is None else 1)
+        return row
+
+    def fetchmany(self, size):
+        start = time.perf_counter()
+        rows = self.cursor.fetchmany(size)
+        if Enabled and self.statement is not None:
+            addRows(self.statement, time.perf_counter() - start, len(rows))
+        return rows
+
+    def fetchall(self):
+        start = time.perf_counter()
+        rows = self.cursor.fetchall()
+        if Enabled and self.statement is not None:
+            addRows(self.statement, time.perf_counter() - start, len(rows))
+        return rows
+
+
+def bucketLabels():
+    # Histogram labels, ex. "<=0.5ms", with ">2500ms" for the last bucket
+    return ["<=" + str(bound) + "ms" for bound in LatencyBuckets] + [">" + str(LatencyBuckets[-1]) + "ms"]
+
+
+def percentile(buckets, fraction):
+    # Returns the upper bound in milliseconds of the bucket holding the fraction (ex. .95) slowest run, or None past
+    # the last bucket
+    target = fraction * sum(buckets)
+    seen = 0
+    for index, count in enumerate(buckets):
+        seen += count
+        if count and seen >= target:
+            return LatencyBuckets[index] if index < len(LatencyBuckets) else None
+    return 0
+
+
+def getReport():
+    """ Returns everything recorded as a dictionary of plain values, sorted so two reports can be diffed:
+
+    actions: {action: runs, queries, rows, ms, queriesPerRun, maxQueries}
+    statements: {fingerprint: count, rows, ms, meanMs, p50Ms, p95Ms, maxMs, histogram, actions}
+    nPlusOne: [{action, statement, runs, maxRepeats}], most repeats first """
+
+    labels = bucketLabels()
+    with lock:
+        actions = {}
+        for name, stats in Actions.items():
+            actions[name] = {"runs": stats["runs"], "queries": stats["queries"], "rows": stats["rows"],
+                             "ms": round(stats["seconds"] * 1000, 3), "maxQueries": stats["maxQueries"],
+                             "queriesPerRun": round(stats["queries"] / stats["runs"], 2) if stats["runs"] else None}
+        statements = {}
+        for shape, stats in Statements.items():
+            statements[shape] = {"count": stats["count"], "rows": stats["rows"],
+                                 "ms": round(stats["seconds"] * 1000, 3),
+                                 "meanMs": round(stats["seconds"] * 1000 / stats["count"], 3),
+                                 "p50Ms": percentile(stats["buckets"], .5), "p95Ms": percentile(stats["buckets"], .95),
+                                 "maxMs": round(stats["maxSeconds"] * 1000, 3),
+                                 "histogram": {label: count for label, count in zip(labels, stats["buckets"]) if count},
+                                 "actions": dict(stats["actions"])}
+        nPlusOne = [{"action": name, "statement": shape, "runs": suspect["runs"], "maxRepeats": suspect["maxRepeats"]}
+                    for (name, shape), suspect in Suspects.items()]
+    nPlusOne.sort(key=lambda suspect: (-suspect["maxRepeats"], suspect["action"], suspect["statement"]))
+    return {"actions": actions, "statements": statements, "nPlusOne": nPlusOne}
+
+
+def reset():
+    """ Forgets everything recorded """
+
+    with lock:
+        Statements.clear()
+        Actions.clear()
+        Suspects.clear()
+
+
+def dump(path, extra=None):
+    """ Saves getReport(), and the sections in the dictionary extra (ex. cache statistics), to path as JSON with sorted
+    keys, so dumps from two releases can be compared with any diff tool """
+
+    report = getReport()
+    if extra:
+        report.update(extra)
+    with open(path, "w") as file:
+        json.dump(report, file, indent=2, sort_keys=True, default=str)
+        file.write("\n")
@@ -0,0 +1,37 @@
+Listeners = {}
+# Callbacks by event name. See subscribe()
+
+Kinds = ("employee", "payment", "position")
+# The kinds of record events are sent for
+
+Actions = ("added", "changed", "hidden", "revealed", "deleted")
+# What happened to the record. An event name is a kind and an action, ex. "payment-hidden"
+
+
+def subscribe(event, callback):
+    """ Calls callback(event, ID) whenever event is sent. ID is the ID of the record that changed, or None when many
+    records changed at once (ex. a whole pay run added). Pass "*" as event to receive every event """
+
+    Listeners.setdefault(event, []).append(callback)
+
+
+def subscribeKind(kind, callback):
+    """ Subscribes callback to every event of kind, ex. "employee" """
+
+    for action in Actions:
+        subscribe(kind + "-" + action, callback)
+
+
+def unsubscribe(event, callback):
+    """ Stops calling callback for event """
+
+    if callback in Listeners.get(event, []):
+        Listeners[event].remove(callback)
+
+
+def emit(event, ID=None):
+    """ Calls every callback subscribed to event. MySQL.py sends its events once the change is committed, so callbacks
+    can read the new rows """
+
+    for callback in list(Listeners.get(event, [])) + list(Listeners.get("*", [])):
+        callback(event, ID)
@@ -0,0 +1,204 @@
+import argparse
+import csv
+import decimal
+import gzip
+import json
+import os
+import sys
+import time
+
+import Format
+import MySQL
+
+# Exports the payments ledger (every payment with its employee's name and position, see MySQL.LedgerColumns) to CSV,
+# JSON Lines or Parquet files, ex. for an accountant's spreadsheet instead of copying totals off the quarterly page.
+# Rows are streamed from the database (MySQL.streamLedger) and written a batch at a time, so exporting a ledger of
+# millions of payments takes as little memory as exporting a month.
+#
+# The format follows the file name: .csv, .jsonl or .parquet, with .gz after CSV or JSON Lines to gzip them
+# (ledger.csv.gz). Parquet files are compressed inside instead, with gzip when asked.
+#
+# From a command prompt in the OpenPay folder: py Export.py ledger.csv --from 2024-01-01 --to 2024-12-31
+
+Formats = ("csv", "jsonl", "parquet")
+
+MoneyColumns = ("PaymentHours", "PaymentGrossPay", "PaymentHousing", "PaymentHSA", "PaymentSSTax",
+                "PaymentMedicareTax", "PaymentSETax", "PaymentFedWH", "PaymentNetPay")
+# Ledger columns holding DECIMAL(15,2) amounts
+
+TextColumns = ("EmployeeFN", "EmployeeLN", "PositionName")
+# Ledger columns holding text. The rest are whole numbers, except PaymentDate and PaymentTime
+
+TimeFormat = "%H:%M:%S"
+# How PaymentTime is written
+
+
+def getFormat(path):
+    """ Returns (format, gzipped) for the file name path, ex. ("csv", True) for ledger.csv.gz. Raises ValueError for
+    other file names """
+
+    name = path.lower()
+    gzipped = name.endswith(".gz")
+    if gzipped:
+        name = name[:-3]
+    for fileFormat in Formats:
+        if name.endswith("." + fileFormat):
+            return fileFormat, gzipped
+    raise ValueError("Export files must end in .csv, .jsonl or .parquet, optionally followed by .gz")
+
+
+DateIndex = MySQL.LedgerColumns.index("PaymentDate")
+TimeIndex = MySQL.LedgerColumns.index("PaymentTime")
+
+
+def convertRow(row):
+    # Returns a ledger row with PaymentDate as YYYY-MM-DD and PaymentTime (a timedelta on MySQL) as TimeFormat text
+    row = list(row)
+    if row[DateIndex] is not None:
+        row[DateIndex] = row[DateIndex].isoformat()
+    if row[TimeIndex] is not None:
+        row[TimeIndex] = Format.parseTime(row[TimeIndex]).strftime(TimeFormat)
+    return row
+
+
+class CSVWriter:
+    """ Writes ledger rows to a CSV file with a header row. Amounts are written exactly, ex. 1250.00 """
+
+    def __init__(self, path, gzipped, compression):
+        self.file = gzip.open(path, "wt", newline="") if gzipped else open(path, "w", newline="")
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(MySQL.LedgerColumns)
+
+    def write(self, rows):
+        self.writer.writerows(convertRow(row) for row in rows)
+
+    def close(self):
+        self.file.close()
+
+
+class JSONLinesWriter:
+    """ Writes ledger rows to a JSON Lines file, one object keyed by LedgerColumns per line. Amounts are JSON numbers;
+    DECIMAL(15,2) has at most 15 digits, so every amount reads back as the same number of cents """
+
+    def __init__(self, path, gzipped, compression):
+        self.file = gzip.open(path, "wt") if gzipped else open(path, "w")
+
+    def write(self, rows):
+        lines = []
+        for row in rows:
+            row = convertRow(row)
+            record = {}
+            for column, value in zip(MySQL.LedgerColumns, row):
+                record[column] = float(value) if isinstance(value, decimal.Decimal) else value
+            lines.append(json.dumps(record) + "\n")
+        self.file.writelines(lines)
+
+    def close(self):
+        self.file.close()
+
+
+class ParquetWriter:
+    """ Writes ledger rows to a Parquet file, one row group per batch. Amounts are stored as decimal(15, 2), PaymentDate
+    as a date and PaymentTime as a time of day. Needs pyarrow (pip install pyarrow) """
+
+    def __init__(self, path, gzipped, compression):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ValueError("Exporting Parquet files needs pyarrow. Run: pip install pyarrow") from None
+
+        self.pyarrow = pyarrow
+        fields = []
+        for column in MySQL.LedgerColumns:
+            if column in MoneyColumns:
+                fields.append(pyarrow.field(column, pyarrow.decimal128(15, 2)))
+            elif column in TextColumns:
+                fields.append(pyarrow.field(column, pyarrow.string()))
+            elif column == "PaymentDate":
+                fields.append(pyarrow.field(column, pyarrow.date32()))
+            elif column == "PaymentTime":
+                fields.append(pyarrow.field(column, pyarrow.time32("s")))
+            else:
+                fields.append(pyarrow.field(column, pyarrow.int64()))
+        self.schema = pyarrow.schema(fields)
+        self.writer = pyarrow.parquet.ParquetWriter(path, self.schema, compression=compression or "snappy")
+
+    def write(self, rows):
+        columns = [list(values) for values in zip(*rows)]
+        times = columns[TimeIndex]
+        for index, value in enumerate(times):
+            if value is not None:
+                times[index] = Format.parseTime(value)
+        self.writer.write_table(self.pyarrow.Table.from_arrays(
+            [self.pyarrow.array(values, type=field.type) for values, field in zip(columns, self.schema)],
+            schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+
+
+Writers = {"csv": CSVWriter, "jsonl": JSONLinesWriter, "parquet": ParquetWriter}
+# Writer class of each format
+
+
+def exportLedger(path, startDate=None, endDate=None, EmployeeID=None, PositionID=None, hidden=False, compress=False,
+                 progress=None):
+    """ Writes the payments dated startDate through endDate to path, filtered as MySQL.streamLedger() describes, in the
+    format its name ends with (see getFormat()). compress=True gzips Parquet files; CSV and JSON Lines files are
+    gzipped when path ends in .gz. progress is called as progress(rows written) after every batch. Returns the number
+    of payments written """
+
+    fileFormat, gzipped = getFormat(path)
+    if fileFormat == "parquet" and gzipped:
+        raise ValueError("Parquet files are compressed inside; leave .gz off the name and use compress")
+    writer = Writers[fileFormat](path, gzipped, "gzip" if compress else None)
+
+    rows = 0
+    try:
+        for batch in MySQL.streamLedger(startDate, endDate, EmployeeID, PositionID, hidden):
+            writer.write(batch)
+            rows += len(batch)
+            if progress is not None:
+                progress(rows)
+    except:
+        # A partial file could be mistaken for the whole ledger
+        writer.close()
+        os.remove(path)
+        raise
+    writer.close()
+    return rows
+
+
+def readDate(text):
+    # argparse type for dates
+    try:
+        return Format.parseDate(text)
+    except ValueError as error:
+        raise argparse.ArgumentTypeError(str(error))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="py Export.py", description="Export the OpenPay payments ledger")
+    parser.add_argument("path", help="file to write: .csv, .csv.gz, .jsonl, .jsonl.gz or .parquet")
+    parser.add_argument("--from", dest="startDate", type=readDate, help="first payment date")
+    parser.add_argument("--to", dest="endDate", type=readDate, help="last payment date")
+    parser.add_argument("--employee", type=int, help="only this EmployeeID's payments")
+    parser.add_argument("--position", type=int, help="only payments of employees now in this PositionID")
+    hiddenGroup = parser.add_mutually_exclusive_group()
+    hiddenGroup.add_argument("--hidden", action="store_const", const=True, default=False,
+                             help="only hidden payments")
+    hiddenGroup.add_argument("--all", dest="hidden", action="store_const", const=None,
+                             help="hidden and visible payments")
+    parser.add_argument("--gzip", action="store_true", help="gzip a Parquet file's contents")
+    arguments = parser.parse_args()
+
+    start = time.perf_counter()
+    try:
+        written = exportLedger(arguments.path, arguments.startDate, arguments.endDate, arguments.employee,
+                               arguments.position, arguments.hidden, arguments.gzip)
+    except ValueError as error:
+        print(error)
+        sys.exit(2)
+    print(str(written) + " payments exported to " + arguments.path + " in " +
+          str(round(time.perf_counter() - start, 2)) + " seconds")
@@ -0,0 +1,165 @@
+import datetime
+import decimal
+import functools
+
+DateFormat = "%m/%d/%Y"
+# How dates are shown in tables. Change this to match your locale (ex. "%d/%m/%Y" or "%Y-%m-%d")
+
+PaystubDateFormat = "%m-%d-%Y"
+# How the payment date is printed on paystubs
+
+TimeFormat = "%I:%M %p"
+# How times are shown
+
+CurrencySymbol = "$"
+# Placed in front of every dollar amount
+
+ThousandsSeparator = ""
+# Placed between every three digits of dollar amounts (ex. ","). Empty for none
+
+CacheSize = 4096
+# Number of formatted values remembered by each formatting function
+
+
+def formatDate(date, dateFormat=None):
+    """ Returns date (a datetime.date or a 'YYYY-MM-DD' string) as text in dateFormat, DateFormat by default. Returns ''
+    for None """
+
+    return formatDateAs(date, dateFormat or DateFormat)
+
+
+@functools.lru_cache(maxsize=CacheSize)
+def formatDateAs(date, dateFormat):
+    """ Cached body of formatDate() """
+
+    if date is None:
+        return ''
+    if isinstance(date, str):
+        date = datetime.date.fromisoformat(date[:10])
+    return date.strftime(dateFormat)
+
+
+def formatTime(time, timeFormat=None):
+    """ Returns time (a datetime.time, or a datetime.timedelta as MySQL returns TIME columns) as text in timeFormat,
+    TimeFormat by default. Returns '' for None """
+
+    return formatTimeAs(time, timeFormat or TimeFormat)
+
+
+@functools.lru_cache(maxsize=CacheSize)
+def formatTimeAs(time, timeFormat):
+    """ Cached body of formatTime() """
+
+    if time is None:
+        return ''
+    if isinstance(time, datetime.timedelta):
+        seconds = int(time.total_seconds()) % 86400
+        time = datetime.time(seconds // 3600, seconds // 60 % 60, seconds % 60)
+    return time.strftime(timeFormat)
+
+
+def formatMoney(amount):
+    """ Returns a dollar amount as text with CurrencySymbol in front, ex. $1250.00. Returns '' for None """
+
+    if amount is None:
+        return ''
+    # Cached by text, since equal Decimals like 5.0 and 5.00 must still print differently
+    return formatMoneyAs(str(amount), CurrencySymbol, ThousandsSeparator)
+
+
+@functools.lru_cache(maxsize=CacheSize)
+def formatMoneyAs(amount, currencySymbol, thousandsSeparator):
+    """ Cached body of formatMoney(). Takes the amount as text """
+
+    amount = decimal.Decimal(amount)
+    if thousandsSeparator:
+        return currencySymbol + format(amount, ",f").replace(",", thousandsSeparator)
+    return currencySymbol + format(amount, "f")
+
+
+ParseDateFormats = ("%m/%d/%Y", "%Y/%m/%d")
+# Formats parseDate() accepts besides DateFormat, with "-" or "/" between the numbers and optional leading zeros
+
+ParseTimeFormats = ("%H:%M:%S", "%H:%M", "%I:%M:%S %p", "%I:%M %p", "%I:%M%p", "%I %p")
+# Formats parseTime() accepts
+
+MoneyPlaces = decimal.Decimal("0.01")
+
+
+def parseDate(date):
+    """ Returns date, as typed by the user or read from an imported file, as a datetime.date. Takes MM/DD/YYYY,
+    M-D-YYYY, YYYY-MM-DD, DateFormat, or a datetime.date or datetime.datetime as spreadsheets store them. Raises
+    ValueError if it is none of these """
+
+    if isinstance(date, datetime.datetime):
+        return date.date()
+    if isinstance(date, datetime.date):
+        return date
+    return parseDateText(str(date).strip())
+
+
+@functools.lru_cache(maxsize=CacheSize)
+def parseDateText(text):
+    """ Cached body of parseDate() for text """
+
+    for dateFormat in (DateFormat,) + ParseDateFormats:
+        try:
+            return datetime.datetime.strptime(text.replace("-", "/"), dateFormat.replace("-", "/")).date()
+        except ValueError:
+            pass
+    raise ValueError("'" + text + "' is not a date")
+
+
+def parseTime(time):
+    """ Returns time, as typed or imported (ex. 09:00, 9:00 AM or 21:00:00), as a datetime.time. Raises ValueError if
+    it is not a time """
+
+    if isinstance(time, datetime.datetime):
+        return time.time()
+    if isinstance(time, datetime.time):
+        return time
+    if isinstance(time, datetime.timedelta):
+        # MySQL returns TIME columns as a timedelta since midnight
+        return (datetime.datetime.min + time).time()
+    return parseTimeText(str(time).strip().upper())
+
+
+@functools.lru_cache(maxsize=CacheSize)
+def parseTimeText(text):
+    """ Cached body of parseTime() for text """
+
+    for timeFormat in ParseTimeFormats:
+        try:
+            return datetime.datetime.strptime(text, timeFormat).time()
+        except ValueError:
+            pass
+    raise ValueError("'" + text + "' is not a time")
+
+
+def parseMoney(amount):
+    """ Returns a dollar amount, as typed or imported (ex. 1250, $1,250.00 or (12.50) for a negative amount), as a
+    Decimal rounded to cents. Raises ValueError if it is not an amount """
+
+    if isinstance(amount, bool):
+        raise ValueError("'" + str(amount) + "' is not an amount")
+    return parseMoneyText(str(amount).strip(), CurrencySymbol, ThousandsSeparator)
+
+
+@functools.lru_cache(maxsize=CacheSize)
+def parseMoneyText(amount, currencySymbol, thousandsSeparator):
+    """ Cached body of parseMoney(). Takes the amount as text """
+
+    text = amount
+    negative = text.startswith("(") and text.endswith(")")
+    if negative:
+        text = text[1:-1]
+    for symbol in (currencySymbol, "$", ",", " ", thousandsSeparator):
+        if symbol:
+            text = text.replace(symbol, "")
+    try:
+        value = decimal.Decimal(text)
+    except decimal.InvalidOperation:
+        raise ValueError("'" + amount + "' is not an amount") from None
+    if not value.is_finite():
+        raise ValueError("'" + amount + "' is not an amount")
+    return (-value if negative else value).quantize(MoneyPlaces, decimal.ROUND_HALF_UP)
@@ -1,49 +1,168 @@
+import concurrent.futures
 import os
+import threading
+import time
+import docx
+import jinja2
 from docxtpl import DocxTemplate
+import Format
 import MySQL
 
+TemplatePath = "Paystub_Template.docx"
+# The Word template every paystub is rendered from
 
-def generatePaystub(paymentID):
-    """ Generates a Paystub for PaymentID, opens it, and saves it to OpenPay\PayStubs\ """
+PaystubFolder = "PayStubs"
+# Folder generated paystubs are saved to
 
-    if paymentID == 0:
-        return
+TemplateCache = {}
+# Parsed templates by absolute path, as (file signature, CachedTemplate). Each process of a batch has its own
 
-    MySQL.establishConnection()
+TemplateLock = threading.Lock()
+# Held while a cached template is rendered and saved, since render() changes the one CachedTemplate in place and stubs
+# can be rendered by several worker threads at once
+
+TemplateProperties = ["author", "comments", "identifier", "language", "subject", "title"]
+# The core properties DocxTemplate renders as templates
+
+FootnotesType = "application/vnd.openxmlformats-officedocument.wordprocessingml.footnotes+xml"
+
+
+class TemplateEnvironment(jinja2.Environment):
+    """ A Jinja environment that compiles each template source only once """
+
+    def __init__(self, **options):
+        super().__init__(**options)
+        self.compiled = {}
+
+    def from_string(self, source, globals=None, template_class=None):
+        if globals is not None or template_class is not None:
+            return super().from_string(source, globals, template_class)
+        key = (source, self.autoescape)
+        if key not in self.compiled:
+            self.compiled[key] = super().from_string(source)
+        return self.compiled[key]
+
+
+class CachedTemplate(DocxTemplate):
+    """ A DocxTemplate that can be rendered any number of times from a single parse.
+
+    The docx is unzipped and parsed on first use only. The patched body XML is kept and its Jinja template is compiled
+    once, and the parts a render changes in place (headers, footers, core properties and footnotes) are put back from a
+    snapshot before the next render """
+
+    def __init__(self, template_file):
+        super().__init__(template_file)
+        self.jinja_env = TemplateEnvironment()
+        self.body_xml = None
+        self.snapshot = None
+
+    def init_docx(self, reload=True):
+        # The parsed document is reused between renders instead of being loaded again
+        if self.docx is None:
+            self.docx = docx.Document(self.template_file)
+            self.is_rendered = False
+            self.takeSnapshot()
+
+    def takeSnapshot(self):
+        """ Records the template state of every part render() changes in place """
+
+        headersFooters = {}
+        for relKey, rel in self.docx._part.rels.items():
+            if rel.reltype in (self.HEADER_URI, self.FOOTER_URI):
+                headersFooters[relKey] = rel._target
+        properties = {}
+        for prop in TemplateProperties:
+            properties[prop] = getattr(self.docx.core_properties, prop)
+        footnotes = {}
+        for part in self.docx._part.package.parts:
+            if part.content_type == FootnotesType:
+                footnotes[part] = part._blob
+        self.snapshot = (headersFooters, properties, footnotes)
+
+    def restoreSnapshot(self):
+        """ Puts back the template state recorded by takeSnapshot() """
+
+        headersFooters, properties, footnotes = self.snapshot
+        for relKey, target in headersFooters.items():
+            self.docx._part.rels[relKey]._target = target
+        for prop, value in properties.items():
+            setattr(self.docx.core_properties, prop, value)
+        for part, blob in footnotes.items():
+            part._blob = blob
+
+    def build_xml(self, context, jinja_env=None):
+        # The body is read and patched on the first render only; later renders replace the rendered body in place
+        if self.body_xml is None:
+            self.body_xml = self.patch_xml(self.get_xml())
+        return self.render_xml_part(self.body_xml, self.docx._part, context, jinja_env)
+
+    def render(self, context, jinja_env=None, autoescape=False):
+        if self.is_rendered:
+            self.restoreSnapshot()
+        if jinja_env is None:
+            jinja_env = self.jinja_env
+        super().render(context, jinja_env, autoescape)
+
+
+def paystubPath(paymentID):
+    """ Returns the file a paystub for paymentID is saved to """
+
+    return os.path.join(PaystubFolder, "generated_paystub" + str(paymentID) + ".docx")
+
+
+def getTemplate(path=TemplatePath):
+    """ Returns the CachedTemplate for path. The file is only parsed again if it changed on disk since it was cached """
+
+    path = os.path.abspath(path)
+    status = os.stat(path)
+    signature = (status.st_mtime_ns, status.st_size)
+
+    cached = TemplateCache.get(path)
+    if cached is None or cached[0] != signature:
+        cached = (signature, CachedTemplate(path))
+        TemplateCache[path] = cached
+    return cached[1]
+
+
+def loadTemplate(path=TemplatePath):
+    """ Parses the template into the cache ahead of the first render """
+
+    getTemplate(path).get_docx()
+
+
+def buildPaystubContext(payment, employee, yearTotals):
+    """ Returns the template context for a paystub from a Payment record, its Employee record, and the YTD totals
+    returned by MySQL.getYTDTotals """
 
     EmployeeColumns = ["EmployeeFN", "EmployeeLN", "EmployeeStreetNum", "EmployeeStreetName", "EmployeeCity",
                        "EmployeeState", "EmployeeZIP"]
     EmployeeInfo = []
     for i in range(len(EmployeeColumns)):
-        if MySQL.getEmployeeValue(MySQL.getPaymentValue(paymentID, 'EmployeeID'), EmployeeColumns[i]) is None:
+        if getattr(employee, EmployeeColumns[i]) is None:
             EmployeeInfo.append('')
         else:
-            EmployeeInfo.append(
-                MySQL.getEmployeeValue(MySQL.getPaymentValue(paymentID, 'EmployeeID'), EmployeeColumns[i]))
+            EmployeeInfo.append(getattr(employee, EmployeeColumns[i]))
     if EmployeeInfo[4] != '':
         EmployeeInfo[4] = EmployeeInfo[4] + ','
 
-    paymentDate = str(MySQL.getPaymentValue(paymentID, 'PaymentDate'))
-    readableDate = paymentDate[5:7] + '-' + \
-                   paymentDate[8:10] + '-' + \
-                   paymentDate[:4]
+    readableDate = Format.formatDate(payment.PaymentDate, Format.PaystubDateFormat)
 
     PaymentColumns = ["PaymentGrossPay", "PaymentHousing", "PaymentHSA", "PaymentSSTax", "PaymentMedicareTax",
                       "PaymentFedWH", "PaymentSETax", "PaymentNetPay"]
     CurrentPaymentInfo = []
     for i in range(len(PaymentColumns)):
-        if MySQL.getPaymentValue(paymentID, PaymentColumns[i]) is None:
+        if getattr(payment, PaymentColumns[i]) is None:
             CurrentPaymentInfo.append(0.00)
         else:
-            CurrentPaymentInfo.append(MySQL.getPaymentValue(paymentID, PaymentColumns[i]))
+            CurrentPaymentInfo.append(getattr(payment, PaymentColumns[i]))
     YearPaymentInfo = []
     for i in PaymentColumns:
-        if MySQL.getYTD(paymentID, i) is None:
+        if yearTotals[i] is None:
             YearPaymentInfo.append(0.00)
         else:
-            YearPaymentInfo.append(MySQL.getYTD(paymentID, i))
+            YearPaymentInfo.append(yearTotals[i])
 
-    context = {
+    return {
         'EmployeeFN': EmployeeInfo[0],
         'EmployeeLN': EmployeeInfo[1],
         'EmployeeStreetNum': EmployeeInfo[2],
@@ -70,11 +189,96 @@ def generatePaystub(paymentID):
         'YearNetPay': YearPaymentInfo[7]
     }
 
-    MySQL.closeConnection()
 
-    doc = DocxTemplate("Paystub_Template.docx")
-    doc.render(context)
-    doc.save("PayStubs\generated_paystub" + str(paymentID) + ".docx")
-    os.startfile("PayStubs\generated_paystub" + str(paymentID) + ".docx")
+def renderPaystub(context, path):
+    """ Renders the paystub template with context and saves it to path. Returns path """
+
+    with TemplateLock:
+        doc = getTemplate()
+        doc.render(context)
+        doc.save(path)
+    return path
+
+
+def generatePaystub(paymentID):
+    """ Generates a Paystub for PaymentID, opens it, and saves it to OpenPay\\PayStubs\\ """
+
+    if paymentID == 0:
+        return
+
+    os.startfile(savePaystub(paymentID))
 
     return
+
+
+def savePaystub(paymentID):
+    """ Generates the paystub for paymentID and saves it to PayStubs\\ without opening it. Returns the file written """
+
+    MySQL.establishConnection()
+
+    # Loads the whole payment and employee rows in one query each
+    payment = MySQL.getPayment(paymentID)
+    employee = MySQL.getEmployee(payment.EmployeeID)
+    if employee is None:
+        MySQL.closeConnection()
+        raise ValueError("Payment " + str(paymentID) + " has no employee")
+    # Every YTD total comes from the employee's running totals in one lookup
+    context = buildPaystubContext(payment, employee, MySQL.getYTDTotals(paymentID))
+
+    MySQL.closeConnection()
+
+    return renderPaystub(context, paystubPath(paymentID))
+
+
+def generatePaystubs(paymentIDs=None, startDate=None, endDate=None, processes=None, progress=None):
+    """ Generates paystubs for every payment in paymentIDs, or for every visible payment dated startDate through
+    endDate, and saves them to PayStubs\\ without opening them. Returns (files written, PaymentIDs skipped).
+
+    Payments without an employee (EmployeeID can be NULL) are skipped instead of failing the whole batch.
+
+    All payment, employee and YTD data is loaded up front in a few queries. Stubs are rendered by a pool of
+    [processes] worker processes (one per CPU by default); pass processes=1 to render in this process, which is
+    required when the caller's main module cannot be safely re-imported, like the GUI.
+    progress is called as progress(done, total) after every stub """
+
+    with MySQL.connection():
+        if paymentIDs is None:
+            payments = MySQL.getPaymentsInRange(startDate, endDate)
+        else:
+            payments = list(MySQL.getPayments(paymentIDs).values())
+        employees = MySQL.getEmployees([payment.EmployeeID for payment in payments])
+        yearTotals = MySQL.getYTDTotalsForPayments(payments)
+
+    jobs = []
+    skipped = []
+    for payment in payments:
+        if payment.EmployeeID not in employees or payment.PaymentID not in yearTotals:
+            skipped.append(payment.PaymentID)
+            continue
+        context = buildPaystubContext(payment, employees[payment.EmployeeID], yearTotals[payment.PaymentID])
+        jobs.append((context, paystubPath(payment.PaymentID)))
+
+    os.makedirs(PaystubFolder, exist_ok=True)
+    paths = []
+    startTime = time.perf_counter()
+
+    if processes == 1 or len(jobs) < 2:
+        for context, path in jobs:
+            paths.append(renderPaystub(context, path))
+            if progress is not None:
+                progress(len(paths), len(jobs))
+    else:
+        with concurrent.futures.ProcessPoolExecutor(processes, initializer=loadTemplate,
+                                                    initargs=(TemplatePath,)) as executor:
+            futures = [executor.submit(renderPaystub, context, path) for context, path in jobs]
+            for future in concurrent.futures.as_completed(futures):
+                paths.append(future.result())
+                if progress is not None:
+                    progress(len(paths), len(jobs))
+
+    elapsed = time.perf_counter() - startTime
+    if elapsed > 0:
+        print(str(len(paths)) + " paystubs generated in " + str(round(elapsed, 2)) + " seconds (" +
+              str(round(len(paths) / elapsed, 1)) + " per second)")
+
+    return paths, skipped
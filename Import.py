@@ -0,0 +1,404 @@
+import csv
+import os
+import re
+import sys
+import time
+
+import Format
+import Migrations
+import MySQL
+import Payroll
+
+# Imports employees and historical payments from CSV or Excel (.xlsx) files, ex. when a church moves to OpenPay from
+# another payroll program. The first row names the columns, either as in the database (EmployeeFN, PaymentGrossPay)
+# or without the table prefix and spaces (First Name, FN, Gross Pay). Every row is checked and normalized (dates,
+# times and dollar amounts as Format.py parses them) before anything is saved; rows that fail are skipped and
+# reported with their line number.
+#
+# Rows are saved ChunkSize at a time with one multi-row INSERT (MySQL.addEmployees, MySQL.addPayments), and the whole
+# file in one transaction, so a file that fails partway leaves the database as it was and can be imported again.
+#
+# From a command prompt in the OpenPay folder: py Import.py employees staff.csv [--check]
+
+ChunkSize = 5000
+# Rows saved per INSERT. Memory use depends on this, not on the size of the file
+
+MaxErrors = 1000
+# Row errors kept in memory for the report. Every one is also written to the errors file (see getErrorsPath())
+
+ErrorsSuffix = ".errors.csv"
+# Replaces the extension of an imported file to name its errors file, ex. staff.errors.csv for staff.xlsx
+
+DefaultPaymentTime = "00:00:00"
+# Time given to imported payments without one
+
+EmployeeRequired = ("EmployeeFN", "EmployeeLN")
+# Columns every imported employee must have
+
+PaymentRequired = ("EmployeeID", "PaymentDate", "PaymentGrossPay", "PaymentNetPay")
+# Columns every imported payment must have. Other amounts are 0 when missing
+
+EmployeeMoney = ("EmployeeSalary", "EmployeeHourlyRate", "EmployeeHousingAllowance", "EmployeeHSA", "EmployeeFedWH",
+                 "EmployeeSEWH")
+# Employee columns holding dollar amounts. They are NOT NULL, so missing amounts are saved as 0
+
+PaymentMoney = ("PaymentHours", "PaymentGrossPay", "PaymentHousing", "PaymentHSA", "PaymentSSTax",
+                "PaymentMedicareTax", "PaymentSETax", "PaymentFedWH", "PaymentNetPay")
+
+Aliases = {"position": "PositionID", "positionname": "PositionID", "firstname": "EmployeeFN",
+           "middlename": "EmployeeMN", "lastname": "EmployeeLN", "email": "EmployeePrimaryEmail",
+           "selfemployed": "EmployeeIsSE", "date": "PaymentDate", "time": "PaymentTime", "employee": "EmployeeID"}
+# Column names accepted besides the database names, after normalizeHeader()
+
+Zero = Format.parseMoney(0)
+# Saved for amounts missing from a row
+
+TrueValues = ("1", "y", "yes", "true", "x")
+FalseValues = ("", "0", "n", "no", "false")
+
+
+def getTextLengths(createTable):
+    # Returns {column: longest value} of the VARCHAR and CHAR columns of a CREATE TABLE statement in Migrations.py
+    return {column: int(length) for column, length in re.findall(r"(\w+) (?:VAR)?CHAR\((\d+)\)", createTable)}
+
+
+EmployeeLengths = getTextLengths(Migrations.CreateEmployees)
+
+
+def getErrorsPath(path):
+    """ Returns the file the rejected rows of an import of path are written to, next to it """
+
+    return os.path.splitext(path)[0] + ErrorsSuffix
+
+
+class ImportResult:
+    """ What one import did: rows read, rows saved (or that would be saved by a check), the (line, message) of each
+    rejected row up to MaxErrors, the count of all rejected rows, and how long it took.
+
+    Every rejected row is also written to errorsPath as it is found, so the whole list is kept without holding it in
+    memory. errorsPath is None if no row was rejected, or if the file could not be written """
+
+    def __init__(self, kind, path):
+        self.kind = kind
+        self.path = path
+        self.rows = 0
+        self.imported = 0
+        self.errors = []
+        self.errorCount = 0
+        self.seconds = 0.0
+        self.errorsPath = None
+        self.errorsFile = None
+        self.errorsWriter = None
+
+    def addError(self, line, message):
+        """ Records that the row on line was rejected for message """
+
+        self.errorCount += 1
+        if len(self.errors) < MaxErrors:
+            self.errors.append((line, message))
+        if self.errorCount == 1:
+            self.openErrors()
+        if self.errorsWriter is not None:
+            self.errorsWriter.writerow((line, message))
+
+    def openErrors(self):
+        # Starts the errors file on the first rejected row. The import goes on without it if it cannot be written
+        try:
+            self.errorsFile = open(getErrorsPath(self.path), "w", newline="", encoding="utf-8")
+        except OSError:
+            return
+        self.errorsPath = getErrorsPath(self.path)
+        self.errorsWriter = csv.writer(self.errorsFile)
+        self.errorsWriter.writerow(("Line", "Error"))
+
+    def close(self):
+        """ Finishes the errors file, or removes the one left by an earlier import of the same file if no row was
+        rejected this time """
+
+        if self.errorsFile is not None:
+            self.errorsFile.close()
+            self.errorsFile = None
+            self.errorsWriter = None
+        elif self.errorCount == 0 and os.path.exists(getErrorsPath(self.path)):
+            os.remove(getErrorsPath(self.path))
+
+    def getRate(self):
+        """ Returns the rows read per second """
+
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def __str__(self):
+        text = (str(self.imported) + " of " + str(self.rows) + " " + self.kind + " imported from " +
+                os.path.basename(self.path) + " in " + str(round(self.seconds, 2)) + " seconds (" +
+                str(round(self.getRate())) + " rows per second)")
+        if self.errorCount:
+            text += ", " + str(self.errorCount) + " rows rejected"
+        return text
+
+
+def normalizeHeader(header):
+    # Header text without case, spaces, underscores or dashes
+    return re.sub(r"[\s_\-]", "", str(header or "")).lower()
+
+
+def mapHeaders(headers, columns, prefix):
+    """ Returns the column each header names, or None for headers that name none of columns. A header can be the
+    column name, the name without prefix (ex. FN for EmployeeFN) or one of Aliases """
+
+    byName = {}
+    for column in columns:
+        byName[normalizeHeader(column)] = column
+        if column.startswith(prefix):
+            byName[normalizeHeader(column[len(prefix):])] = column
+    for alias, column in Aliases.items():
+        if column in columns:
+            byName.setdefault(alias, column)
+    return [byName.get(normalizeHeader(header)) for header in headers]
+
+
+def readRows(path):
+    """ Yields (headers, None) and then (line number, list of values) for each row of a .csv or .xlsx file, reading
+    one row at a time. Blank rows are skipped """
+
+    if path.lower().endswith((".xlsx", ".xlsm")):
+        # Only needed for Excel files
+        try:
+            import openpyxl
+        except ImportError:
+            raise ValueError("Importing Excel files needs openpyxl. Run: pip install openpyxl") from None
+
+        workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+        try:
+            rows = workbook.worksheets[0].iter_rows(values_only=True)
+            yield [value for value in next(rows, ())], None
+            for line, row in enumerate(rows, 2):
+                if any(value is not None and str(value).strip() != "" for value in row):
+                    yield line, list(row)
+        finally:
+            workbook.close()
+        return
+
+    # utf-8-sig drops the byte order mark Excel writes at the start of CSV files
+    with open(path, newline="", encoding="utf-8-sig") as file:
+        reader = csv.reader(file)
+        yield next(reader, []), None
+        for row in reader:
+            if any(value.strip() for value in row):
+                yield reader.line_num, row
+
+
+def readText(value):
+    # A cell as stripped text, or None if it is empty
+    if value is None:
+        return None
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    text = str(value).strip()
+    return text if text else None
+
+
+def readInt(value):
+    # A cell as an int, or None if it is empty
+    text = readText(value)
+    if text is None:
+        return None
+    try:
+        return int(text)
+    except ValueError:
+        raise ValueError("'" + text + "' is not a whole number") from None
+
+
+def readBool(value):
+    # A cell as 1 or 0. Empty cells are 0
+    text = (readText(value) or "").lower()
+    if text in TrueValues:
+        return 1
+    if text in FalseValues:
+        return 0
+    raise ValueError("'" + text + "' is not yes or no")
+
+
+def readPayInterval(value):
+    # A cell as one of Payroll.PayPeriods, matched without case or spaces
+    text = readText(value)
+    if text is None:
+        return None
+    for interval in Payroll.PayPeriods:
+        if normalizeHeader(text) == interval.lower():
+            return interval
+    raise ValueError("'" + text + "' is not " + ", ".join(Payroll.PayPeriods))
+
+
+def readRecord(row, columns, required, convert):
+    """ Returns {column: value} for one row, given the column each cell belongs to. Raises ValueError naming the
+    column and problem if a required column is empty or a value cannot be converted by convert(column, value) """
+
+    record = {}
+    for column, value in zip(columns, row):
+        if column is None:
+            continue
+        try:
+            record[column] = convert(column, value)
+        except ValueError as error:
+            raise ValueError(column + ": " + str(error)) from None
+    for column in required:
+        if record.get(column) is None:
+            raise ValueError(column + " is required")
+    return record
+
+
+def makeEmployeeConverter(positions):
+    """ Returns convert(column, value) for employee rows. positions maps lowercase PositionNames and PositionIDs to
+    PositionIDs """
+
+    def convert(column, value):
+        if column in EmployeeMoney:
+            return Format.parseMoney(value) if readText(value) is not None else None
+        if column == "PositionID":
+            text = readText(value)
+            if text is None:
+                return None
+            if text.lower() not in positions:
+                raise ValueError("no position '" + text + "'")
+            return positions[text.lower()]
+        if column == "EmployeeIsSE":
+            return readBool(value)
+        if column == "EmployeeStreetNum":
+            return readInt(value)
+        if column == "EmployeeBirthdate":
+            return Format.parseDate(value) if readText(value) is not None else None
+        if column == "EmployeePayInterval":
+            return readPayInterval(value)
+        text = readText(value)
+        if column in ("EmployeeGender", "EmployeeMaritalStatus") and text is not None:
+            text = text[0].upper()
+        if text is not None and len(text) > EmployeeLengths.get(column, len(text)):
+            raise ValueError("longer than " + str(EmployeeLengths[column]) + " characters")
+        return text
+
+    return convert
+
+
+def convertPayment(column, value):
+    """ convert(column, value) for payment rows """
+
+    if column in PaymentMoney:
+        return Format.parseMoney(value) if readText(value) is not None else None
+    if column == "PaymentDate":
+        return Format.parseDate(value) if readText(value) is not None else None
+    if column == "PaymentTime":
+        return Format.parseTime(value) if readText(value) is not None else None
+    return readInt(value)
+
+
+def importEmployees(path, check=False, progress=None):
+    """ Adds every valid employee in the .csv or .xlsx file at path. Positions can be given by PositionID or
+    PositionName. If check is True the file is only checked and nothing is saved. progress is called as
+    progress(rows read) after every chunk. Returns an ImportResult """
+
+    positions = {}
+    for position in MySQL.getPositionPage(hidden=None):
+        positions[str(position.PositionID)] = position.PositionID
+        positions[position.PositionName.strip().lower()] = position.PositionID
+    convert = makeEmployeeConverter(positions)
+
+    def finish(record):
+        for column in EmployeeMoney:
+            if record.get(column) is None:
+                record[column] = Zero
+        record.setdefault("EmployeeIsSE", 0)
+        return record
+
+    return importRows("employees", path, MySQL.EmployeeColumns[1:], "Employee", EmployeeRequired, convert, finish,
+                      None, MySQL.addEmployees, check, progress)
+
+
+def importPayments(path, check=False, progress=None):
+    """ Adds every valid payment in the .csv or .xlsx file at path to the employees given by EmployeeID, along with
+    their running YTD totals. If check is True the file is only checked and nothing is saved. progress is called as
+    progress(rows read) after every chunk. Returns an ImportResult """
+
+    defaultTime = Format.parseTime(DefaultPaymentTime)
+
+    def finish(record):
+        for column in PaymentMoney:
+            if record.get(column) is None:
+                record[column] = Zero
+        if record.get("PaymentTime") is None:
+            record["PaymentTime"] = defaultTime
+        return record
+
+    employees = MySQL.getEmployeeIDs()
+
+    def checkChunk(chunk, result):
+        # Rejects payments whose employee does not exist
+        valid = []
+        for line, record in chunk:
+            if record["EmployeeID"] in employees:
+                valid.append((line, record))
+            else:
+                result.addError(line, "EmployeeID: no employee " + str(record["EmployeeID"]))
+        return valid
+
+    return importRows("payments", path, MySQL.PaymentColumns[1:], "Payment", PaymentRequired, convertPayment,
+                      finish, checkChunk, MySQL.addPayments, check, progress)
+
+
+def importRows(kind, path, columns, prefix, required, convert, finish, checkChunk, save, check, progress):
+    """ Reads, checks and saves the rows of one file a chunk at a time (see importEmployees() and importPayments()).
+    convert and finish turn a row into a record, checkChunk(chunk, result) returns the (line, record) pairs of a chunk
+    that can be saved, and save(records) saves them """
+
+    result = ImportResult(kind, path)
+    start = time.perf_counter()
+    rows = readRows(path)
+    headers = next(rows)[0]
+    mapped = mapHeaders(headers, columns, prefix)
+    missing = [column for column in required if column not in mapped]
+    if missing:
+        raise ValueError(os.path.basename(path) + " has no " + ", ".join(missing) + " column")
+
+    def flush(chunk):
+        if checkChunk is not None:
+            chunk = checkChunk(chunk, result)
+        if not check:
+            save([record for line, record in chunk])
+        result.imported += len(chunk)
+        if progress is not None:
+            progress(result.rows)
+
+    try:
+        with MySQL.transaction():
+            chunk = []
+            for line, row in rows:
+                result.rows += 1
+                try:
+                    chunk.append((line, finish(readRecord(row, mapped, required, convert))))
+                except ValueError as error:
+                    result.addError(line, str(error))
+                    continue
+                if len(chunk) >= ChunkSize:
+                    flush(chunk)
+                    chunk = []
+            if chunk:
+                flush(chunk)
+    finally:
+        result.close()
+
+    result.seconds = time.perf_counter() - start
+    return result
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3 or sys.argv[1] not in ("employees", "payments"):
+        print("Usage: py Import.py employees|payments FILE.csv|FILE.xlsx [--check]")
+        sys.exit(2)
+    Migrations.migrate()
+    importer = importEmployees if sys.argv[1] == "employees" else importPayments
+    imported = importer(sys.argv[2], check="--check" in sys.argv[3:], progress=lambda rows: print(rows, "rows read"))
+    for errorLine, message in imported.errors:
+        print("Line " + str(errorLine) + ": " + message)
+    print(imported)
+    if imported.errorsPath is not None:
+        print("Every rejected row is listed in " + imported.errorsPath)
+    sys.exit(1 if imported.errorCount else 0)
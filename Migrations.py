@@ -0,0 +1,221 @@
+import datetime
+
+import Cache
+import MySQL
+import Storage
+
+# Schema migrations. The SchemaVersion table records every migration applied to a database, so startup only has to
+# read the highest version (see migrate()) and new indexes, columns or summary tables reach existing installs without
+# running SQL by hand.
+#
+# To change the schema, append a migration to Migrations with the next version number. Never edit or reorder one that
+# has been released: databases that already ran it will not run it again.
+
+CreatePositions = ("CREATE TABLE IF NOT EXISTS Positions("
+                   "PositionID INT NOT NULL AUTO_INCREMENT, "
+                   "PositionName VARCHAR(100) NOT NULL, "
+                   "PositionSalary DECIMAL(15,2), "
+                   "PositionHourlyRate DECIMAL(15,2), "
+                   "PositionHousingAllowance DECIMAL(15,2), "
+                   "PositionHSA DECIMAL(15,2), "
+                   "PositionFedWH DECIMAL(15,2), "
+                   "PositionSEWH DECIMAL(15,2), "
+                   "PositionIsSE BOOLEAN, "
+                   "PositionPayInterval VARCHAR(30), "
+                   "PositionIsHidden BOOLEAN, "
+                   "PRIMARY KEY ( PositionID )"
+                   ")")
+
+CreateEmployees = ("CREATE TABLE IF NOT EXISTS Employees("
+                   "EmployeeID INT NOT NULL AUTO_INCREMENT, "
+                   "EmployeePrefix VARCHAR(10), "
+                   "EmployeeFN VARCHAR(30) NOT NULL, "
+                   "EmployeeMN VARCHAR(30), "
+                   "EmployeeLN VARCHAR(30) NOT NULL, "
+                   "EmployeeSuffix VARCHAR(10), "
+                   "PositionID INT, "
+                   "EmployeeSalary DECIMAL(15,2) NOT NULL, "
+                   "EmployeeHourlyRate DECIMAL(15,2) NOT NULL, "
+                   "EmployeeHousingAllowance DECIMAL(15,2) NOT NULL, "
+                   "EmployeeHSA DECIMAL(15,2) NOT NULL, "
+                   "EmployeeFedWH DECIMAL(15,2) NOT NULL, "
+                   "EmployeeSEWH DECIMAL(15,2) NOT NULL, "
+                   "EmployeePayInterval VARCHAR(30), "
+                   "EmployeeIsSE BOOLEAN NOT NULL, "
+                   "EmployeeStreetNum INT, "
+                   "EmployeeStreetName VARCHAR(50), "
+                   "EmployeeCity VARCHAR(50), "
+                   "EmployeeState VARCHAR(50), "
+                   "EmployeeZIP VARCHAR(15), "
+                   "EmployeeAptBuilding VARCHAR(30), "
+                   "EmployeeAptRoom VARCHAR(30), "
+                   "EmployeePOBox VARCHAR(30), "
+                   "EmployeePrimaryEmail VARCHAR(150), "
+                   "EmployeeSecondaryEmail VARCHAR(150), "
+                   "EmployeeHomeNum VARCHAR(30), "
+                   "EmployeeCellNum VARCHAR(30), "
+                   "EmployeeWorkNum VARCHAR(30), "
+                   "EmployeeGender CHAR(1), "
+                   "EmployeeMaritalStatus CHAR(1), "
+                   "EmployeeBirthdate DATE, "
+                   "EmployeeIsHidden BOOLEAN, "
+                   "PRIMARY KEY( EmployeeID ), "
+                   "FOREIGN KEY ( PositionID ) REFERENCES Positions( PositionID )"
+                   ")")
+
+CreatePayments = ("CREATE TABLE IF NOT EXISTS Payments("
+                  "PaymentID INT NOT NULL AUTO_INCREMENT, "
+                  "EmployeeID INT, "
+                  "PaymentDate DATE NOT NULL, "
+                  "PaymentTime TIME NOT NULL, "
+                  "PaymentHours DECIMAL(15,2), "
+                  "PaymentGrossPay DECIMAL(15,2) NOT NULL, "
+                  "PaymentHousing DECIMAL(15,2) NOT NULL, "
+                  "PaymentHSA DECIMAL(15,2) NOT NULL, "
+                  "PaymentSSTax DECIMAL(15,2) NOT NULL, "
+                  "PaymentMedicareTax DECIMAL(15,2) NOT NULL, "
+                  "PaymentSETax DECIMAL(15,2) NOT NULL, "
+                  "PaymentFedWH DECIMAL(15,2) NOT NULL, "
+                  "PaymentNetPay DECIMAL(15,2) NOT NULL, "
+                  "PaymentIsHidden BOOLEAN, "
+                  "PRIMARY KEY ( PaymentID ), "
+                  "FOREIGN KEY ( EmployeeID ) REFERENCES Employees( EmployeeID )"
+                  ")")
+
+CreateEmployeeYTD = ("CREATE TABLE IF NOT EXISTS EmployeeYTD("
+                     "EmployeeID INT NOT NULL, "
+                     "PaymentYear INT NOT NULL, "
+                     "ThroughDate DATE NOT NULL, "
+                     "PaymentGrossPay DECIMAL(17,2) NOT NULL, "
+                     "PaymentHousing DECIMAL(17,2) NOT NULL, "
+                     "PaymentHSA DECIMAL(17,2) NOT NULL, "
+                     "PaymentSSTax DECIMAL(17,2) NOT NULL, "
+                     "PaymentMedicareTax DECIMAL(17,2) NOT NULL, "
+                     "PaymentFedWH DECIMAL(17,2) NOT NULL, "
+                     "PaymentSETax DECIMAL(17,2) NOT NULL, "
+                     "PaymentNetPay DECIMAL(17,2) NOT NULL, "
+                     "PRIMARY KEY ( EmployeeID, PaymentYear )"
+                     ")")
+# Running year-to-date totals per employee and year, kept up to date by MySQL.addPayments() and friends
+
+CreateSchemaVersion = ("CREATE TABLE IF NOT EXISTS SchemaVersion("
+                       "Version INT NOT NULL, "
+                       "Description VARCHAR(200) NOT NULL, "
+                       "AppliedAt DATETIME NOT NULL, "
+                       "PRIMARY KEY ( Version )"
+                       ")")
+
+MigrationLock = "OpenPay.migrate"
+# Name of the lock held while migrating, so two copies of OpenPay started at once do not both migrate
+
+LockTimeout = 30
+# Seconds to wait for another copy of OpenPay to finish migrating
+
+MySQL.Statements["getSchemaVersion"] = "SELECT MAX(Version) FROM SchemaVersion"
+MySQL.Statements["addSchemaVersion"] = "INSERT INTO SchemaVersion (Version, Description, AppliedAt) VALUES (%s, %s, %s)"
+
+
+def createIndex(tableName, indexName, columns):
+    """ Returns a migration step that adds the index indexName on columns of tableName. MySQL has no CREATE INDEX IF
+    NOT EXISTS, so the step checks first, which lets databases that already have the index run it safely """
+
+    def step():
+        if not MySQL.indexExists(tableName, indexName):
+            MySQL.db.cursor.execute("CREATE INDEX " + indexName + " ON " + tableName + " (" + columns + ")")
+    return step
+
+
+def addColumn(tableName, columnName, definition):
+    """ Returns a migration step that adds the column columnName with definition (ex. "INT NOT NULL") to tableName,
+    unless it already has one """
+
+    def step():
+        if not MySQL.columnExists(tableName, columnName):
+            MySQL.db.cursor.execute("ALTER TABLE " + tableName + " ADD COLUMN " + columnName + " " + definition)
+    return step
+
+
+def fillEmployeeYTD():
+    """ Migration step that computes EmployeeYTD from the payments already in the database """
+
+    MySQL.rebuildYTD()
+
+
+Migrations = [
+    (1, "Create the Positions, Employees and Payments tables",
+     [CreatePositions, CreateEmployees, CreatePayments,
+      # Databases from before self-employment withholding was added
+      addColumn("Employees", "EmployeeSEWH", "DECIMAL(15,2) NOT NULL AFTER EmployeeFedWH")]),
+    (2, "Add EmployeeYTD running totals for paystubs",
+     [CreateEmployeeYTD, fillEmployeeYTD]),
+    (3, "Index Payments for date range reports, employee payment lists and the payment tables",
+     [createIndex("Payments", "PaymentsDate", "PaymentDate"),
+      createIndex("Payments", "PaymentsEmployeeDate", "EmployeeID, PaymentDate"),
+      createIndex("Payments", "PaymentsHiddenDate", "PaymentIsHidden, PaymentDate")]),
+]
+# Every migration in order, as (version, description, steps). A step is an SQL statement or a function run on the
+# migrating connection. MySQL commits each schema change as it runs, so a migration that fails part way is run again
+# from its first step on the next start: every step must be safe to repeat. Steps are written in MySQL's dialect, and
+# Storage.SQLiteBackend translates them for SQLite databases.
+
+LatestVersion = Migrations[-1][0]
+
+
+def getVersion():
+    """ Returns the schema version of the database, 0 for a database from before versioning or a new one """
+
+    try:
+        version = MySQL.query("getSchemaVersion")[0][0]
+    except Storage.Error as error:
+        if not MySQL.getBackend().isMissingTable(error):
+            raise
+        return 0
+    return version or 0
+
+
+def migrate():
+    """ Brings the database up to LatestVersion, creating it first if needed. Returns the number of migrations applied.
+
+    Run on every start: an up to date database costs one query """
+
+    backend = MySQL.getBackend()
+    backend.openDatabase()
+
+    if getVersion() >= LatestVersion:
+        return 0
+
+    applied = 0
+    with MySQL.connection() as cursor:
+        if not backend.lock(cursor, MigrationLock, LockTimeout):
+            raise TimeoutError("Another copy of OpenPay is still migrating the database")
+        try:
+            cursor.execute(CreateSchemaVersion)
+            # Another copy may have migrated while this one waited for the lock
+            version = getVersion()
+            for migration in Migrations:
+                if migration[0] > version:
+                    applyMigration(*migration)
+                    applied += 1
+        finally:
+            backend.unlock(cursor, MigrationLock)
+
+    # Rows cached before migrating may have changed
+    Cache.clearAll()
+    return applied
+
+
+def applyMigration(version, description, steps):
+    """ Runs every step of one migration and records it in SchemaVersion """
+
+    print("Migrating the OpenPay database to version " + str(version) + ": " + description)
+    for step in steps:
+        if callable(step):
+            step()
+        else:
+            MySQL.db.cursor.execute(step)
+    MySQL.execute("addSchemaVersion", (version, description, datetime.datetime.now()))
+    MySQL.db.connection.commit()
+
+
+if __name__ == "__main__":
+    print(str(migrate()) + " migrations applied. The OpenPay database is at version " + str(getVersion()) + ".")
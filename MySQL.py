@@ -1,6 +1,13 @@
+import contextlib
 import decimal
-import mysql.connector
+import os
+import threading
 import datetime
+import Cache
+import Diagnostics
+import Events
+import Format
+import Storage
 
 SocialSecurityTaxRate = decimal.Decimal(.062)
 # Standard withholding percentage per check for social security taxes
@@ -13,46 +20,303 @@ SelfEmploymentTaxRate = decimal.Decimal(.15)
 
 # standard withholding percentage per check for self employment taxes
 
+ServerLogin = {"host": "localhost", "user": "root", "passwd": "OpenPay"}
+# Modify this if your MySQL Server Login Info is different.
 
-def establishConnection():
-    """ Establishes a connection to the local database and sets up db_cursor """
+PoolSize = 5
+# Number of connections the pool keeps open to the server
 
-    global db_connection
-    global db_cursor
+ConnectAttempts = 3
+# Number of times a checkout is retried before giving up when the server drops connections
 
-    # Modify this if your MySQL Server Login Info is different.
-    db_connection = mysql.connector.connect(
-        host="localhost",
-        user="root",
-        passwd="OpenPay",
-    )
+ReconnectDelay = .5
+# Seconds to wait between checkout attempts
 
-    # creating database_cursor to perform SQL operation
-    db_cursor = db_connection.cursor()
+StorageBackend = "MySQL"
+# Where OpenPay keeps its data: "MySQL" for the MySQL server in ServerLogin, or "SQLite" for the database file
+# SQLiteFile on this computer, which needs no server (see Storage.SQLiteBackend)
 
-    # select Database OpenPay
-    db_cursor.execute("USE OpenPay")
+SQLiteFile = "OpenPay.db"
+# The SQLite database file. A relative path is in the folder OpenPay is installed in.
 
+db_backend = None
+db_backendLock = threading.Lock()
+# Guards creating the backend, so two worker threads starting at once do not both create it
 
-def closeConnection():
-    """ Attempts to close the connection to the database """
 
-    # try except block ensures that if there is not an active connection, the program will keep running.f
+class ConnectionState(threading.local):
+    """ The database connection of one thread. Every thread that uses MySQL.py (the GUI and each background worker)
+    borrows its own connection from the backend, so they can run queries at the same time """
+
+    def __init__(self):
+        self.connection = None
+        self.cursor = None
+        # depth counts the nested establishConnection() calls sharing connection. The connection goes back to the pool
+        # when it returns to 0.
+        self.depth = 0
+        # transactions counts the open transaction() blocks. While it is above 0, closeConnection() does not commit.
+        self.transactions = 0
+        # Events (see notify()) for changes that are not committed yet. They are dropped if the changes are rolled
+        # back.
+        self.events = []
+        # Events for committed changes, sent when the outermost connection is closed
+        self.committed = []
+        # Cache invalidations of changes that are not committed yet, as (RecordType, ID, pagesOnly). They are
+        # repeated once the changes are committed; see invalidateRecords()
+        self.invalidated = []
+
+
+db = ConnectionState()
+# The calling thread's connection state. db.cursor is the cursor most functions below run their queries on
+
+db_prepared = {}
+# Server-side prepared statements by pooled connection, as {connection: (session id, {statement name: cursor})}. See
+# preparedCursor().
+
+db_preparedLock = threading.Lock()
+# Guards db_prepared and StatementStats, which are shared by every thread
+
+StatementStats = {"hits": 0, "misses": 0, "dropped": 0}
+# Prepared statement cache counters. A hit reuses a statement already prepared on the connection, a miss prepares it,
+# and dropped counts statements thrown away because their connection was reset or replaced.
+
+
+def getBackend():
+    """ Returns the Storage backend every query runs on, creating the one chosen by StorageBackend on first use """
+
+    global db_backend
+
+    with db_backendLock:
+        if db_backend is None:
+            if StorageBackend == "SQLite":
+                db_backend = Storage.SQLiteBackend(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                                SQLiteFile))
+            else:
+                db_backend = Storage.MySQLBackend(ServerLogin, PoolSize, ConnectAttempts, ReconnectDelay,
+                                                  onReset=dropStatements)
+    return db_backend
+
+
+def useBackend(backend):
+    """ Runs every later query on backend instead, ex. a Storage.SQLiteBackend on a scratch file for a test or
+    benchmark. Call before any connection is open """
+
+    global db_backend
+
+    with db_backendLock:
+        db_backend = backend
+    dropStatements()
+    Cache.clearAll()
+
+
+def establishConnection():
+    """ Borrows a connection from the backend (the pool, on MySQL) and sets up db.cursor.
+
+    Calls may be nested: an inner call reuses the connection the outer call borrowed, so a GUI action that calls
+    several MySQL.py functions costs one checkout. Every call must be matched by closeConnection() """
+
+    db.depth += 1
+    if db.depth > 1:
+        return
+
     try:
-        db_cursor.close()
-        db_connection.commit()
-        db_connection.close()
+        backend = getBackend()
+        db.connection = backend.connect()
+        # creating database_cursor to perform SQL operation
+        db.cursor = Diagnostics.Cursor(backend.cursor(db.connection))
     except:
+        db.depth -= 1
+        raise
+
+
+def closeConnection():
+    """ Commits and releases one level of establishConnection(). The outermost call returns the connection to the
+    pool """
+
+    # if there is not an active connection, the program will keep running.
+    if db.depth == 0:
         print("Connection already closed. ")
+        return
+
+    try:
+        if db.transactions == 0:
+            db.connection.commit()
+            db.committed.extend(db.events)
+            del db.events[:]
+            for RecordType, ID, pagesOnly in db.invalidated:
+                dropCached(RecordType, ID, pagesOnly)
+            del db.invalidated[:]
+    finally:
+        db.depth -= 1
+        if db.depth == 0:
+            try:
+                db.cursor.close()
+                getBackend().release(db.connection)
+            except Storage.Error:
+                print("Connection was lost before it could be returned to the pool. ")
+            db.connection = None
+            db.cursor = None
+
+    if db.depth == 0:
+        sendEvents()
+
+
+@contextlib.contextmanager
+def connection():
+    """ Context manager form of establishConnection()/closeConnection(). Yields db.cursor.
+
+    with MySQL.connection() as cursor:
+        ...
+
+    Work done inside the block is rolled back if it raises """
+
+    establishConnection()
+    try:
+        yield db.cursor
+    except:
+        db.connection.rollback()
+        # Rows cached inside the block may not have been saved, and its changes did not happen
+        Cache.clearAll()
+        del db.events[:]
+        del db.invalidated[:]
+        raise
+    finally:
+        closeConnection()
+
+
+@contextlib.contextmanager
+def transaction():
+    """ Like connection(), but all of the work inside the block, including calls to other MySQL.py functions, is
+    committed once when the block ends, or rolled back entirely if it raises.
+
+    with MySQL.transaction():
+        ... """
+
+    establishConnection()
+    db.transactions += 1
+    try:
+        yield db.cursor
+    except:
+        db.transactions -= 1
+        db.connection.rollback()
+        Cache.clearAll()
+        del db.events[:]
+        del db.invalidated[:]
+        closeConnection()
+        raise
+    db.transactions -= 1
+    closeConnection()
+
+
+def notify(kind, action, ID=None):
+    """ Records that the kind ("employee", "payment" or "position") record with ID was changed by action ("added",
+    "changed", "hidden", "revealed" or "deleted"). The event is sent through Events once the change is committed and
+    the outermost connection is closed, or dropped if the change is rolled back """
+
+    db.events.append((kind + "-" + action, None if ID is None else int(ID)))
+    if db.depth == 0:
+        db.committed.extend(db.events)
+        del db.events[:]
+        sendEvents()
+
+
+def sendEvents():
+    """ Sends every committed event. Repeated events for the same record are sent once """
+
+    events = list(dict.fromkeys(db.committed))
+    del db.committed[:]
+    for event, ID in events:
+        Events.emit(event, ID)
+
+
+def preparedCursor(name):
+    """ Returns the prepared cursor for the statement called name on the current connection, creating it on first use.
+
+    Each pooled connection keeps one prepared cursor per statement, so a statement is parsed and planned by the server
+    once per connection instead of on every call. The pool does not reset sessions (pool_reset_session=False), which
+    keeps the statements alive between checkouts. A reconnect starts a new server session without them, so the
+    cursors are dropped whenever the connection's session id changes """
+
+    pooled, sessionID = getBackend().session(db.connection)
+
+    # A pooled connection is only used by one thread at a time, but the cache and counters are shared by all of them
+    with db_preparedLock:
+        cached = db_prepared.get(pooled)
+        if cached is None or cached[0] != sessionID:
+            if cached is not None:
+                StatementStats["dropped"] += len(cached[1])
+            cached = (sessionID, {})
+            db_prepared[pooled] = cached
+
+        cursors = cached[1]
+        cursor = cursors.get(name)
+        if cursor is None:
+            StatementStats["misses"] += 1
+        else:
+            StatementStats["hits"] += 1
+    if cursor is None:
+        cursor = Diagnostics.Cursor(getBackend().preparedCursor(db.connection))
+        with db_preparedLock:
+            cursors[name] = cursor
+    return cursor
+
+
+def dropStatements():
+    """ Forgets every prepared cursor. Called when the pool is rebuilt, since its connections are gone """
+
+    with db_preparedLock:
+        for sessionID, cursors in db_prepared.values():
+            StatementStats["dropped"] += len(cursors)
+        db_prepared.clear()
+
+
+def execute(name, params=()):
+    """ Runs the statement registered in Statements as name with params on the current connection, as a server-side
+    prepared statement. Returns the cursor, for rowcount and lastrowid.
+
+    Prepared cursors are not buffered, so use query() for statements that return rows """
+
+    backend = getBackend()
+    cursor = preparedCursor(name)
+    try:
+        cursor.execute(backend.Statements.get(name, Statements[name]), tuple(params))
+    except Storage.Error:
+        # The statement may have been lost on the server, so it is prepared again next time
+        with db_preparedLock:
+            cursors = db_prepared.get(backend.session(db.connection)[0], (None, {}))[1]
+            if cursors.get(name) is cursor:
+                del cursors[name]
+                StatementStats["dropped"] += 1
+        try:
+            cursor.close()
+        except Storage.Error:
+            pass
+        raise
+    return cursor
+
+
+def query(name, params=()):
+    """ Runs the statement registered in Statements as name with params and returns all of its rows """
+
+    with connection():
+        return execute(name, params).fetchall()
+
+
+def getStatementStats():
+    """ Returns the prepared statement cache counters, with the hit rate as a fraction of lookups """
+
+    stats = dict(StatementStats)
+    lookups = stats["hits"] + stats["misses"]
+    stats["hitRate"] = stats["hits"] / lookups if lookups else 0.0
+    with db_preparedLock:
+        stats["prepared"] = sum(len(cursors) for sessionID, cursors in db_prepared.values())
+    return stats
 
 
 def tableExists(tableName):
     """ returns 1 if tableName exists, 0 if it does not """
 
-    EmployeeStatement = "SHOW TABLES LIKE '" + tableName + "'"
-    db_cursor.execute(EmployeeStatement)
-    result = db_cursor.fetchone()
-    if result:
+    if query("tableExists", (tableName,))[0][0]:
         return 1
     else:
         return 0
@@ -61,119 +325,34 @@ def tableExists(tableName):
 def createDatabase():
     """ Create the database if it has not already been created """
 
-    global db_connection
-    global db_cursor
+    getBackend().createDatabase()
 
-    db_connection = mysql.connector.connect(
-        host="localhost",
-        user="root",
-        passwd="OpenPay",
-    )
 
-    # creating database_cursor to perform SQL operation
-    db_cursor = db_connection.cursor()
-    db_cursor.execute("CREATE DATABASE IF NOT EXISTS OpenPay")
-    closeConnection()
+def indexExists(tableName, indexName):
+    """ returns 1 if tableName has an index called indexName, 0 if it does not """
 
+    if query("indexExists", (tableName, indexName))[0][0]:
+        return 1
+    else:
+        return 0
 
-def createTables():
-    """ Creates all tables if they have not already been created """
 
-    establishConnection()
+def columnExists(tableName, columnName):
+    """ returns 1 if tableName has a column called columnName, 0 if it does not """
 
-    if not tableExists('Positions'):
-        db_cursor.execute("CREATE TABLE Positions("
-                          "PositionID INT NOT NULL AUTO_INCREMENT, "
-                          "PositionName VARCHAR(100) NOT NULL, "
-                          "PositionSalary DECIMAL(15,2), "
-                          "PositionHourlyRate DECIMAL(15,2), "
-                          "PositionHousingAllowance DECIMAL(15,2), "
-                          "PositionHSA DECIMAL(15,2), "
-                          "PositionFedWH DECIMAL(15,2), "
-                          "PositionSEWH DECIMAL(15,2), "
-                          "PositionIsSE BOOLEAN, "
-                          "PositionPayInterval VARCHAR(30), "
-                          "PositionIsHidden BOOLEAN, "
-                          "PRIMARY KEY ( PositionID )"
-                          ")")
-    else:
-        print("Positions already exists.")
-
-    if not tableExists('Employees'):
-        db_cursor.execute("CREATE TABLE Employees("
-                          "EmployeeID INT NOT NULL AUTO_INCREMENT, "
-                          "EmployeePrefix VARCHAR(10), "
-                          "EmployeeFN VARCHAR(30) NOT NULL, "
-                          "EmployeeMN VARCHAR(30), "
-                          "EmployeeLN VARCHAR(30) NOT NULL, "
-                          "EmployeeSuffix VARCHAR(10), "
-                          "PositionID INT, "
-                          "EmployeeSalary DECIMAL(15,2) NOT NULL, "
-                          "EmployeeHourlyRate DECIMAL(15,2) NOT NULL, "
-                          "EmployeeHousingAllowance DECIMAL(15,2) NOT NULL, "
-                          "EmployeeHSA DECIMAL(15,2) NOT NULL, "
-                          "EmployeeFedWH DECIMAL(15,2) NOT NULL, "
-                          "EmployeeSEWH DECIMAL(15,2) NOT NULL, "
-                          "EmployeePayInterval VARCHAR(30), "
-                          "EmployeeIsSE BOOLEAN NOT NULL, "
-                          "EmployeeStreetNum INT, "
-                          "EmployeeStreetName VARCHAR(50), "
-                          "EmployeeCity VARCHAR(50), "
-                          "EmployeeState VARCHAR(50), "
-                          "EmployeeZIP VARCHAR(15), "
-                          "EmployeeAptBuilding VARCHAR(30), "
-                          "EmployeeAptRoom VARCHAR(30), "
-                          "EmployeePOBox VARCHAR(30), "
-                          "EmployeePrimaryEmail VARCHAR(150), "
-                          "EmployeeSecondaryEmail VARCHAR(150), "
-                          "EmployeeHomeNum VARCHAR(30), "
-                          "EmployeeCellNum VARCHAR(30), "
-                          "EmployeeWorkNum VARCHAR(30), "
-                          "EmployeeGender CHAR(1), "
-                          "EmployeeMaritalStatus CHAR(1), "
-                          "EmployeeBirthdate DATE, "
-                          "EmployeeIsHidden BOOLEAN, "
-                          "PRIMARY KEY( EmployeeID ), "
-                          "FOREIGN KEY ( PositionID ) REFERENCES Positions( PositionID )"
-                          ")")
-    else:
-        print("Employees already exists.")
-
-    if not tableExists('Payments'):
-        db_cursor.execute("CREATE TABLE Payments("
-                          "PaymentID INT NOT NULL AUTO_INCREMENT, "
-                          "EmployeeID INT, "
-                          "PaymentDate DATE NOT NULL, "
-                          "PaymentTime TIME NOT NULL, "
-                          "PaymentHours DECIMAL(15,2), "
-                          "PaymentGrossPay DECIMAL(15,2) NOT NULL, "
-                          "PaymentHousing DECIMAL(15,2) NOT NULL, "
-                          "PaymentHSA DECIMAL(15,2) NOT NULL, "
-                          "PaymentSSTax DECIMAL(15,2) NOT NULL, "
-                          "PaymentMedicareTax DECIMAL(15,2) NOT NULL, "
-                          "PaymentSETax DECIMAL(15,2) NOT NULL, "
-                          "PaymentFedWH DECIMAL(15,2) NOT NULL, "
-                          "PaymentNetPay DECIMAL(15,2) NOT NULL, "
-                          "PaymentIsHidden BOOLEAN, "
-                          "PRIMARY KEY ( PaymentID ), "
-                          "FOREIGN KEY ( EmployeeID ) REFERENCES Employees( EmployeeID )"
-                          ")")
+    if query("columnExists", (tableName, columnName))[0][0]:
+        return 1
     else:
-        print("Payments already exists.")
-
-    closeConnection()
+        return 0
 
 
 def printDatabases():
     """ get list of all databases """
 
-    establishConnection()
-    db_cursor.execute("SHOW DATABASES")
-    # print all databases
-    for db in db_cursor:
-        print(db)
-    return
-    closeConnection()
+    with connection():
+        # print all databases
+        for database in getBackend().listDatabases(db.cursor):
+            print(database)
 
 
 def addQuote(myString):
@@ -189,36 +368,482 @@ def getValue():
 
     Must establish connection and select a row before calling """
 
-    row = db_cursor.fetchone()
+    row = db.cursor.fetchone()
     return row[0]
 
 
+EmployeeColumns = ("EmployeeID", "EmployeePrefix", "EmployeeFN", "EmployeeMN", "EmployeeLN", "EmployeeSuffix",
+                   "PositionID", "EmployeeSalary", "EmployeeHourlyRate", "EmployeeHousingAllowance", "EmployeeHSA",
+                   "EmployeeFedWH", "EmployeeSEWH", "EmployeePayInterval", "EmployeeIsSE", "EmployeeStreetNum",
+                   "EmployeeStreetName", "EmployeeCity", "EmployeeState", "EmployeeZIP", "EmployeeAptBuilding",
+                   "EmployeeAptRoom", "EmployeePOBox", "EmployeePrimaryEmail", "EmployeeSecondaryEmail",
+                   "EmployeeHomeNum", "EmployeeCellNum", "EmployeeWorkNum", "EmployeeGender", "EmployeeMaritalStatus",
+                   "EmployeeBirthdate", "EmployeeIsHidden")
+# Every column of the Employees table, in table order
+
+PaymentColumns = ("PaymentID", "EmployeeID", "PaymentDate", "PaymentTime", "PaymentHours", "PaymentGrossPay",
+                  "PaymentHousing", "PaymentHSA", "PaymentSSTax", "PaymentMedicareTax", "PaymentSETax", "PaymentFedWH",
+                  "PaymentNetPay", "PaymentIsHidden")
+# Every column of the Payments table, in table order
+
+PositionColumns = ("PositionID", "PositionName", "PositionSalary", "PositionHourlyRate", "PositionHousingAllowance",
+                   "PositionHSA", "PositionFedWH", "PositionSEWH", "PositionIsSE", "PositionPayInterval",
+                   "PositionIsHidden")
+# Every column of the Positions table, in table order
+
+MaxIDsPerQuery = 1000
+# Largest WHERE ... IN (...) list sent in one query. Longer lists are split into several queries.
+
+EmployeeCacheSize = 2048
+# Employee records kept in memory. See getRecords()
+
+PositionCacheSize = 256
+# Position records kept in memory
+
+PageCacheSize = 32
+# Employee and position pages (ex. every employee name for an OptionMenu) kept in memory for each table
+
+
+class Record:
+    """ One row of an OpenPay table. Columns are read as attributes, ex. employee.EmployeeFN
+
+    Subclasses set __slots__ to their table's columns, so records carry no per-instance __dict__ """
+
+    __slots__ = ()
+    table = None
+    key = None
+
+    def __init__(self, row):
+        for column, value in zip(self.__slots__, row):
+            setattr(self, column, value)
+
+    def getID(self):
+        """ Returns the value of the record's primary key """
+
+        return getattr(self, self.key)
+
+    def __repr__(self):
+        return self.__class__.__name__ + "(" + self.key + "=" + str(self.getID()) + ")"
+
+
+class Employee(Record):
+    """ A row of the Employees table """
+
+    __slots__ = EmployeeColumns
+    table = "Employees"
+    key = "EmployeeID"
+
+    def getFN_LN(self):
+        """ Returns "EmployeeFN EmployeeLN" """
+
+        return self.EmployeeFN + ' ' + self.EmployeeLN
+
+
+class Payment(Record):
+    """ A row of the Payments table """
+
+    __slots__ = PaymentColumns
+    table = "Payments"
+    key = "PaymentID"
+
+
+class Position(Record):
+    """ A row of the Positions table """
+
+    __slots__ = PositionColumns
+    table = "Positions"
+    key = "PositionID"
+
+
+RecordTypes = {"Employees": Employee, "Payments": Payment, "Positions": Position}
+# Record class of each table, by table name
+
+RecordCaches = {Employee: Cache.getCache("Employees", EmployeeCacheSize),
+                Position: Cache.getCache("Positions", PositionCacheSize)}
+# Records read by ID, by Record class. Payments are read once per paystub or table and are not cached.
+
+PageCaches = {Employee: Cache.getCache("EmployeePages", PageCacheSize),
+              Position: Cache.getCache("PositionPages", PageCacheSize)}
+# Results of getRecordPage(), by Record class
+
+NewEmployeeColumns = EmployeeColumns[1:-1]
+# The columns addEmployee() sets
+
+NewPaymentColumns = PaymentColumns[1:-1]
+# The columns addPayments() takes for each payment
+
+NewPositionColumns = PositionColumns[1:-1]
+# The columns addPosition() sets
+
+Statements = {
+    "tableExists": "SELECT COUNT(*) FROM information_schema.TABLES WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+    "indexExists": "SELECT COUNT(*) FROM information_schema.STATISTICS "
+                   "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_NAME = %s",
+    "columnExists": "SELECT COUNT(*) FROM information_schema.COLUMNS "
+                    "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND COLUMN_NAME = %s",
+    "getEmployee": "SELECT " + ", ".join(EmployeeColumns) + " FROM Employees WHERE EmployeeID = %s",
+    "getPayment": "SELECT " + ", ".join(PaymentColumns) + " FROM Payments WHERE PaymentID = %s",
+    "getPosition": "SELECT " + ", ".join(PositionColumns) + " FROM Positions WHERE PositionID = %s",
+    "getPaymentIDsByDate": "SELECT PaymentID FROM Payments ORDER BY PaymentDate DESC",
+    "getEmployeeIDs": "SELECT EmployeeID FROM Employees",
+    "getEmployeePaymentIDsByDate": "SELECT PaymentID FROM Payments WHERE EmployeeID = %s ORDER BY PaymentDate DESC",
+    "addEmployee": "INSERT INTO Employees (" + ", ".join(NewEmployeeColumns) + ") VALUES (" +
+                   ", ".join(["%s"] * len(NewEmployeeColumns)) + ")",
+    "deleteEmployeeYTD": "DELETE FROM EmployeeYTD WHERE EmployeeID = %s",
+    "deleteEmployeePayments": "DELETE FROM Payments WHERE EmployeeID = %s",
+    "deleteEmployee": "DELETE FROM Employees WHERE EmployeeID = %s",
+    "setEmployeeHidden": "UPDATE Employees SET EmployeeIsHidden = %s WHERE EmployeeID = %s",
+    "addPayment": "INSERT INTO Payments (" + ", ".join(NewPaymentColumns) + ") VALUES (" +
+                  ", ".join(["%s"] * len(NewPaymentColumns)) + ")",
+    "deletePayment": "DELETE FROM Payments WHERE PaymentID = %s",
+    "setPaymentHidden": "UPDATE Payments SET PaymentIsHidden = %s WHERE PaymentID = %s",
+    "addPosition": "INSERT INTO Positions (" + ", ".join(NewPositionColumns) + ") VALUES (" +
+                   ", ".join(["%s"] * len(NewPositionColumns)) + ")",
+    "clearEmployeePosition": "UPDATE Employees SET PositionID = NULL WHERE PositionID = %s",
+    "deletePosition": "DELETE FROM Positions WHERE PositionID = %s",
+    "setPositionHidden": "UPDATE Positions SET PositionIsHidden = %s WHERE PositionID = %s",
+}
+# Named, parameterized SQL run by execute() and query(). Values are always passed as parameters, never pasted into
+# the SQL. Statements that name a column chosen by the caller are added by columnStatement().
+
+
+def checkColumn(RecordType, column):
+    """ Returns column if it is a column of RecordType's table, else raises ValueError. Column names cannot be passed
+    as parameters, so every one placed into SQL is checked here first """
+
+    if column not in RecordType.__slots__:
+        raise ValueError(str(column) + " is not a column of " + RecordType.table)
+    return column
+
+
+def getRecordType(tableName):
+    """ Returns the Record class of tableName, else raises ValueError """
+
+    if tableName not in RecordTypes:
+        raise ValueError(str(tableName) + " is not an OpenPay table")
+    return RecordTypes[tableName]
+
+
+def columnStatement(name, RecordType, column, statement):
+    """ Registers statement, with {column} replaced by a checked column of RecordType, as name + ":" + column.
+    Returns the registered name """
+
+    name = name + ":" + checkColumn(RecordType, column)
+    if name not in Statements:
+        Statements[name] = statement.replace("{column}", column)
+    return name
+
+
+def toParameter(value):
+    """ Returns None for the 'NULL' placeholder the forms pass for empty fields, else value """
+
+    if isinstance(value, str) and value == 'NULL':
+        return None
+    return value
+
+
+def getRecords(RecordType, IDs):
+    """ Returns {ID: record} for every ID in IDs that exists, loading whole rows of RecordType (Employee, Payment or
+    Position).
+
+    Employees and positions are read through RecordCaches, so only the IDs not already in memory are loaded. Records
+    are shared with the cache and must not be changed by callers """
+
+    IDs = list(dict.fromkeys(int(ID) for ID in IDs if ID is not None))
+
+    cache = RecordCaches.get(RecordType)
+    if cache is None:
+        return loadRecords(RecordType, IDs)
+
+    # Taken before the rows are read, so a row changed by another thread while they load is not cached
+    generation = cache.getGeneration()
+    records, missing = cache.getMany(IDs)
+    if missing:
+        loaded = loadRecords(RecordType, missing)
+        for ID, record in loaded.items():
+            cache.put(ID, record, generation)
+        records.update(loaded)
+    return records
+
+
+def loadRecords(RecordType, IDs):
+    """ Loads {ID: record} for the int IDs in IDs from the database, with one WHERE ... IN (...) query per
+    MaxIDsPerQuery IDs """
+
+    records = {}
+
+    # Single records, the most common lookup, use a prepared statement
+    if len(IDs) == 1:
+        for row in query("get" + RecordType.__name__, IDs):
+            records[IDs[0]] = RecordType(row)
+        return records
+
+    with connection():
+        for start in range(0, len(IDs), MaxIDsPerQuery):
+            chunk = IDs[start:start + MaxIDsPerQuery]
+            db.cursor.execute("SELECT " + ", ".join(RecordType.__slots__) + " FROM " + RecordType.table +
+                              " WHERE " + RecordType.key + " IN (" + ", ".join(["%s"] * len(chunk)) + ")", chunk)
+            for row in db.cursor.fetchall():
+                record = RecordType(row)
+                records[record.getID()] = record
+
+    return records
+
+
+def getRecord(RecordType, ID):
+    """ Returns the RecordType record with ID, or None if there is not one """
+
+    if ID is None or ID == '' or ID == 'NULL':
+        return None
+    return getRecords(RecordType, [ID]).get(int(ID))
+
+
+def getEmployee(EmployeeID):
+    """ Returns the Employee record for EmployeeID in one query, or None """
+
+    return getRecord(Employee, EmployeeID)
+
+
+def getEmployees(EmployeeIDs):
+    """ Returns {EmployeeID: Employee} for all of EmployeeIDs in one round trip """
+
+    return getRecords(Employee, EmployeeIDs)
+
+
+def getPayment(PaymentID):
+    """ Returns the Payment record for PaymentID in one query, or None """
+
+    return getRecord(Payment, PaymentID)
+
+
+def getPayments(PaymentIDs):
+    """ Returns {PaymentID: Payment} for all of PaymentIDs in one round trip """
+
+    return getRecords(Payment, PaymentIDs)
+
+
+def getPosition(PositionID):
+    """ Returns the Position record for PositionID in one query, or None """
+
+    return getRecord(Position, PositionID)
+
+
+def getPositions(PositionIDs):
+    """ Returns {PositionID: Position} for all of PositionIDs in one round trip """
+
+    return getRecords(Position, PositionIDs)
+
+
+def hiddenCondition(column, hidden):
+    """ Returns the WHERE condition that selects hidden rows (hidden=True), visible rows (hidden=False) or every row
+    (hidden=None). Rows that were never hidden or revealed have NULL in column and count as visible """
+
+    if hidden is None:
+        return "1 = 1"
+    elif hidden:
+        return column + " = 1"
+    else:
+        return "(" + column + " = 0 OR " + column + " IS NULL)"
+
+
+def getRecordPage(RecordType, conditions, params, orderBy, rowCount):
+    """ Returns up to rowCount records of RecordType matching every condition in conditions, in orderBy order, with one
+    query. rowCount=None returns every matching record """
+
+    statement = "SELECT " + ", ".join(RecordType.__slots__) + " FROM " + RecordType.table + \
+                " WHERE " + " AND ".join(conditions) + " ORDER BY " + orderBy
+    params = list(params)
+    if rowCount is not None:
+        statement += " LIMIT %s"
+        params.append(int(rowCount))
+
+    pageCache = PageCaches.get(RecordType)
+    if pageCache is not None:
+        key = (statement, tuple(params))
+        # Taken before the page is read, as in getRecords()
+        pageGeneration = pageCache.getGeneration()
+        recordGeneration = RecordCaches[RecordType].getGeneration()
+        page = pageCache.get(key)
+        if page is not Cache.Missing:
+            return list(page)
+
+    with connection():
+        db.cursor.execute(statement, params)
+        page = [RecordType(row) for row in db.cursor.fetchall()]
+
+    if pageCache is not None:
+        pageCache.put(key, page, pageGeneration)
+        # Every record of the page can be looked up by ID without another query
+        recordCache = RecordCaches[RecordType]
+        for record in page:
+            recordCache.put(record.getID(), record, recordGeneration)
+        page = list(page)
+    return page
+
+
+def invalidateRecords(RecordType, ID=None):
+    """ Drops the cached RecordType record with ID, or every cached RecordType record if ID is None, along with every
+    cached page of RecordType. Called by every function that changes employees or positions.
+
+    Inside a connection the change is not committed yet, and another thread can still read the old row and cache it
+    again, so the records are dropped a second time once the change is committed (see closeConnection()) """
+
+    if RecordType not in RecordCaches:
+        return
+    dropCached(RecordType, ID, False)
+    if db.depth > 0:
+        db.invalidated.append((RecordType, ID, False))
+
+
+def invalidatePages(RecordType):
+    """ Drops every cached page of RecordType, but not its records. Called by the functions that add records, since
+    a new row changes pages but no record already cached. Repeated at commit like invalidateRecords() """
+
+    if RecordType not in PageCaches:
+        return
+    dropCached(RecordType, None, True)
+    if db.depth > 0:
+        db.invalidated.append((RecordType, None, True))
+
+
+def dropCached(RecordType, ID, pagesOnly):
+    # The body of invalidateRecords() and invalidatePages()
+    if not pagesOnly:
+        if ID is None:
+            RecordCaches[RecordType].clear()
+        else:
+            RecordCaches[RecordType].invalidate(int(ID))
+    PageCaches[RecordType].clear()
+
+
+def getEmployeePage(rowCount=None, hidden=False, beforeID=None):
+    """ Returns one page of Employee records, most recent (highest EmployeeID) first.
+
+    For the next page, pass the EmployeeID of the last record of this page as beforeID """
+
+    conditions = [hiddenCondition("EmployeeIsHidden", hidden)]
+    params = []
+    if beforeID is not None:
+        conditions.append("EmployeeID < %s")
+        params.append(int(beforeID))
+    return getRecordPage(Employee, conditions, params, "EmployeeID DESC", rowCount)
+
+
+def getPaymentPage(rowCount=None, hidden=False, EmployeeID=None, after=None):
+    """ Returns one page of Payment records, most recent (PaymentDate, then PaymentID) first. If EmployeeID is given,
+    only that employee's payments are returned.
+
+    For the next page, pass (PaymentDate, PaymentID) of the last record of this page as after """
+
+    conditions = [hiddenCondition("PaymentIsHidden", hidden)]
+    params = []
+    if EmployeeID is not None:
+        conditions.append("EmployeeID = %s")
+        params.append(int(EmployeeID))
+    if after is not None:
+        conditions.append("(PaymentDate < %s OR (PaymentDate = %s AND PaymentID < %s))")
+        params.extend([after[0], after[0], int(after[1])])
+    return getRecordPage(Payment, conditions, params, "PaymentDate DESC, PaymentID DESC", rowCount)
+
+
+def getPositionPage(rowCount=None, hidden=False, beforeID=None):
+    """ Returns one page of Position records, most recent (highest PositionID) first.
+
+    For the next page, pass the PositionID of the last record of this page as beforeID """
+
+    conditions = [hiddenCondition("PositionIsHidden", hidden)]
+    params = []
+    if beforeID is not None:
+        conditions.append("PositionID < %s")
+        params.append(int(beforeID))
+    return getRecordPage(Position, conditions, params, "PositionID DESC", rowCount)
+
+
+def getPaymentsInRange(startDate, endDate, hidden=False):
+    """ Returns every Payment record dated startDate through endDate (inclusive), oldest first """
+
+    conditions = [hiddenCondition("PaymentIsHidden", hidden), "PaymentDate >= %s", "PaymentDate <= %s"]
+    return getRecordPage(Payment, conditions, [startDate, endDate], "PaymentDate, PaymentID", None)
+
+
+LedgerColumns = PaymentColumns + ("EmployeeFN", "EmployeeLN", "EmployeeIsSE", "PositionID", "PositionName")
+# Columns of the rows streamLedger() yields: every payment column, then its employee's name and current position
+
+LedgerBatchSize = 5000
+# Rows streamLedger() fetches at a time
+
+
+def streamLedger(startDate=None, endDate=None, EmployeeID=None, PositionID=None, hidden=False,
+                 batchSize=LedgerBatchSize):
+    """ Yields the payments dated startDate through endDate (inclusive; None for no limit), oldest first, in lists of
+    up to batchSize rows of LedgerColumns. EmployeeID and PositionID keep only the payments of that employee or of
+    employees now in that position, and hidden selects hidden (True), visible (False) or all (None) payments.
+
+    Rows are read with an unbuffered cursor a batch at a time, so memory use does not grow with the ledger. The
+    connection is held until the last batch is read, and no other query may run on this thread in the meantime """
+
+    conditions = [hiddenCondition("Payments.PaymentIsHidden", hidden)]
+    params = []
+    if startDate is not None:
+        conditions.append("Payments.PaymentDate >= %s")
+        params.append(startDate)
+    if endDate is not None:
+        conditions.append("Payments.PaymentDate <= %s")
+        params.append(endDate)
+    if EmployeeID is not None:
+        conditions.append("Payments.EmployeeID = %s")
+        params.append(int(EmployeeID))
+    if PositionID is not None:
+        conditions.append("Employees.PositionID = %s")
+        params.append(int(PositionID))
+
+    statement = "SELECT " + ", ".join("Payments." + column for column in PaymentColumns) + \
+                ", Employees.EmployeeFN, Employees.EmployeeLN, Employees.EmployeeIsSE, Employees.PositionID, " \
+                "Positions.PositionName FROM Payments " \
+                "LEFT JOIN Employees ON Employees.EmployeeID = Payments.EmployeeID " \
+                "LEFT JOIN Positions ON Positions.PositionID = Employees.PositionID " \
+                "WHERE " + " AND ".join(conditions) + " ORDER BY Payments.PaymentDate, Payments.PaymentID"
+
+    with connection():
+        cursor = Diagnostics.Cursor(getBackend().streamingCursor(db.connection))
+        finished = False
+        try:
+            cursor.execute(statement, params)
+            while True:
+                rows = cursor.fetchmany(batchSize)
+                if not rows:
+                    finished = True
+                    break
+                yield rows
+        finally:
+            # An unbuffered cursor left partway through would block the connection's next statement
+            if not finished:
+                try:
+                    while cursor.fetchmany(batchSize):
+                        pass
+                except Storage.Error:
+                    pass
+            cursor.close()
+
+
 def getEmployeeValue(EmployeeID, EmployeeColumn):
-    """ returns the the value in the EmployeeColumn column of the Employees table from the row with EmployeeID
-   Must establish connection before calling """
+    """ returns the the value in the EmployeeColumn column of the Employees table from the row with EmployeeID """
 
-    EmployeeIDStr = str(EmployeeID)
-    db_cursor.execute("SELECT " + EmployeeColumn + " FROM Employees WHERE EmployeeID = " + EmployeeIDStr)
-    return getValue()
+    return getattr(getEmployee(EmployeeID), checkColumn(Employee, EmployeeColumn))
 
 
 def getEmployeeFN_LN(EmployeeID):
     """ Returns "EmployeeFN EmployeeLN" for EmployeeID """
 
-    EmployeeIDStr = str(EmployeeID)
-    db_cursor.execute("SELECT EmployeeFN FROM Employees WHERE EmployeeID = " + EmployeeIDStr + ";")
-    firstName = getValue()
-    db_cursor.execute("SELECT EmployeeLN FROM Employees WHERE EmployeeID = " + EmployeeIDStr + ";")
-    lastName = getValue()
-    fullName = firstName + ' ' + lastName
-    return fullName
+    return getEmployee(EmployeeID).getFN_LN()
 
 
 def getMax(tableName, columnName):
     """ returns the max value of the specified column from the specified table. """
 
-    db_cursor.execute("SELECT MAX(" + columnName + ") FROM " + tableName + ";")
-    value = getValue()
+    RecordType = getRecordType(tableName)
+    name = columnStatement("getMax", RecordType, columnName, "SELECT MAX({column}) FROM " + RecordType.table)
+    value = query(name)[0][0]
     # If there are no employees, return 0
     if value is not None:
         return value
@@ -229,36 +854,36 @@ def getMax(tableName, columnName):
 def getNextHighest(tableName, columnName, previousMax):
     """ returns the next highest (after previousMax) value of columnName in tableName """
 
-    if not previousMax == 0:
-        previousMaxStr = str(previousMax)
-        db_cursor.execute(
-            "SELECT MAX(" + columnName + ") FROM " + tableName + " WHERE " + columnName + " < " + previousMaxStr)
-        value = getValue()
-        # If previousMax is last employee, return 0
-        if value is not None:
-            return value
-        else:
-            return 0
+    if previousMax == 0:
+        return 0
+
+    RecordType = getRecordType(tableName)
+    name = columnStatement("getNextHighest", RecordType, columnName,
+                           "SELECT MAX({column}) FROM " + RecordType.table + " WHERE {column} < %s")
+    value = query(name, (previousMax,))[0][0]
+    # If previousMax is last employee, return 0
+    if value is not None:
+        return value
     else:
         return 0
 
 
 def getPaymentIDsByDate():
-    db_cursor.execute(
-        "SELECT PaymentID From Payments ORDER BY PaymentDate DESC;"
-    )
-    rows = db_cursor.fetchall()
+    rows = query("getPaymentIDsByDate")
     if rows is not None:
         return rows
     else:
         return 0
 
 
+def getEmployeeIDs():
+    """ Returns the set of every EmployeeID, hidden or not """
+
+    return {row[0] for row in query("getEmployeeIDs")}
+
+
 def getEmployeePaymentIDsByDate(EmployeeID):
-    db_cursor.execute(
-        "SELECT PaymentID From Payments WHERE EmployeeID = " + str(EmployeeID) + " ORDER BY PaymentDate DESC;"
-    )
-    rows = db_cursor.fetchall()
+    rows = query("getEmployeePaymentIDsByDate", (int(EmployeeID),))
     if rows is not None:
         return rows
     else:
@@ -275,99 +900,72 @@ def addEmployee(EmployeePrefix='NULL', EmployeeFN='NULL', EmployeeMN='NULL', Emp
                 EmployeeHousingAllowance=0.0, EmployeeHSA=0.0, EmployeeFedWH=0.0, EmployeeSEWH=0.0):
     """ Creates a new row on the employees table """
 
-    establishConnection()
-
-    # The statements below convert ints into strings for use in database execution
+    # Values are passed in NewEmployeeColumns order, with 'NULL' and a PositionID of 0 sent as NULL
     if PositionID == 0:
-        PositionIDStr = 'NULL'
-    else:
-        PositionIDStr = str(PositionID)
-    EmployeeSalaryStr = str(EmployeeSalary)
-    EmployeeHourlyRateStr = str(EmployeeHourlyRate)
-    EmployeeIsSEStr = str(EmployeeIsSE)
-    EmployeeHousingAllowanceStr = str(EmployeeHousingAllowance)
-    EmployeeHSAStr = str(EmployeeHSA)
-    EmployeeFedWHStr = str(EmployeeFedWH)
-    EmployeeSEWHStr = str(EmployeeSEWH)
-
-    # The statements below add quotes to every value for use in database execution
-    EmployeePrefix = addQuote(EmployeePrefix)
-    EmployeeFN = addQuote(EmployeeFN)
-    EmployeeMN = addQuote(EmployeeMN)
-    EmployeeLN = addQuote(EmployeeLN)
-    EmployeeSuffix = addQuote(EmployeeSuffix)
-    EmployeePayInterval = addQuote(EmployeePayInterval)
-    EmployeeStreetNum = addQuote(EmployeeStreetNum)
-    EmployeeStreetName = addQuote(EmployeeStreetName)
-    EmployeeCity = addQuote(EmployeeCity)
-    EmployeeState = addQuote(EmployeeState)
-    EmployeeZIP = addQuote(EmployeeZIP)
-    EmployeeAptBuilding = addQuote(EmployeeAptBuilding)
-    EmployeeAptRoom = addQuote(EmployeeAptRoom)
-    EmployeePOBox = addQuote(EmployeePOBox)
-    EmployeePrimaryEmail = addQuote(EmployeePrimaryEmail)
-    EmployeeSecondaryEmail = addQuote(EmployeeSecondaryEmail)
-    EmployeeGender = addQuote(EmployeeGender)
-    EmployeeMaritalStatus = addQuote(EmployeeMaritalStatus)
-    EmployeeBirthdate = addQuote(EmployeeBirthdate)
-    EmployeeHomeNum = addQuote(EmployeeHomeNum)
-    EmployeeCellNum = addQuote(EmployeeCellNum)
-    EmployeeWorkNum = addQuote(EmployeeWorkNum)
-
-    # MySQL command to create row on Employees Table
-    db_cursor.execute("INSERT INTO Employees (EmployeePrefix, EmployeeFN, EmployeeMN, EmployeeLN, EmployeeSuffix, "
-                      "PositionID, "
-                      "EmployeeSalary, EmployeeHourlyRate, EmployeePayInterval, EmployeeIsSE, EmployeeStreetNum, "
-                      "EmployeeStreetName, EmployeeCity, EmployeeState, EmployeeZIP, EmployeeAptBuilding, "
-                      "EmployeeAptRoom, EmployeePOBox, EmployeePrimaryEmail, EmployeeSecondaryEmail, EmployeeHomeNum, "
-                      "EmployeeCellNum, EmployeeWorkNum, EmployeeGender, EmployeeMaritalStatus, EmployeeBirthdate, "
-                      "EmployeeHousingAllowance, EmployeeHSA, EmployeeFedWH, EmployeeSEWH)"
-                      "VALUES (" + EmployeePrefix + ", " + EmployeeFN + ", " + EmployeeMN + ", " + EmployeeLN + ", " +
-                      EmployeeSuffix + ", " + PositionIDStr + ", " + EmployeeSalaryStr + ", " + EmployeeHourlyRateStr + ", " +
-                      EmployeePayInterval + ", " + EmployeeIsSEStr + ", " + EmployeeStreetNum + ", " +
-                      EmployeeStreetName + ", " + EmployeeCity + ", " + EmployeeState + ", " + EmployeeZIP + ", " +
-                      EmployeeAptBuilding + ", " + EmployeeAptRoom + ", " + EmployeePOBox + ", " + EmployeePrimaryEmail
-                      + ", " + EmployeeSecondaryEmail + ", " + EmployeeHomeNum + ", " + EmployeeCellNum + ", " +
-                      EmployeeWorkNum + ", " + EmployeeGender + ", " + EmployeeMaritalStatus + ", " + EmployeeBirthdate
-                      + ", " + EmployeeHousingAllowanceStr + ", " + EmployeeHSAStr + ", " + EmployeeFedWHStr + ", " +
-                      EmployeeSEWHStr + ");")
+        PositionID = 'NULL'
+    values = [EmployeePrefix, EmployeeFN, EmployeeMN, EmployeeLN, EmployeeSuffix, PositionID, EmployeeSalary,
+              EmployeeHourlyRate, EmployeeHousingAllowance, EmployeeHSA, EmployeeFedWH, EmployeeSEWH,
+              EmployeePayInterval, EmployeeIsSE, EmployeeStreetNum, EmployeeStreetName, EmployeeCity, EmployeeState,
+              EmployeeZIP, EmployeeAptBuilding, EmployeeAptRoom, EmployeePOBox, EmployeePrimaryEmail,
+              EmployeeSecondaryEmail, EmployeeHomeNum, EmployeeCellNum, EmployeeWorkNum, EmployeeGender,
+              EmployeeMaritalStatus, EmployeeBirthdate]
 
-    closeConnection()
+    with connection():
+        cursor = execute("addEmployee", [toParameter(value) for value in values])
+        invalidatePages(Employee)
+        notify("employee", "added", cursor.lastrowid)
+
+
+def addEmployees(employees):
+    """ Adds many employees at once. employees is a list of dictionaries keyed by NewEmployeeColumns; missing columns
+    are saved as NULL.
+
+    The rows go in with one multi-row INSERT, committed as a single transaction. Returns the number of employees
+    added """
+
+    if not employees:
+        return 0
+
+    with transaction():
+        db.cursor.executemany("INSERT INTO Employees (" + ", ".join(NewEmployeeColumns) + ") VALUES (" +
+                              ", ".join(["%s"] * len(NewEmployeeColumns)) + ")",
+                              [[employee.get(column) for column in NewEmployeeColumns] for employee in employees])
+        invalidatePages(Employee)
+        # The new EmployeeIDs are not known, so one event stands for the whole batch
+        notify("employee", "added")
+
+    return len(employees)
 
 
 def deleteEmployee(EmployeeID):
     """ deletes the employee with  the specified employee id from the employees table, along with all of their payments
     from the payments table """
 
-    establishConnection()
-    EmployeeIDStr = str(EmployeeID)
-    db_cursor.execute("DELETE FROM Payments WHERE EmployeeID = '" + EmployeeIDStr + "';")
-    db_cursor.execute("DELETE FROM Employees WHERE EmployeeID = '" + EmployeeIDStr + "';")
-    closeConnection()
+    with connection():
+        execute("deleteEmployeeYTD", (int(EmployeeID),))
+        execute("deleteEmployeePayments", (int(EmployeeID),))
+        execute("deleteEmployee", (int(EmployeeID),))
+        invalidateRecords(Employee, EmployeeID)
+        notify("employee", "deleted", EmployeeID)
+        notify("payment", "deleted")
 
 
 def hideEmployee(EmployeeID):
     # Hides the employee with the specified EmployeeID
 
-    establishConnection()
-
-    EmployeeIDStr = str(EmployeeID)
-
-    db_cursor.execute("UPDATE Employees SET EmployeeIsHidden = 1 WHERE EmployeeID = " + EmployeeIDStr + ";")
-
-    closeConnection()
+    with connection():
+        execute("setEmployeeHidden", (1, int(EmployeeID)))
+        invalidateRecords(Employee, EmployeeID)
+        notify("employee", "hidden", EmployeeID)
 
 
 def revealEmployee(EmployeeID):
     """ Unhides an employee with the specified employeeID """
 
-    establishConnection()
-
-    EmployeeIDStr = str(EmployeeID)
-
-    db_cursor.execute("UPDATE Employees SET EmployeeIsHidden = 0 WHERE EmployeeID = " + EmployeeIDStr + ";")
-
-    closeConnection()
+    with connection():
+        execute("setEmployeeHidden", (0, int(EmployeeID)))
+        invalidateRecords(Employee, EmployeeID)
+        notify("employee", "revealed", EmployeeID)
 
 
 def addPayment(EmployeeID, PaymentDate='NULL', PaymentTime='NULL',
@@ -377,94 +975,103 @@ def addPayment(EmployeeID, PaymentDate='NULL', PaymentTime='NULL',
                PaymentFedWH=decimal.Decimal(0), PaymentNetPay=decimal.Decimal(0)):
     """ Adds a new payment to the payments table for the specified employee with other variables if specified """
 
-    establishConnection()
+    values = [EmployeeID, PaymentDate, PaymentTime, PaymentHours, PaymentGrossPay, PaymentHousing, PaymentHSA,
+              PaymentSSTax, PaymentMedicareTax, PaymentSETax, PaymentFedWH, PaymentNetPay]
 
-    # converts all variable types to strings
-    EmployeeIDStr = str(EmployeeID)
-    PaymentDateStr = str(PaymentDate)
-    PaymentTimeStr = str(PaymentTime)
-    PaymentHoursStr = str(PaymentHours)
-    PaymentGrossPayStr = str(PaymentGrossPay)
-    PaymentHousingStr = str(PaymentHousing)
-    PaymentHSAStr = str(PaymentHSA)
-    PaymentSSTaxStr = str(PaymentSSTax)
-    PaymentMedicareTaxStr = str(PaymentMedicareTax)
-    PaymentSETaxStr = str(PaymentSETax)
-    PaymentFedWHStr = str(PaymentFedWH)
-    PaymentNetPayStr = str(PaymentNetPay)
-
-    # Add Quotes for MySQL Statement
-    PaymentDateStr = addQuote(PaymentDateStr)
-    PaymentTimeStr = addQuote(PaymentTimeStr)
-
-    # MySQL Code inserts actual row on Payments Table
-    db_cursor.execute("INSERT INTO PAYMENTS (EmployeeID, PaymentDate, PaymentTime, PaymentHours, PaymentGrossPay, "
-                      "PaymentHousing, PaymentHSA, PaymentSSTax, PaymentMedicareTax, PaymentSETax, PaymentFedWH, "
-                      "PaymentNetPay)"
-                      "VALUE (" + EmployeeIDStr + ", " + PaymentDateStr + ", " + PaymentTimeStr + ", " + PaymentHoursStr +
-                      ", " + PaymentGrossPayStr + ", " + PaymentHousingStr + ", " + PaymentHSAStr + ", " +
-                      PaymentSSTaxStr + ", " + PaymentMedicareTaxStr + ", " + PaymentSETaxStr + ", " + PaymentFedWHStr +
-                      ", " + PaymentNetPayStr + ")")
+    with connection():
+        cursor = execute("addPayment", [toParameter(value) for value in values])
+        applyYTD(getPayment(cursor.lastrowid), 1)
+        notify("payment", "added", cursor.lastrowid)
 
-    closeConnection()
+
+def addPayments(payments):
+    """ Adds many payments at once. payments is a list of dictionaries keyed by NewPaymentColumns, with PaymentDate
+    as a datetime.date.
+
+    The rows go in with one multi-row INSERT and the running YTD totals with one upsert, all committed together as a
+    single transaction """
+
+    if not payments:
+        return 0
+
+    # Running totals are summed per employee and year before touching EmployeeYTD
+    totals = {}
+    for payment in payments:
+        key = (int(payment["EmployeeID"]), payment["PaymentDate"].year)
+        if key not in totals:
+            totals[key] = [key[0], key[1], payment["PaymentDate"]] + [decimal.Decimal(0)] * len(YTDColumns)
+        row = totals[key]
+        row[2] = max(row[2], payment["PaymentDate"])
+        for i in range(len(YTDColumns)):
+            row[i + 3] += payment.get(YTDColumns[i]) or 0
+
+    with transaction():
+        db.cursor.executemany("INSERT INTO Payments (" + ", ".join(NewPaymentColumns) + ") VALUES (" +
+                              ", ".join(["%s"] * len(NewPaymentColumns)) + ")",
+                              [[payment.get(column) for column in NewPaymentColumns] for payment in payments])
+        addYTDRows(list(totals.values()))
+        # The new PaymentIDs are not known, so one event stands for the whole batch
+        notify("payment", "added")
+
+    return len(payments)
 
 
 def deletePayment(PaymentID):
     """ deletes the payment with the specified paymentID from the payments table """
 
-    establishConnection()
-    PaymentIDStr = str(PaymentID)
-    db_cursor.execute("DELETE FROM Payments WHERE PaymentID = '" + PaymentIDStr + "';")
-    closeConnection()
+    with connection():
+        payment = getPayment(PaymentID)
+        execute("deletePayment", (int(PaymentID),))
+        applyYTD(payment, -1)
+        notify("payment", "deleted", PaymentID)
 
 
 def hidePayment(PaymentID):
     """ Hides the payment with the specified paymentID """
 
-    establishConnection()
-
-    PaymentIDStr = str(PaymentID)
-
-    db_cursor.execute("UPDATE Payments SET PaymentIsHidden = 1 WHERE PaymentID = " + PaymentIDStr + ";")
-
-    closeConnection()
+    with connection():
+        execute("setPaymentHidden", (1, int(PaymentID)))
+        notify("payment", "hidden", PaymentID)
 
 
 def revealPayment(PaymentID):
     """ Unhides the payment with the specified id """
 
-    establishConnection()
+    with connection():
+        execute("setPaymentHidden", (0, int(PaymentID)))
+        notify("payment", "revealed", PaymentID)
 
-    PaymentIDStr = str(PaymentID)
 
-    db_cursor.execute("UPDATE Payments SET PaymentIsHidden = 0 WHERE PaymentID = " + PaymentIDStr + ";")
+def getPaymentValue(PaymentID, PaymentColumn):
+    """ returns the value in the PaymentColumn column of the Payments table from the row with PaymentID """
 
-    closeConnection()
+    name = columnStatement("getPaymentValue", Payment, PaymentColumn,
+                           "SELECT {column} FROM Payments WHERE PaymentID = %s")
+    return query(name, (int(PaymentID),))[0][0]
 
 
-def getPaymentValue(PaymentID, PaymentColumn):
-    """ returns the value in the PaymentColumn column of the Payments table from the row with PaymentID
+def monthRange(Month, Year):
+    """ Returns the first day of Month in Year and the first day of the month after it, for half-open date ranges """
 
-    Must establish connection before calling """
+    start = datetime.date(int(Year), int(Month), 1)
+    if start.month == 12:
+        return start, datetime.date(start.year + 1, 1, 1)
+    return start, datetime.date(start.year, start.month + 1, 1)
 
-    PaymentIDStr = str(PaymentID)
-    db_cursor.execute("SELECT " + PaymentColumn + " FROM Payments WHERE PaymentID = " + PaymentIDStr)
-    return getValue()
+
+def quarterRange(Quarter, Year):
+    """ Returns the first day of Quarter (1-4) in Year and the first day of the quarter after it """
+
+    return monthRange(int(Quarter) * 3 - 2, Year)[0], monthRange(int(Quarter) * 3, Year)[1]
 
 
 def getMonthlyTotal(Month, Year, PaymentColumn):
     """ Returns The Totals of PaymentColumn Within a given Month. Pass Month as a string and PaymentColumn as a string.
     """
 
-    establishConnection()
-
-    db_cursor.execute("SELECT SUM(" + PaymentColumn + ") "
-                                                      "FROM  payments " +
-                      "WHERE PaymentDate LIKE '" + Year + '-' + Month + "-%'")
-
-    row = db_cursor.fetchone()
-
-    closeConnection()
+    name = columnStatement("getRangeTotal", Payment, PaymentColumn,
+                           "SELECT SUM({column}) FROM Payments WHERE PaymentDate >= %s AND PaymentDate < %s")
+    row = query(name, monthRange(Month, Year))[0]
 
     if row[0] is not None:
         return row[0]
@@ -475,34 +1082,12 @@ def getMonthlyTotal(Month, Year, PaymentColumn):
 def getQuarterlyTotal(Quarter, Year, PaymentColumn):
     """ Returns the total amount in payment column for quarter 1, 2, 3, or 4 of Year"""
 
-    if Quarter == 1:
-        conditional = "WHERE PaymentDate LIKE '" + Year + "-01-%' " \
-                                                          "OR PaymentDate LIKE '" + Year + "-02-%' " \
-                                                                                           "OR PaymentDate LIKE '" + Year + "-03-%'"
-    elif Quarter == 2:
-        conditional = "WHERE PaymentDate LIKE '" + Year + "-04-%' " \
-                                                          "OR PaymentDate LIKE '" + Year + "-05-%' " \
-                                                                                           "OR PaymentDate LIKE '" + Year + "-06-%'"
-    elif Quarter == 3:
-        conditional = "WHERE PaymentDate LIKE '" + Year + "-07-%' " \
-                                                          "OR PaymentDate LIKE '" + Year + "-08-%' " \
-                                                                                           "OR PaymentDate LIKE '" + Year + "-09-%'"
-    elif Quarter == 4:
-        conditional = "WHERE PaymentDate LIKE '" + Year + "-10-%' " \
-                                                          "OR PaymentDate LIKE '" + Year + "-11-%' " \
-                                                                                           "OR PaymentDate LIKE '" + Year + "-12-%'"
-    else:
+    if Quarter not in (1, 2, 3, 4):
         return
 
-    establishConnection()
-
-    db_cursor.execute("SELECT SUM(" + PaymentColumn + ") \
-    FROM Payments " \
-                      + conditional)
-
-    row = db_cursor.fetchone()
-
-    closeConnection()
+    name = columnStatement("getRangeTotal", Payment, PaymentColumn,
+                           "SELECT SUM({column}) FROM Payments WHERE PaymentDate >= %s AND PaymentDate < %s")
+    row = query(name, quarterRange(Quarter, Year))[0]
 
     if row[0] is not None:
         return row[0]
@@ -515,41 +1100,16 @@ def getSEGrossPay(Quarter, Year):
 
     Used for calculating fica pay """
 
-    if Quarter == 1:
-        conditional = "WHERE p.EmployeeID = e.EmployeeID\
-         AND (p.PaymentDate LIKE '" + Year + "-01-%' " \
-                                             "OR p.PaymentDate LIKE '" + Year + "-02-%' " \
-                                                                                "OR p.PaymentDate LIKE '" + Year + "-03-%') \
-         AND e.EmployeeIsSE = 1"
-    elif Quarter == 2:
-        conditional = "WHERE p.EmployeeID = e.EmployeeID\
-                 AND (p.PaymentDate LIKE '" + Year + "-04-%' " \
-                                                     "OR p.PaymentDate LIKE '" + Year + "-05-%' " \
-                                                                                        "OR p.PaymentDate LIKE '" + Year + "-06-%') \
-                 AND e.EmployeeIsSE = 1"
-    elif Quarter == 3:
-        conditional = "WHERE p.EmployeeID = e.EmployeeID\
-                 AND (p.PaymentDate LIKE '" + Year + "-07-%' " \
-                                                     "OR p.PaymentDate LIKE '" + Year + "-08-%' " \
-                                                                                        "OR p.PaymentDate LIKE '" + Year + "-09-%') \
-                 AND e.EmployeeIsSE = 1"
-    elif Quarter == 4:
-        conditional = "WHERE p.EmployeeID = e.EmployeeID\
-                         AND (p.PaymentDate LIKE '" + Year + "-10-%' " \
-                                                             "OR p.PaymentDate LIKE '" + Year + "-11-%' " \
-                                                                                                "OR p.PaymentDate LIKE '" + Year + "-12-%') \
-                         AND e.EmployeeIsSE = 1"
-    else:
+    if Quarter not in (1, 2, 3, 4):
         return
 
-    establishConnection()
-
-    db_cursor.execute("SELECT SUM(PaymentGrossPay) \
-    FROM Payments p, Employees e " + conditional)
-
-    row = db_cursor.fetchone()
+    with connection():
+        db.cursor.execute("SELECT SUM(p.PaymentGrossPay) "
+                          "FROM Payments p JOIN Employees e ON p.EmployeeID = e.EmployeeID "
+                          "WHERE p.PaymentDate >= %s AND p.PaymentDate < %s AND e.EmployeeIsSE = 1",
+                          quarterRange(Quarter, Year))
 
-    closeConnection()
+        row = db.cursor.fetchone()
 
     if row[0] is not None:
         return row[0]
@@ -557,30 +1117,259 @@ def getSEGrossPay(Quarter, Year):
         return 0
 
 
-def getYTD(paymentID, paymentColumn):
-    """ returns the YTD value of PaymentColumn for the employee receiving Payment ID """
+class QuarterlyReport:
+    """ The monthly and quarterly payment totals of one year, used for the 941 form """
 
-    establishConnection()
+    __slots__ = ("year", "months")
 
-    endDate = str(getPaymentValue(paymentID, 'PaymentDate'))
-    employeeID = getPaymentValue(paymentID, 'EmployeeID')
-    startDate = endDate[:4] + '-01-01'
+    # The totals kept for every month. SEGrossPay is PaymentGrossPay for self-employed employees only
+    columns = ("PaymentSSTax", "PaymentMedicareTax", "PaymentFedWH", "PaymentSETax", "PaymentGrossPay", "SEGrossPay")
 
-    db_cursor.execute("SELECT SUM(" + paymentColumn + ") "
-                                                      "FROM Payments p, Employees e "
-                                                      "WHERE p.EmployeeID = e.EmployeeID "
-                                                      "AND p.EmployeeID = " + str(employeeID) + " "
-                                                                                                "AND p.PaymentDate <= '" + endDate + "' "
-                                                                                                                                     "AND p.PaymentDate >= '" + startDate + "'")
+    def __init__(self, year):
+        self.year = int(year)
+        self.months = {}
+        for month in range(1, 13):
+            self.months[month] = dict.fromkeys(self.columns, decimal.Decimal(0))
 
-    row = db_cursor.fetchone()
+    def month(self, Month):
+        """ Returns the totals for Month (1-12) as a dictionary keyed by column """
 
-    closeConnection()
+        return self.months[int(Month)]
+
+    def quarter(self, Quarter):
+        """ Returns the totals for Quarter (1-4) as a dictionary keyed by column """
+
+        totals = dict.fromkeys(self.columns, decimal.Decimal(0))
+        for month in range(int(Quarter) * 3 - 2, int(Quarter) * 3 + 1):
+            for column in self.columns:
+                totals[column] += self.months[month][column]
+        return totals
+
+
+def getQuarterlyReport(Year):
+    """ Returns a QuarterlyReport with every monthly total for Year, computed with a single grouped query """
+
+    report = QuarterlyReport(Year)
+
+    with connection():
+        db.cursor.execute(
+            "SELECT MONTH(p.PaymentDate), SUM(p.PaymentSSTax), SUM(p.PaymentMedicareTax), SUM(p.PaymentFedWH), "
+            "SUM(p.PaymentSETax), SUM(p.PaymentGrossPay), "
+            "SUM(CASE WHEN e.EmployeeIsSE = 1 THEN p.PaymentGrossPay ELSE 0 END) "
+            "FROM Payments p LEFT JOIN Employees e ON e.EmployeeID = p.EmployeeID "
+            "WHERE p.PaymentDate >= %s AND p.PaymentDate < %s "
+            "GROUP BY YEAR(p.PaymentDate), MONTH(p.PaymentDate)",
+            (datetime.date(report.year, 1, 1), datetime.date(report.year + 1, 1, 1)))
+        rows = db.cursor.fetchall()
+
+    for row in rows:
+        totals = report.months[int(row[0])]
+        for column, value in zip(report.columns, row[1:]):
+            if value is not None:
+                totals[column] = decimal.Decimal(value)
+
+    return report
+
+
+YTDColumns = ("PaymentGrossPay", "PaymentHousing", "PaymentHSA", "PaymentSSTax", "PaymentMedicareTax", "PaymentFedWH",
+              "PaymentSETax", "PaymentNetPay")
+# Payment columns with a running year-to-date total in the EmployeeYTD table
+
+Statements["getYTDRow"] = ("SELECT ThroughDate, " + ", ".join(YTDColumns) + " FROM EmployeeYTD "
+                           "WHERE EmployeeID = %s AND PaymentYear = %s")
+Statements["sumPayments"] = ("SELECT " + ", ".join("SUM(" + column + ")" for column in YTDColumns) + " FROM Payments "
+                             "WHERE EmployeeID = %s AND PaymentDate >= %s AND PaymentDate < %s")
+
+
+def sumPayments(EmployeeID, startDate, endDate):
+    """ Returns the sums of YTDColumns over EmployeeID's payments from startDate up to but not including endDate, as a
+    dictionary keyed by column """
+
+    row = query("sumPayments", (EmployeeID, startDate, endDate))[0]
+
+    totals = {}
+    for column, value in zip(YTDColumns, row):
+        totals[column] = value if value is not None else decimal.Decimal(0)
+    return totals
 
-    if row[0] is not None:
-        return row[0]
-    else:
-        return 0
+
+def applyYTD(payment, sign):
+    """ Adds (sign=1) or removes (sign=-1) the amounts of a Payment record from its employee's running totals. Call
+    inside the same connection as the change to Payments so both are committed together """
+
+    if payment is None or payment.EmployeeID is None:
+        return
+
+    amounts = []
+    for column in YTDColumns:
+        value = getattr(payment, column)
+        amounts.append(sign * value if value is not None else decimal.Decimal(0))
+
+    addYTDRows([[payment.EmployeeID, payment.PaymentDate.year, payment.PaymentDate] + amounts])
+
+
+def addYTDRows(rows):
+    """ Adds rows of [EmployeeID, PaymentYear, ThroughDate, one amount per YTDColumns] to the running totals with a
+    single statement """
+
+    with connection():
+        db.cursor.executemany("INSERT INTO EmployeeYTD (EmployeeID, PaymentYear, ThroughDate, " +
+                              ", ".join(YTDColumns) + ") VALUES (%s, %s, %s" + ", %s" * len(YTDColumns) + ") "
+                              "ON DUPLICATE KEY UPDATE ThroughDate = GREATEST(ThroughDate, VALUES(ThroughDate)), " +
+                              ", ".join(column + " = " + column + " + VALUES(" + column + ")" for column in YTDColumns),
+                              rows)
+
+
+def rebuildYTD():
+    """ Recomputes every running total in EmployeeYTD from the Payments table """
+
+    with connection():
+        db.cursor.execute("DELETE FROM EmployeeYTD")
+        db.cursor.execute("INSERT INTO EmployeeYTD (EmployeeID, PaymentYear, ThroughDate, " + ", ".join(YTDColumns) +
+                          ") SELECT EmployeeID, YEAR(PaymentDate), MAX(PaymentDate), " +
+                          ", ".join("COALESCE(SUM(" + column + "), 0)" for column in YTDColumns) +
+                          " FROM Payments WHERE EmployeeID IS NOT NULL GROUP BY EmployeeID, YEAR(PaymentDate)")
+
+
+def checkYTD():
+    """ Compares EmployeeYTD against the Payments table. Returns a list of the (EmployeeID, PaymentYear) pairs whose
+    running totals are wrong; an empty list means the totals are consistent """
+
+    with connection():
+        db.cursor.execute("SELECT EmployeeID, PaymentYear, " + ", ".join(YTDColumns) + " FROM EmployeeYTD")
+        stored = {}
+        for row in db.cursor.fetchall():
+            stored[(row[0], row[1])] = tuple(row[2:])
+
+        db.cursor.execute("SELECT EmployeeID, YEAR(PaymentDate), " +
+                          ", ".join("COALESCE(SUM(" + column + "), 0)" for column in YTDColumns) +
+                          " FROM Payments WHERE EmployeeID IS NOT NULL GROUP BY EmployeeID, YEAR(PaymentDate)")
+        actual = {}
+        for row in db.cursor.fetchall():
+            actual[(row[0], int(row[1]))] = tuple(row[2:])
+
+    zero = tuple(decimal.Decimal(0) for column in YTDColumns)
+    wrong = []
+    for key in sorted(set(stored) | set(actual)):
+        if stored.get(key, zero) != actual.get(key, zero):
+            wrong.append(key)
+    return wrong
+
+
+def getYTDTotals(paymentID):
+    """ Returns every YTD total for the employee receiving paymentID, through that payment's date, as a dictionary
+    keyed by column.
+
+    The year's running total is read from EmployeeYTD. Only payments dated after this one are summed and subtracted,
+    which is none at all when paymentID is the employee's latest payment of the year """
+
+    with connection():
+        payment = getPayment(paymentID)
+        endDate = payment.PaymentDate
+        nextYear = datetime.date(endDate.year + 1, 1, 1)
+
+        rows = query("getYTDRow", (payment.EmployeeID, endDate.year))
+
+        if not rows:
+            # No running total yet, so add the year up directly
+            return sumPayments(payment.EmployeeID, datetime.date(endDate.year, 1, 1), endDate + datetime.timedelta(1))
+
+        row = rows[0]
+        totals = dict(zip(YTDColumns, row[1:]))
+        # ThroughDate is never earlier than the employee's last payment of the year
+        if endDate < row[0]:
+            later = sumPayments(payment.EmployeeID, endDate + datetime.timedelta(1), nextYear)
+            for column in YTDColumns:
+                totals[column] -= later[column]
+
+    return totals
+
+
+def getYTDTotalsForPayments(payments):
+    """ Returns {PaymentID: YTD totals} for a list of Payment records, with the same totals as getYTDTotals.
+
+    Used for batches of paystubs: the running totals of every payment are computed by one windowed query per
+    MaxIDsPerQuery employees instead of one lookup per payment """
+
+    results = {}
+    employeeIDs = sorted(set(payment.EmployeeID for payment in payments if payment.EmployeeID is not None))
+    if not employeeIDs:
+        return results
+
+    years = [payment.PaymentDate.year for payment in payments]
+    dateRange = [datetime.date(min(years), 1, 1), datetime.date(max(years) + 1, 1, 1)]
+    wanted = set(payment.PaymentID for payment in payments)
+
+    # The default window frame includes every payment on the same date, as getYTD's PaymentDate <= endDate does
+    statement = "SELECT PaymentID, " + ", ".join("SUM(" + column + ") OVER ytd" for column in YTDColumns) + \
+                " FROM Payments WHERE EmployeeID IN (%s) AND PaymentDate >= %s AND PaymentDate < %s " \
+                "WINDOW ytd AS (PARTITION BY EmployeeID, YEAR(PaymentDate) ORDER BY PaymentDate)"
+
+    with connection():
+        for i in range(0, len(employeeIDs), MaxIDsPerQuery):
+            chunk = employeeIDs[i:i + MaxIDsPerQuery]
+            db.cursor.execute(statement.replace("IN (%s)", "IN (" + ", ".join(["%s"] * len(chunk)) + ")", 1),
+                              chunk + dateRange)
+            for row in db.cursor.fetchall():
+                if row[0] in wanted:
+                    totals = {}
+                    for column, value in zip(YTDColumns, row[1:]):
+                        totals[column] = value if value is not None else decimal.Decimal(0)
+                    results[row[0]] = totals
+
+    return results
+
+
+def getPaymentHistory(EmployeeID, rowCount=None, hidden=False, after=None):
+    """ Returns one page of EmployeeID's payments, most recent (PaymentDate, then PaymentID) first, as a list of
+    (Payment record, YTD totals) pairs. The totals are the same as getYTDTotals() gives for each payment, keyed by
+    YTDColumns.
+
+    For the next page, pass (PaymentDate, PaymentID) of the last payment of this page as after, as with
+    getPaymentPage(). Each page is one query: the running totals are computed by a window over the employee's payments
+    up to the page, so no row needs a lookup of its own """
+
+    # Hidden payments count toward the totals like they do on paystubs, so they are only filtered out after the window
+    inner = ["EmployeeID = %s"]
+    params = [int(EmployeeID)]
+    if after is not None:
+        # Payments dated after the page do not change its totals
+        inner.append("PaymentDate <= %s")
+        params.append(after[0])
+
+    outer = [hiddenCondition("PaymentIsHidden", hidden)]
+    if after is not None:
+        outer.append("(PaymentDate < %s OR (PaymentDate = %s AND PaymentID < %s))")
+        params.extend([after[0], after[0], int(after[1])])
+
+    # The default window frame includes every payment on the same date, as getYTDTotals() does
+    statement = "SELECT " + ", ".join(PaymentColumns) + ", " + ", ".join("YTD" + column for column in YTDColumns) + \
+                " FROM (SELECT " + ", ".join(PaymentColumns) + ", " + \
+                ", ".join("SUM(" + column + ") OVER ytd AS YTD" + column for column in YTDColumns) + \
+                " FROM Payments WHERE " + " AND ".join(inner) + \
+                " WINDOW ytd AS (PARTITION BY YEAR(PaymentDate) ORDER BY PaymentDate)) history" \
+                " WHERE " + " AND ".join(outer) + " ORDER BY PaymentDate DESC, PaymentID DESC"
+    if rowCount is not None:
+        statement += " LIMIT %s"
+        params.append(int(rowCount))
+
+    with connection():
+        db.cursor.execute(statement, params)
+        rows = db.cursor.fetchall()
+
+    history = []
+    for row in rows:
+        totals = {}
+        for column, value in zip(YTDColumns, row[len(PaymentColumns):]):
+            totals[column] = value if value is not None else decimal.Decimal(0)
+        history.append((Payment(row), totals))
+    return history
+
+
+def getYTD(paymentID, paymentColumn):
+    """ returns the YTD value of PaymentColumn for the employee receiving Payment ID """
+
+    return getYTDTotals(paymentID)[paymentColumn]
 
 
 def makeString(decValue):
@@ -597,76 +1386,54 @@ def addPosition(PositionName, PositionSalary='NULL', PositionHourlyRate='NULL',
                 PositionIsSE='NULL'):
     """ Creates a new entry on the Positions table """
 
-    establishConnection()
+    # Values are passed in NewPositionColumns order. 'NULL' and the .1 placeholder are sent as NULL
+    values = [PositionName, PositionSalary, PositionHourlyRate, PositionHousingAllowance, PositionHSA, PositionFedWH,
+              PositionSEWH, PositionIsSE, PositionPayInterval]
+    for i in range(len(values)):
+        if makeString(values[i]) == 'NULL':
+            values[i] = None
 
-    # Converts all values into NULL Strings if default, else makes them into Strings equal to user value
-    PositionSalaryStr = makeString(PositionSalary)
-    PositionHourlyRateStr = makeString(PositionHourlyRate)
-    PositionHousingAllowanceStr = makeString(PositionHousingAllowance)
-    PositionHSAStr = makeString(PositionHSA)
-    PositionSEWHStr = makeString(PositionSEWH)
-    PositionFedWHStr = makeString(PositionFedWH)
-    PositionIsSEStr = makeString(PositionIsSE)
-
-    PositionName = addQuote(PositionName)
-    PositionPayInterval = addQuote(PositionPayInterval)
-
-    db_cursor.execute("INSERT INTO Positions(PositionName, PositionSalary, PositionHourlyRate, "
-                      "PositionHousingAllowance, PositionHSA, PositionSEWH, PositionFedWH, PositionPayInterval, "
-                      "PositionIsSE)"
-                      "VALUES(" + PositionName + ", " + PositionSalaryStr + ", " + PositionHourlyRateStr + ", " +
-                      PositionHousingAllowanceStr + ", " + PositionHSAStr + ", " + PositionSEWHStr + ", " +
-                      PositionFedWHStr + ", " + PositionPayInterval + ", " + PositionIsSEStr + ");")
-
-    closeConnection()
+    with connection():
+        cursor = execute("addPosition", values)
+        invalidatePages(Position)
+        notify("position", "added", cursor.lastrowid)
 
 
 def deletePosition(PositionID):
     """ Deletes the specified positionID after updating all employees' PositionID with that position to 'NULL' """
 
-    establishConnection()
-
-    PositionIDStr = str(PositionID)
-
-    db_cursor.execute("UPDATE Employees SET PositionID = NULL WHERE PositionID = " + PositionIDStr
-                      + ";")
-    db_cursor.execute("DELETE FROM Positions WHERE PositionID = " + PositionIDStr + ";")
-
-    closeConnection()
+    with connection():
+        execute("clearEmployeePosition", (int(PositionID),))
+        execute("deletePosition", (int(PositionID),))
+        # Every employee that held the position changed as well
+        invalidateRecords(Employee)
+        invalidateRecords(Position, PositionID)
+        notify("position", "deleted", PositionID)
+        notify("employee", "changed")
 
 
 def hidePosition(PositionID):
     """ Hides the position with the specified positionID """
 
-    establishConnection()
-
-    PositionIDStr = str(PositionID)
-
-    db_cursor.execute("UPDATE Positions SET PositionIsHidden = 1 WHERE PositionID = " + PositionIDStr + ";")
-
-    closeConnection()
+    with connection():
+        execute("setPositionHidden", (1, int(PositionID)))
+        invalidateRecords(Position, PositionID)
+        notify("position", "hidden", PositionID)
 
 
 def revealPosition(PositionID):
     """ Unhides the position specified by the PositionID """
 
-    establishConnection()
-
-    PositionIDStr = str(PositionID)
-
-    db_cursor.execute("UPDATE Positions SET PositionIsHidden = 0 WHERE PositionID = " + PositionIDStr + ";")
-
-    closeConnection()
+    with connection():
+        execute("setPositionHidden", (0, int(PositionID)))
+        invalidateRecords(Position, PositionID)
+        notify("position", "revealed", PositionID)
 
 
 def getPositionValue(PositionID, PositionColumn):
-    """ returns the value in the PaymentColumn column of the Payments table from the row with PaymentID
-
-    Must establish connection before calling """
+    """ returns the value in the PositionColumn column of the Positions table from the row with PositionID """
 
-    PositionIDStr = str(PositionID)
-    db_cursor.execute("SELECT " + PositionColumn + " FROM Positions WHERE PositionID = " + PositionIDStr)
-    return getValue()
+    return getattr(getPosition(PositionID), checkColumn(Position, PositionColumn))
 
 
 def editTable(TableName, ID, ColumnName, ColumnValue):
@@ -679,37 +1446,112 @@ def editTable(TableName, ID, ColumnName, ColumnValue):
     For ColumnName:
         Pass as String
     For ColumnValue:
-        If number, pass as string (ex. ColumnValue = "3")
-        If string, pass as string with extra set of '' (ex. ColumnValue = "'Accountant'")
+        Pass the value itself, or 'NULL'. Values written the old way, as SQL text with an extra set of ''
+        (ex. ColumnValue = "'Accountant'"), are still accepted
     """
 
-    establishConnection()
+    RecordType = getRecordType(TableName)
+    if isinstance(ColumnValue, str) and len(ColumnValue) > 1 and ColumnValue[0] == ColumnValue[-1] == "'":
+        ColumnValue = ColumnValue[1:-1]
+    name = columnStatement("editTable", RecordType, ColumnName,
+                           "UPDATE " + RecordType.table + " SET {column} = %s WHERE " + RecordType.key + " = %s")
 
-    IDName = 'NULL'
+    with connection():
+        # Payment changes that move money between running totals are applied to EmployeeYTD as well
+        updatesYTD = RecordType is Payment and (ColumnName in YTDColumns or ColumnName in ("EmployeeID",
+                                                                                           "PaymentDate"))
+        if updatesYTD:
+            before = getPayment(ID)
 
-    # Sets IDName based on what table is being accessed
-    if TableName == "Employees":
-        IDName = "EmployeeID"
-    elif TableName == "Payments":
-        IDName = "PaymentID"
-    elif TableName == "Positions":
-        IDName = "PositionID"
+        execute(name, (toParameter(ColumnValue), int(ID)))
+        invalidateRecords(RecordType, ID)
+        notify(RecordType.__name__.lower(), "changed", ID)
 
-    # Converts ID to a string
-    IDStr = str(ID)
+        if updatesYTD:
+            applyYTD(before, -1)
+            applyYTD(getPayment(ID), 1)
 
-    # Updates Database
-    if not IDName == 'NULL':
-        db_cursor.execute("UPDATE " + TableName + " SET " + ColumnName + " = " + ColumnValue + " WHERE " + IDName +
-                          " = " + IDStr + ";")
 
-    closeConnection()
+def convertLike(value, example):
+    """ Converts value (often text from an entry box) to the type of example, a value loaded from the database, so the
+    two can be compared. Returns value unchanged if it cannot be converted """
+
+    if value is None or example is None or isinstance(value, type(example)):
+        return value
+    try:
+        if isinstance(example, bool) or isinstance(example, int):
+            return int(value)
+        if isinstance(example, decimal.Decimal):
+            return decimal.Decimal(str(value))
+        if isinstance(example, datetime.date):
+            text = str(value).replace('-', '').replace('/', '')
+            return datetime.date(int(text[:4]), int(text[4:6]), int(text[6:8]))
+        if isinstance(example, datetime.timedelta):
+            parts = [int(part) for part in str(value).split(':')] + [0, 0]
+            return datetime.timedelta(hours=parts[0], minutes=parts[1], seconds=parts[2])
+    except (ValueError, ArithmeticError, IndexError):
+        pass
+    return value
+
+
+def updateRecord(RecordType, ID, values, original=None):
+    """ Saves the changes in values, a dictionary of column name to new value (None for NULL), to the RecordType row
+    with ID. Pass the record as loaded by the caller as original to skip reloading it.
+
+    Only columns whose value actually changed are written, with one UPDATE in one transaction. Returns a dictionary
+    of the columns that were changed """
+
+    for column in values:
+        if column not in RecordType.__slots__ or column == RecordType.key:
+            raise ValueError(column + " is not an editable column of " + RecordType.table)
+
+    with transaction():
+        if original is None:
+            original = getRecord(RecordType, ID)
+
+        changes = {}
+        for column, value in values.items():
+            oldValue = getattr(original, column)
+            if convertLike(value, oldValue) != oldValue:
+                changes[column] = value
+        if not changes:
+            return changes
+
+        db.cursor.execute("UPDATE " + RecordType.table + " SET " + ", ".join(column + " = %s" for column in changes) +
+                          " WHERE " + RecordType.key + " = %s", list(changes.values()) + [int(ID)])
+        invalidateRecords(RecordType, ID)
+        notify(RecordType.__name__.lower(), "changed", ID)
+
+        # Payment edits that move money between running totals are applied to EmployeeYTD as well
+        if RecordType is Payment and any(column in YTDColumns or column in ("EmployeeID", "PaymentDate")
+                                         for column in changes):
+            applyYTD(original, -1)
+            applyYTD(getPayment(ID), 1)
+
+    return changes
+
+
+def updateEmployee(EmployeeID, values, original=None):
+    """ Saves the changed columns in values to an employee. See updateRecord """
+
+    return updateRecord(Employee, EmployeeID, values, original)
+
+
+def updatePayment(PaymentID, values, original=None):
+    """ Saves the changed columns in values to a payment. See updateRecord """
+
+    return updateRecord(Payment, PaymentID, values, original)
+
+
+def updatePosition(PositionID, values, original=None):
+    """ Saves the changed columns in values to a position. See updateRecord """
+
+    return updateRecord(Position, PositionID, values, original)
 
 
 def formatDate(date):
-    """ Formats [date] to be readable for dumb Americans """
+    """ Formats [date] to be readable for dumb Americans. Kept for older callers; formatting is done locally by
+    Format.formatDate without a trip to the server """
 
-    dateStr = str(date)
-    db_cursor.execute("SELECT DATE_FORMAT('" + dateStr + "', '%m/%d/%Y');")
-    return getValue()
+    return Format.formatDate(date)
 
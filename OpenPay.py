@@ -1,15 +1,35 @@
 import datetime
 import decimal
+import os
+import time
 import tkinter as tk
 import tkinter.font
+import tkinter.filedialog
 import tkinter.messagebox
+import tkinter.simpledialog
 from tkinter import ttk
 
+import Cache
+import Diagnostics
+import Events
+import Format
+import Export
 import Generate
+import Import
+import Migrations
 import MySQL
+import Payroll
+import Table
+import Worker
 
-MySQL.createDatabase()
-MySQL.createTables()
+LaunchTime = time.perf_counter()
+# When OpenPay started loading, for the startup timing report. main() is given an earlier time by OpenPay.pyw
+
+StartupTarget = .3
+# Seconds from launch until the window should be interactive. printStartupTimes() flags slower starts
+
+StartupTimes = []
+# (step, seconds since launch) for each step of startup, see markStartup()
 
 
 class ScrollableFrame(ttk.Frame):
@@ -59,22 +79,54 @@ class ScrollableFrame(ttk.Frame):
         self.canvas.configure(scrollregion=self.canvas.bbox('all'))
 
 
+class Page:
+    """ A page of the window, whose ScrollableFrame is only created, placed and filled in by [build] the first time it
+    is used, so startup does not build pages that are never opened.
+
+    Use it like the ScrollableFrame itself: page.scrollable_frame and page.lift() build the page if needed """
+
+    def __init__(self, build=None):
+        self.build = build
+        self.frame = None
+        # The page's Table.VirtualTables, see newTable()
+        self.tables = []
+
+    def get(self):
+        """ Returns the page's ScrollableFrame, building the page the first time """
+
+        if self.frame is None:
+            self.frame = ScrollableFrame(root)
+            self.frame.place(in_=root, x=0, y=0, relwidth=1, relheight=1)
+            if self.build is not None:
+                self.build()
+        return self.frame
+
+    @property
+    def scrollable_frame(self):
+        return self.get().scrollable_frame
+
+    def lift(self):
+        self.get().lift()
+
+
 # ***** Page Frames *****
 root = tk.Tk()
 root.title("OpenPay")
 root.geometry("1280x720")
 root.configure(background="gray")
-homeFrame = ScrollableFrame(root)
-employeesFrame = ScrollableFrame(root)
-hiddenEmployeesFrame = ScrollableFrame(root)
-addEditEmployeeFrame = ScrollableFrame(root)
-paymentsFrame = ScrollableFrame(root)
-hiddenPaymentsFrame = ScrollableFrame(root)
-addEditPaymentFrame = ScrollableFrame(root)
-quarterlyFrame = ScrollableFrame(root)
-positionsFrame = ScrollableFrame(root)
-hiddenPositionsFrame = ScrollableFrame(root)
-addEditPositionFrame = ScrollableFrame(root)
+# Each page's builder is set in On Start
+homeFrame = Page()
+employeesFrame = Page()
+hiddenEmployeesFrame = Page()
+addEditEmployeeFrame = Page()
+paymentsFrame = Page()
+hiddenPaymentsFrame = Page()
+addEditPaymentFrame = Page()
+quarterlyFrame = Page()
+runPayrollFrame = Page()
+positionsFrame = Page()
+hiddenPositionsFrame = Page()
+addEditPositionFrame = Page()
 
 # ***** Global Variables *****
 
@@ -83,95 +135,137 @@ selectedPayment = tk.IntVar()
 selectedPosition = tk.IntVar()
 timeOfDay = tk.IntVar()
 
+# ***** Background Work *****
+
+statusLabel = tk.Label(root, text="Loading...", bg="yellow", padx=10, pady=2)
+
+# Tables and Worker Tokens of the page being shown, cancelled when another page is opened
+PageTables = []
+PageWork = []
+
+
+def showStatus(busy, text="Loading..."):
+    """ Shows [text] in the bottom right corner while the worker has database work running """
 
+    if busy:
+        statusLabel.configure(text=text)
+        statusLabel.place(relx=1, rely=1, anchor="se")
+        statusLabel.lift()
+    else:
+        statusLabel.place_forget()
+
+
+# Runs table loads, reports, paystubs and record changes off the Tk thread, so the window never freezes on MySQL
+worker = Worker.Worker(root, indicator=showStatus)
+
+
+def runInBackground(function, *args):
+    """ Calls function(*args) on the worker, ex. to save a change. The tables are patched when the change is committed
+    (see onEmployeeEvent) """
+
+    return worker.submit(lambda token: function(*args))
+
+
+def showPage(page):
+    """ Lifts [page] over the other pages, building it the first time. Table loads and reports still running for the
+    page being left are cancelled, and the tables of the new page finish any first page that was cancelled before it
+    arrived """
+
+    page.get()
+    for token in PageWork:
+        token.cancel()
+    PageWork.clear()
+    for table in PageTables:
+        if table not in page.tables:
+            table.cancel()
+    PageTables[:] = page.tables
+    for table in page.tables:
+        table.resume()
+    page.lift()
+    if worker.busy:
+        statusLabel.lift()
+
+
+@Diagnostics.tracked
 def openHome():
-    """ Opens the home page after refreshing all tables """
+    """ Opens the home page. Its tables are kept up to date as records change """
 
-    refreshEmployeeTables()
-    refreshPaymentTables()
-    refreshPositionTables()
-    homeFrame.lift()
+    showPage(homeFrame)
 
 
+@Diagnostics.tracked
 def openEmployees():
-    """  Builds the employee tables and opens the employees page """
+    """  Opens the employees page, building the employees table the first time """
 
-    refreshEmployeeTables()
-    buildEmployeesTable(50)
-    employeesFrame.lift()
+    showPage(employeesFrame)
+    if employeesTable.loadPage is None:
+        buildEmployeesTable(50)
 
 
+@Diagnostics.tracked
 def openNewEmployee():
     """ Opens New Employee Page """
 
     for widget in addEditEmployeeFrame.scrollable_frame.winfo_children():
         widget.destroy()
     buildAddEditEmployee(0)
-    addEditEmployeeFrame.lift()
+    showPage(addEditEmployeeFrame)
 
 
+@Diagnostics.tracked
 def openEditEmployee():
     """ Opens Edit employee Page """
 
     for widget in addEditEmployeeFrame.scrollable_frame.winfo_children():
         widget.destroy()
     buildAddEditEmployee(selectedEmployee.get())
-    addEditEmployeeFrame.lift()
+    showPage(addEditEmployeeFrame)
 
 
+@Diagnostics.tracked
 def openHiddenEmployees():
     """ Opens the hidden employees list """
 
-    buildHiddenEmployeesTable(50)
-    hiddenEmployeesFrame.lift()
+    showPage(hiddenEmployeesFrame)
+    if hiddenEmployeesTable.loadPage is None:
+        buildHiddenEmployeesTable(50)
 
 
+@Diagnostics.tracked
 def hideEmployee():
     """ If there is an employee selected, gives a warning box. If the user selects yes, hides the selected Employee. """
 
     if selectedEmployee.get() == 0:
         tkinter.messagebox.showinfo("Hide Employee", "You must select an employee first.")
     else:
-        MySQL.establishConnection()
         message = "Are you sure you want to hide " + MySQL.getEmployeeFN_LN(selectedEmployee.get()) + "?"
         answer = tkinter.messagebox.askquestion("Hide Employee Confirmation", message)
         if answer == 'yes':
-            MySQL.hideEmployee(selectedEmployee.get())
-            refreshEmployeeTables()
-        MySQL.closeConnection()
+            runInBackground(MySQL.hideEmployee, selectedEmployee.get())
 
 
+@Diagnostics.tracked
 def revealEmployee():
     """ Reveals the selected employee if user responds "Yes" to warning. """
 
     if selectedEmployee.get() == 0:
         tkinter.messagebox.showinfo("Reveal Employee", "You must select an employee first.")
     else:
-        MySQL.establishConnection()
         message = "Are you sure you want to reveal " + MySQL.getEmployeeFN_LN(selectedEmployee.get()) + "?"
         answer = tkinter.messagebox.askquestion("Reveal Employee Confirmation", message)
         if answer == 'yes':
-            MySQL.revealEmployee(selectedEmployee.get())
-            refreshEmployeeTables()
-        MySQL.closeConnection()
+            runInBackground(MySQL.revealEmployee, selectedEmployee.get())
 
 
+@Diagnostics.tracked
 def refreshEmployeeTables():
-    """ Refreshes all employee tables.
+    """ Reloads every employee table. Changes made through MySQL.py patch the tables on their own (see
+    onEmployeeEvent), so this is only needed for changes made outside OpenPay """
 
-    Call this function after making changes to any employee. """
-
-    for widget in homeEmployeesPreview.winfo_children():
-        widget.destroy()
-    for widget in employeesTable.winfo_children():
-        widget.destroy()
-    for widget in hiddenEmployeesTable.winfo_children():
-        widget.destroy()
-    homeBuildEmployeesPreview(5)
-    buildEmployeesTable(50)
-    buildHiddenEmployeesTable(50)
+    reloadTables(EmployeeTables)
 
 
+@Diagnostics.tracked
 def deleteEmployee():
     """
     If there is an employee selected, gives a warning popup. If the user selects yes, deletes the selected employee.
@@ -180,111 +274,180 @@ def deleteEmployee():
     if selectedEmployee.get() == 0:
         tkinter.messagebox.showinfo("Delete Employee", "You must select an employee first.")
     else:
-        MySQL.establishConnection()
-        message = "Are you sure you want to delete " + MySQL.getEmployeeFN_LN(selectedEmployee.get()) + \
-                  "? This will also delete every payment associated with " + \
-                  MySQL.getEmployeeFN_LN(selectedEmployee.get()) + \
-                  ". It is recommended that you hide employees rather than deleting them."
+        name = MySQL.getEmployeeFN_LN(selectedEmployee.get())
+        message = "Are you sure you want to delete " + name + "? This will also delete every payment associated " \
+                  "with " + name + ". It is recommended that you hide employees rather than deleting them."
         answer = tkinter.messagebox.askquestion("Delete Employee Confirmation", message)
         if answer == 'yes':
-            MySQL.deleteEmployee(selectedEmployee.get())
-            refreshEmployeeTables()
-        MySQL.closeConnection()
+            runInBackground(MySQL.deleteEmployee, selectedEmployee.get())
 
 
+@Diagnostics.tracked
 def openPayments():
     """ opens the Payments Page"""
 
-    buildPaymentsTable(100)
-    paymentsFrame.lift()
+    showPage(paymentsFrame)
+    # The table may be showing one employee's payments
+    if paymentsTable.loadPage is None or paymentsTable.loadPage.employeeID is not None:
+        buildPaymentsTable(100)
     return
 
 
+@Diagnostics.tracked
 def openHiddenPayments():
     """ Opens the list of Hidden Payments """
 
-    buildHiddenPaymentsTable(100)
-    hiddenPaymentsFrame.lift()
+    showPage(hiddenPaymentsFrame)
+    if hiddenPaymentsTable.loadPage is None:
+        buildHiddenPaymentsTable(100)
     return
 
 
+@Diagnostics.tracked
 def openEmployeePayments():
     """ Opens a table of payments for a the selected employee """
 
-    buildEmployeePaymentsTable(100, selectedEmployee.get())
-    paymentsFrame.lift()
+    showPage(paymentsFrame)
+    buildEmployeePaymentsTable(selectedEmployee.get(), 100)
 
 
+@Diagnostics.tracked
 def openSimilarPayments():
     """ Opens a table of payments for all payments with the same employeeID as the selected payment """
 
     MySQL.establishConnection()
     try:
-        buildEmployeePaymentsTable(MySQL.getPaymentValue(selectedPayment.get(), "EmployeeID"))
+        employeeID = MySQL.getPaymentValue(selectedPayment.get(), "EmployeeID")
+        showPage(paymentsFrame)
+        buildEmployeePaymentsTable(employeeID)
     except:
         print(MySQL.getPaymentValue(selectedPayment.get(), "EmployeeID"))
         print("error")
         return
-    paymentsFrame.lift()
+    finally:
+        MySQL.closeConnection()
 
 
+@Diagnostics.tracked
 def openNewPayment():
     """ Opens the new payment page """
 
     for widget in addEditPaymentFrame.scrollable_frame.winfo_children():
         widget.destroy()
     buildAddEditPayment(0)
-    addEditPaymentFrame.lift()
+    showPage(addEditPaymentFrame)
 
 
+@Diagnostics.tracked
 def openEditPayment():
     """ Opens the edit payment page """
 
     for widget in addEditPaymentFrame.scrollable_frame.winfo_children():
         widget.destroy()
     buildAddEditPayment(selectedPayment.get())
-    addEditPaymentFrame.lift()
+    showPage(addEditPaymentFrame)
 
 
+@Diagnostics.tracked
 def openPayEmployee():
     """ Opens a new payment for the selected employee """
 
     for widget in addEditPaymentFrame.scrollable_frame.winfo_children():
         widget.destroy()
     buildAddEditPayment(0, employeeID=selectedEmployee.get())
-    addEditPaymentFrame.lift()
+    showPage(addEditPaymentFrame)
+
+
+@Diagnostics.tracked
+def openRunPayroll():
+    """ Opens the Run Payroll page """
+
+    for widget in runPayrollFrame.scrollable_frame.winfo_children():
+        widget.destroy()
+    buildRunPayroll()
+    showPage(runPayrollFrame)
 
 
+@Diagnostics.tracked
 def openQuarterly():
     """ Opens the Quarterly Reports Page """
 
+    showPage(quarterlyFrame)
     buildQuarterlyTables()
-    quarterlyFrame.lift()
 
 
+@Diagnostics.tracked
 def hidePayment():
     """ If there is a payment selected, gives a warning box. If the user selects yes, hides the selectedPayment. """
 
     if selectedPayment.get() == 0:
         tkinter.messagebox.showinfo("Hide Payment", "You must select a payment first.")
     else:
-        MySQL.establishConnection()
         message = "Are you sure you want to hide the selected payment?"
         answer = tkinter.messagebox.askquestion("Hide Payment Confirmation", message)
         if answer == 'yes':
-            MySQL.hidePayment(selectedPayment.get())
-            refreshPaymentTables()
-        MySQL.closeConnection()
-    refreshPaymentTables()
+            runInBackground(MySQL.hidePayment, selectedPayment.get())
 
 
+@Diagnostics.tracked
 def generatePaystub():
-    """ Generates a paystub for the selected payment """
+    """ Generates a paystub for the selected payment on the worker, then opens it """
 
-    Generate.generatePaystub(selectedPayment.get())
-    return
+    paymentID = selectedPayment.get()
+    if paymentID == 0:
+        tkinter.messagebox.showinfo("Generate Paystub", "You must select a payment first.")
+        return
+
+    def failed(error):
+        tkinter.messagebox.showinfo("Generate Paystub", "The paystub was not generated: " + str(error))
+
+    # Not cancelled by changing pages, since the user is waiting for the file
+    worker.submit(lambda token: Generate.savePaystub(paymentID), os.startfile, failed)
+
+
+@Diagnostics.tracked
+def generatePaystubs():
+    """ Asks for a date range and generates paystubs for every visible payment in it, saving them to PayStubs """
+
+    startDate = tkinter.simpledialog.askstring("Generate Paystubs", "First payment date (MM/DD/YYYY):")
+    if not startDate:
+        return
+    endDate = tkinter.simpledialog.askstring("Generate Paystubs", "Last payment date (MM/DD/YYYY):")
+    if not endDate:
+        return
+    try:
+        startDate = Format.parseDate(startDate)
+        endDate = Format.parseDate(endDate)
+    except ValueError:
+        tkinter.messagebox.showinfo("Generate Paystubs", "Dates must be entered as MM/DD/YYYY.")
+        return
+
+    startTime = datetime.datetime.now()
+    # Worker processes re-import the main module. That only leaves the GUI alone when it was started by OpenPay.pyw,
+    # so running OpenPay.py directly renders the stubs on the worker thread instead
+    processes = 1 if __name__ == "__main__" else None
+
+    def generate(token):
+        def progress(done, total):
+            token.check()
+            worker.call(showStatus, True, "Generating paystubs " + str(done) + "/" + str(total) + "...")
+        return Generate.generatePaystubs(startDate=startDate, endDate=endDate, processes=processes, progress=progress)
 
+    def finished(result):
+        paths, skipped = result
+        seconds = (datetime.datetime.now() - startTime).total_seconds()
+        message = str(len(paths)) + " paystubs saved to " + Generate.PaystubFolder + " in " + \
+            str(round(seconds, 1)) + " seconds."
+        if skipped:
+            message += "\n" + str(len(skipped)) + " payments have no employee and were skipped (PaymentID " + \
+                ", ".join(str(paymentID) for paymentID in skipped) + ")."
+        tkinter.messagebox.showinfo("Generate Paystubs", message)
 
+    # Not cancelled by changing pages, since the user is waiting for the files
+    worker.submit(generate, finished)
+
+
+@Diagnostics.tracked
 def revealPayment():
     """ If there is a hidden payment selected, gives a warning box.
 
@@ -293,15 +456,13 @@ def revealPayment():
     if selectedPayment.get() == 0:
         tkinter.messagebox.showinfo("Reveal Payment", "You must select a payment first.")
     else:
-        MySQL.establishConnection()
         message = "Are you sure you want to reveal the selected payment?"
         answer = tkinter.messagebox.askquestion("Reveal Payment Confirmation", message)
         if answer == 'yes':
-            MySQL.revealPayment(selectedPayment.get())
-            refreshPaymentTables()
-        MySQL.closeConnection()
+            runInBackground(MySQL.revealPayment, selectedPayment.get())
 
 
+@Diagnostics.tracked
 def deletePayment():
     """ If there is a payment selected, gives a warning popup. If the user selects yes, deletes the selected
     employee. """
@@ -309,80 +470,98 @@ def deletePayment():
     if selectedPayment.get() == 0:
         tkinter.messagebox.showinfo("Delete Payment", "You must select a payment first.")
     else:
-        MySQL.establishConnection()
         message = "Are you sure you want to delete this Payment?"
         answer = tkinter.messagebox.askquestion("Delete Payment Confirmation", message)
         if answer == 'yes':
-            MySQL.deletePayment(selectedPayment.get())
-            refreshPaymentTables()
-        MySQL.closeConnection()
-    refreshPaymentTables()
+            runInBackground(MySQL.deletePayment, selectedPayment.get())
 
 
+@Diagnostics.tracked
 def refreshPaymentTables():
-    """ Refreshes the homePaymentPreview table. Call this function after making changes to the employees table. """
+    """ Reloads every payment table. Changes made through MySQL.py patch the tables on their own (see onPaymentEvent),
+    so this is only needed for changes made outside OpenPay """
 
-    for widget in homePaymentsPreview.winfo_children():
-        widget.destroy()
-    for widget in paymentsTable.winfo_children():
-        widget.destroy()
-    for widget in hiddenPaymentsTable.winfo_children():
-        widget.destroy()
-    homeBuildPaymentsPreview(5)
-    buildPaymentsTable(50)
-    buildHiddenPaymentsTable(50)
+    reloadTables(PaymentTables)
 
 
+@Diagnostics.tracked
+def checkYTDTotals():
+    """ Checks the running YTD totals used on paystubs against the payments table on the worker and offers to rebuild
+    them. Both scan every payment, so they never run on the Tk thread """
+
+    def checked(wrong):
+        if not wrong:
+            tkinter.messagebox.showinfo("Check YTD Totals", "All YTD totals match the payments table.")
+            return
+        message = str(len(wrong)) + " employee-year YTD totals do not match the payments table. Rebuild them now?"
+        answer = tkinter.messagebox.askquestion("Check YTD Totals", message)
+        if answer == 'yes':
+            # Not cancelled by changing pages once the user has confirmed it
+            worker.submit(lambda token: MySQL.rebuildYTD(), rebuilt, failed)
+
+    def rebuilt(result):
+        tkinter.messagebox.showinfo("Check YTD Totals", "The YTD totals were rebuilt from the payments table.")
+
+    def failed(error):
+        tkinter.messagebox.showinfo("Check YTD Totals", "The YTD totals could not be checked or rebuilt: " +
+                                    str(error))
+
+    worker.submit(lambda token: MySQL.checkYTD(), checked, failed)
+
+
+@Diagnostics.tracked
 def openPositions():
     """ Opens the positions page """
 
-    for widget in positionsTable.winfo_children():
-        widget.destroy()
-    buildPositionsTable(50)
-    positionsFrame.lift()
+    showPage(positionsFrame)
+    if positionsTable.loadPage is None:
+        buildPositionsTable(50)
 
 
+@Diagnostics.tracked
 def openNewPosition():
     """ Opens the New Position Page """
 
     for widget in addEditPositionFrame.scrollable_frame.winfo_children():
         widget.destroy()
     buildAddEditPosition(0)
-    addEditPositionFrame.lift()
+    showPage(addEditPositionFrame)
 
 
+@Diagnostics.tracked
 def openEditPosition():
     """ Opens the Edit Position Page """
 
     for widget in addEditPositionFrame.scrollable_frame.winfo_children():
         widget.destroy()
     buildAddEditPosition(selectedPosition.get())
-    addEditPositionFrame.lift()
+    showPage(addEditPositionFrame)
 
 
+@Diagnostics.tracked
 def hidePosition():
     """ If there is a position selected, gives a warning box. If the user selects yes, hides the selectedPosition. """
 
     if selectedPosition.get() == 0:
         tkinter.messagebox.showinfo("Hide Position", "You must select a position first.")
     else:
-        MySQL.establishConnection()
         message = "Are you sure you want to hide " + MySQL.getPositionValue(selectedPosition.get(), "PositionName") + \
                   "?"
         answer = tkinter.messagebox.askquestion("Hide Position Confirmation", message)
         if answer == 'yes':
-            MySQL.hidePosition(selectedPosition.get())
-            refreshPositionTables()
-        MySQL.closeConnection()
+            runInBackground(MySQL.hidePosition, selectedPosition.get())
 
 
+@Diagnostics.tracked
 def openHiddenPositions():
     """ Opens the Hidden Positions Page """
 
-    buildHiddenPositionsTable(50)
-    hiddenPositionsFrame.lift()
+    showPage(hiddenPositionsFrame)
+    if hiddenPositionsTable.loadPage is None:
+        buildHiddenPositionsTable(50)
 
 
+@Diagnostics.tracked
 def deletePosition():
     """ If there is a position selected, gives a warning popup. If the user selects yes, deletes the selected
     position. """
@@ -390,184 +569,514 @@ def deletePosition():
     if selectedPosition.get() == 0:
         tkinter.messagebox.showinfo("Delete Position", "You must select a position first.")
     else:
-        MySQL.establishConnection()
         message = "Are you sure you want to delete " + MySQL.getPositionValue(selectedPosition.get(), "PositionName") + \
                   "?"
         answer = tkinter.messagebox.askquestion("Delete Position Confirmation", message)
         if answer == 'yes':
-            MySQL.deletePosition(selectedPosition.get())
-            refreshPositionTables()
-        MySQL.closeConnection()
+            runInBackground(MySQL.deletePosition, selectedPosition.get())
 
 
+@Diagnostics.tracked
 def revealPosition():
     """ If there is a position selected, gives a warning box. If the user selects yes, reveals the selectedPosition. """
 
     if selectedPosition.get() == 0:
         tkinter.messagebox.showinfo("Reveal Position", "You must select a position first.")
     else:
-        MySQL.establishConnection()
         message = "Are you sure you want to reveal " + MySQL.getPositionValue(selectedPosition.get(), "PositionName") + \
                   "?"
         answer = tkinter.messagebox.askquestion("Reveal Position Confirmation", message)
         if answer == 'yes':
-            MySQL.revealPosition(selectedPosition.get())
-            refreshPositionTables()
-        MySQL.closeConnection()
+            runInBackground(MySQL.revealPosition, selectedPosition.get())
 
 
+@Diagnostics.tracked
 def refreshPositionTables():
-    """ Refreshes the homePositionsPreview table. Call this function after making changes to the positions table. """
+    """ Reloads every position table. Changes made through MySQL.py patch the tables on their own (see onPositionEvent),
+    so this is only needed for changes made outside OpenPay """
 
-    for widget in homePositionsPreview.winfo_children():
-        widget.destroy()
-    for widget in positionsTable.winfo_children():
-        widget.destroy()
-    for widget in hiddenPositionsTable.winfo_children():
-        widget.destroy()
-    homeBuildPositionsPreview(5)
-    buildPositionsTable(50)
-    buildHiddenPositionsTable(50)
+    reloadTables(PositionTables)
+
+
+# ***** Diagnostics *****
+
+ActionHeaders = ("Action", "Runs", "Queries", "Queries/Run", "Most Queries", "Rows", "Total ms")
+StatementHeaders = ("Statement", "Runs", "Rows", "Total ms", "Mean ms", "p95 ms", "Max ms", "Actions")
+NPlusOneHeaders = ("Action", "Statement", "Flagged Runs", "Most Repeats")
+
+StatementWidth = 600
+# Width in pixels of the Statement columns, which hold whole SQL statements
+
+# The diagnostics window and its tables, created by openDiagnostics()
+diagnosticsWindow = None
+DiagnosticsTables = {}
+
+
+def getDiagnosticsExtras():
+    """ Returns the statistics kept outside Diagnostics, saved alongside its report """
+
+    return {"backend": MySQL.getBackend().name, "preparedStatements": MySQL.getStatementStats(),
+            "caches": Cache.getStats(), "startupMs": {step: round(seconds * 1000) for step, seconds in StartupTimes}}
+
+
+def openDiagnostics():
+    """ Opens the diagnostics window: the queries run by each action, every statement shape with its latency, and the
+    likely N+1 query patterns, with buttons to refresh, reset and save them as JSON """
+
+    global diagnosticsWindow
+
+    if diagnosticsWindow is not None and diagnosticsWindow.winfo_exists():
+        diagnosticsWindow.lift()
+        refreshDiagnostics()
+        return
+
+    diagnosticsWindow = tk.Toplevel(root)
+    diagnosticsWindow.title("OpenPay Diagnostics")
+    diagnosticsWindow.geometry("1280x720")
+
+    toolbar = tk.Frame(diagnosticsWindow, bg="gray", pady=5)
+    tk.Button(toolbar, text="Refresh", command=refreshDiagnostics).pack(side="left", padx=5, pady=5)
+    tk.Button(toolbar, text="Reset", command=resetDiagnostics).pack(side="left", padx=5, pady=5)
+    tk.Button(toolbar, text="Save JSON", command=saveDiagnostics).pack(side="left", padx=5, pady=5)
+    toolbar.pack(side="top", fill="x")
+
+    for name, title, headers in (("actions", "Queries by Action", ActionHeaders),
+                                 ("statements", "Statements, slowest first", StatementHeaders),
+                                 ("nPlusOne", "Likely N+1 Queries", NPlusOneHeaders)):
+        tk.Label(diagnosticsWindow, text=title, font=f2).pack(fill="x")
+        table = Table.VirtualTable(diagnosticsWindow, headers, height=6)
+        if "Statement" in headers:
+            table.tree.column(str(headers.index("Statement")), anchor="w", width=StatementWidth)
+        table.pack(fill="both", expand=True, padx=5, pady=(0, 10))
+        DiagnosticsTables[name] = table
+
+    refreshDiagnostics()
+
+
+def refreshDiagnostics():
+    """ Shows what Diagnostics has recorded so far in the diagnostics window """
+
+    report = Diagnostics.getReport()
+
+    actions = sorted(report["actions"].items(), key=lambda item: -item[1]["queries"])
+    DiagnosticsTables["actions"].showRows(
+        [(index, (name, stats["runs"], stats["queries"], stats["queriesPerRun"], stats["maxQueries"], stats["rows"],
+                  stats["ms"]))
+         for index, (name, stats) in enumerate(actions)])
+
+    statements = sorted(report["statements"].items(), key=lambda item: -item[1]["ms"])
+    DiagnosticsTables["statements"].showRows(
+        [(index, (shape, stats["count"], stats["rows"], stats["ms"], stats["meanMs"], stats["p95Ms"], stats["maxMs"],
+                  ", ".join(sorted(stats["actions"]))))
+         for index, (shape, stats) in enumerate(statements)])
+
+    DiagnosticsTables["nPlusOne"].showRows(
+        [(index, (suspect["action"], suspect["statement"], suspect["runs"], suspect["maxRepeats"]))
+         for index, suspect in enumerate(report["nPlusOne"])])
+
+
+def resetDiagnostics():
+    """ Forgets everything Diagnostics has recorded, ex. before repeating one action to measure it alone """
+
+    Diagnostics.reset()
+    refreshDiagnostics()
+
+
+def saveDiagnostics():
+    """ Saves the diagnostics report as JSON, to compare against a report from another release """
+
+    path = tkinter.filedialog.asksaveasfilename(parent=diagnosticsWindow, title="Save Diagnostics",
+                                                defaultextension=".json", initialfile="OpenPay-diagnostics.json",
+                                                filetypes=[("JSON", "*.json")])
+    if path:
+        Diagnostics.dump(path, getDiagnosticsExtras())
+
+
+# ***** Import and Export *****
+
+ImportFileTypes = [("CSV or Excel", "*.csv *.xlsx"), ("CSV", "*.csv"), ("Excel", "*.xlsx")]
+
+ExportFileTypes = [("CSV", "*.csv"), ("CSV, gzipped", "*.csv.gz"), ("JSON Lines", "*.jsonl"),
+                   ("JSON Lines, gzipped", "*.jsonl.gz"), ("Parquet", "*.parquet")]
+
+ImportErrorsShown = 15
+# Rejected rows listed in the message shown after an import. All of them are written to the import's errors file
+
+
+def importFile(kind, importer):
+    """ Asks for a .csv or .xlsx file of [kind] ("employees" or "payments") and imports it on the worker with importer
+    (Import.importEmployees or Import.importPayments), then shows how many rows were imported and why any were
+    rejected. The tables update from the events the import sends """
+
+    path = tkinter.filedialog.askopenfilename(title="Import " + kind.title(), filetypes=ImportFileTypes)
+    if not path:
+        return
+
+    def run(token):
+        def progress(rows):
+            worker.call(showStatus, True, "Importing " + kind + ": " + str(rows) + " rows read...")
+        return importer(path, progress=progress)
+
+    def finished(result):
+        message = str(result) + "."
+        for line, error in result.errors[:ImportErrorsShown]:
+            message += "\nLine " + str(line) + ": " + error
+        if result.errorCount > ImportErrorsShown:
+            message += "\n..."
+        if result.errorsPath is not None:
+            message += "\nEvery rejected row is listed in " + result.errorsPath + "."
+        tkinter.messagebox.showinfo("Import " + kind.title(), message)
+
+    def failed(error):
+        tkinter.messagebox.showinfo("Import " + kind.title(), os.path.basename(path) + " was not imported: " +
+                                    str(error))
+
+    # Not cancelled by changing pages, since the whole file is saved in one transaction
+    worker.submit(run, finished, failed)
+
+
+@Diagnostics.tracked
+def importEmployees():
+    """ Imports employees from a .csv or .xlsx file. See Import.py for the columns it can have """
+
+    importFile("employees", Import.importEmployees)
+
+
+@Diagnostics.tracked
+def importPayments():
+    """ Imports historical payments from a .csv or .xlsx file. See Import.py for the columns it can have """
+
+    importFile("payments", Import.importPayments)
+
+
+@Diagnostics.tracked
+def exportLedger():
+    """ Asks for a file and exports every visible payment of the year shown on the quarterly page to it on the worker
+    (see Export.py). The file type follows the name chosen, ex. ledger.csv.gz """
+
+    Year = getReportYear()
+    path = tkinter.filedialog.asksaveasfilename(title="Export " + str(Year) + " Payments", filetypes=ExportFileTypes,
+                                                defaultextension=".csv",
+                                                initialfile="OpenPay-ledger-" + str(Year) + ".csv")
+    if not path:
+        return
+
+    def run(token):
+        def progress(rows):
+            worker.call(showStatus, True, "Exporting payments: " + str(rows) + " rows written...")
+        return Export.exportLedger(path, datetime.date(Year, 1, 1), datetime.date(Year, 12, 31), progress=progress)
+
+    def finished(rows):
+        tkinter.messagebox.showinfo("Export Payments", str(rows) + " payments from " + str(Year) + " saved to " +
+                                    path + ".")
+
+    def failed(error):
+        tkinter.messagebox.showinfo("Export Payments", "The payments were not exported: " + str(error))
+
+    worker.submit(run, finished, failed)
 
 
 # ***** Toolbars *****
 
 # *** Home Toolbar ***
-homeToolbar = tk.Frame(homeFrame.scrollable_frame, bg="gray", pady=5)
 
-viewEmployeesButt = tk.Button(homeToolbar, text="View Employees", command=openEmployees)
-viewEmployeesButt.pack(side="left", padx=5, pady=5)
-viewPaymentsButt = tk.Button(homeToolbar, text="View Payments", command=openPayments)
-viewPaymentsButt.pack(side="left", padx=5, pady=5)
-viewPositionsButt = tk.Button(homeToolbar, text="View Positions", command=openPositions)
-viewPositionsButt.pack(side="left", padx=5, pady=5)
 
-homeToolbar.pack(side="top", fill="x", expand="true")
+def buildHomeToolbar():
+    """ Builds the toolbar of the home page """
+
+    homeToolbar = tk.Frame(homeFrame.scrollable_frame, bg="gray", pady=5)
+
+    viewEmployeesButt = tk.Button(homeToolbar, text="View Employees", command=openEmployees)
+    viewEmployeesButt.pack(side="left", padx=5, pady=5)
+    viewPaymentsButt = tk.Button(homeToolbar, text="View Payments", command=openPayments)
+    viewPaymentsButt.pack(side="left", padx=5, pady=5)
+    viewPositionsButt = tk.Button(homeToolbar, text="View Positions", command=openPositions)
+    viewPositionsButt.pack(side="left", padx=5, pady=5)
+    diagnosticsButt = tk.Button(homeToolbar, text="Diagnostics", command=openDiagnostics)
+    diagnosticsButt.pack(side="right", padx=5, pady=5)
+
+    homeToolbar.pack(side="top", fill="x", expand="true")
+
 
 # *** Employees Toolbar ***
 
-employeesToolbar = tk.Frame(employeesFrame.scrollable_frame, bg="gray", pady=5)
-
-newEmployeeButt = tk.Button(employeesToolbar, text="New Employee", command=openNewEmployee)
-newEmployeeButt.pack(side="left", padx=5, pady=5)
-editEmployeeButt = tk.Button(employeesToolbar, text="Edit Employee", command=openEditEmployee)
-editEmployeeButt.pack(side="left", padx=5, pady=5)
-payEmployeeButt = tk.Button(employeesToolbar, text="Pay Employee", command=openPayEmployee)
-payEmployeeButt.pack(side="left", padx=5, pady=5)
-viewEmployeePaymentsButt = tk.Button(employeesToolbar, text="View This Employee's Payments",
-                                     command=openEmployeePayments)
-viewEmployeePaymentsButt.pack(side="left", padx=5, pady=5)
-hideEmployeeButt = tk.Button(employeesToolbar, text="Hide Employee", command=hideEmployee)
-hideEmployeeButt.pack(side="left", padx=5, pady=5)
-viewHiddenEmployeeButt = tk.Button(employeesToolbar, text="View Hidden Employees", command=openHiddenEmployees)
-viewHiddenEmployeeButt.pack(side="left", padx=5, pady=5)
-deleteEmployeeButt = tk.Button(employeesToolbar, text="Delete Employee", command=deleteEmployee, fg="red")
-deleteEmployeeButt.pack(side="left", padx=5, pady=5)
-
-employeesToolbar.pack(side="top", fill="x")
+
+def buildEmployeesToolbar():
+    """ Builds the toolbar of the employees page """
+
+    employeesToolbar = tk.Frame(employeesFrame.scrollable_frame, bg="gray", pady=5)
+
+    newEmployeeButt = tk.Button(employeesToolbar, text="New Employee", command=openNewEmployee)
+    newEmployeeButt.pack(side="left", padx=5, pady=5)
+    editEmployeeButt = tk.Button(employeesToolbar, text="Edit Employee", command=openEditEmployee)
+    editEmployeeButt.pack(side="left", padx=5, pady=5)
+    payEmployeeButt = tk.Button(employeesToolbar, text="Pay Employee", command=openPayEmployee)
+    payEmployeeButt.pack(side="left", padx=5, pady=5)
+    viewEmployeePaymentsButt = tk.Button(employeesToolbar, text="View This Employee's Payments",
+                                         command=openEmployeePayments)
+    viewEmployeePaymentsButt.pack(side="left", padx=5, pady=5)
+    hideEmployeeButt = tk.Button(employeesToolbar, text="Hide Employee", command=hideEmployee)
+    hideEmployeeButt.pack(side="left", padx=5, pady=5)
+    viewHiddenEmployeeButt = tk.Button(employeesToolbar, text="View Hidden Employees", command=openHiddenEmployees)
+    viewHiddenEmployeeButt.pack(side="left", padx=5, pady=5)
+    deleteEmployeeButt = tk.Button(employeesToolbar, text="Delete Employee", command=deleteEmployee, fg="red")
+    deleteEmployeeButt.pack(side="left", padx=5, pady=5)
+    importEmployeesButt = tk.Button(employeesToolbar, text="Import Employees", command=importEmployees)
+    importEmployeesButt.pack(side="right", padx=5, pady=5)
+
+    employeesToolbar.pack(side="top", fill="x")
+
 
 # *** Hidden Employees Toolbar ***
 
-hiddenEmployeesToolbar = tk.Frame(hiddenEmployeesFrame.scrollable_frame, bg="gray", pady=5)
 
-viewAllEmployeesButt = tk.Button(hiddenEmployeesToolbar, text="View All Employees", command=openEmployees)
-viewAllEmployeesButt.pack(side="left", padx=5, pady=5)
-revealEmployeeButt = tk.Button(hiddenEmployeesToolbar, text="Reveal Employee", command=revealEmployee)
-revealEmployeeButt.pack(side="left", padx=5, pady=5)
-deleteEmployeeButt = tk.Button(hiddenEmployeesToolbar, text="Delete Employee", command=deleteEmployee, fg="red")
-deleteEmployeeButt.pack(side="left", padx=5, pady=5)
+def buildHiddenEmployeesToolbar():
+    """ Builds the toolbar of the hidden employees page """
+
+    hiddenEmployeesToolbar = tk.Frame(hiddenEmployeesFrame.scrollable_frame, bg="gray", pady=5)
+
+    viewAllEmployeesButt = tk.Button(hiddenEmployeesToolbar, text="View All Employees", command=openEmployees)
+    viewAllEmployeesButt.pack(side="left", padx=5, pady=5)
+    revealEmployeeButt = tk.Button(hiddenEmployeesToolbar, text="Reveal Employee", command=revealEmployee)
+    revealEmployeeButt.pack(side="left", padx=5, pady=5)
+    deleteEmployeeButt = tk.Button(hiddenEmployeesToolbar, text="Delete Employee", command=deleteEmployee, fg="red")
+    deleteEmployeeButt.pack(side="left", padx=5, pady=5)
+
+    hiddenEmployeesToolbar.pack(side="top", fill="x")
 
-hiddenEmployeesToolbar.pack(side="top", fill="x")
 
 # *** Payments Toolbar ***
 
-paymentsToolbar = tk.Frame(paymentsFrame.scrollable_frame, bg="gray", pady=5)
-
-newPaymentButt = tk.Button(paymentsToolbar, text="New Payment", command=openNewPayment)
-newPaymentButt.pack(side="left", padx=5, pady=5)
-editPaymentButt = tk.Button(paymentsToolbar, text="Edit Payment", command=openEditPayment)
-editPaymentButt.pack(side="left", padx=5, pady=5)
-generatePaystubButt = tk.Button(paymentsToolbar, text="Generate Paystub",
-                                command=generatePaystub)
-generatePaystubButt.pack(side="left", padx=5, pady=5)
-viewEmployeePaymentsButt = tk.Button(paymentsToolbar, text="View This Employee's Payments",
-                                     command=openSimilarPayments)
-viewEmployeePaymentsButt.pack(side="left", padx=5, pady=5)
-viewAllPaymentsButt = tk.Button(paymentsToolbar, text="View All Payments", command=openPayments)
-viewAllPaymentsButt.pack(side="left", padx=5, pady=5)
-hidePaymentButt = tk.Button(paymentsToolbar, text="Hide Payment", command=hidePayment)
-hidePaymentButt.pack(side="left", padx=5, pady=5)
-viewHiddenPaymentsButt = tk.Button(paymentsToolbar, text="View Hidden Payments", command=openHiddenPayments)
-viewHiddenPaymentsButt.pack(side="left", padx=5, pady=5)
-deletePaymentButt = tk.Button(paymentsToolbar, text="Delete Payment", command=deletePayment, fg="red")
-deletePaymentButt.pack(side="left", padx=5, pady=5)
-viewQuarterlyButt = tk.Button(paymentsToolbar, text="View Quarterly Info", command=openQuarterly)
-viewQuarterlyButt.pack(side="left", padx=5, pady=5)
-
-paymentsToolbar.pack(side="top", fill="x")
+
+def buildPaymentsToolbar():
+    """ Builds the toolbar of the payments page """
+
+    paymentsToolbar = tk.Frame(paymentsFrame.scrollable_frame, bg="gray", pady=5)
+
+    newPaymentButt = tk.Button(paymentsToolbar, text="New Payment", command=openNewPayment)
+    newPaymentButt.pack(side="left", padx=5, pady=5)
+    editPaymentButt = tk.Button(paymentsToolbar, text="Edit Payment", command=openEditPayment)
+    editPaymentButt.pack(side="left", padx=5, pady=5)
+    generatePaystubButt = tk.Button(paymentsToolbar, text="Generate Paystub",
+                                    command=generatePaystub)
+    generatePaystubButt.pack(side="left", padx=5, pady=5)
+    viewEmployeePaymentsButt = tk.Button(paymentsToolbar, text="View This Employee's Payments",
+                                         command=openSimilarPayments)
+    viewEmployeePaymentsButt.pack(side="left", padx=5, pady=5)
+    viewAllPaymentsButt = tk.Button(paymentsToolbar, text="View All Payments", command=openPayments)
+    viewAllPaymentsButt.pack(side="left", padx=5, pady=5)
+    hidePaymentButt = tk.Button(paymentsToolbar, text="Hide Payment", command=hidePayment)
+    hidePaymentButt.pack(side="left", padx=5, pady=5)
+    viewHiddenPaymentsButt = tk.Button(paymentsToolbar, text="View Hidden Payments", command=openHiddenPayments)
+    viewHiddenPaymentsButt.pack(side="left", padx=5, pady=5)
+    deletePaymentButt = tk.Button(paymentsToolbar, text="Delete Payment", command=deletePayment, fg="red")
+    deletePaymentButt.pack(side="left", padx=5, pady=5)
+    importPaymentsButt = tk.Button(paymentsToolbar, text="Import Payments", command=importPayments)
+    importPaymentsButt.pack(side="right", padx=5, pady=5)
+    viewQuarterlyButt = tk.Button(paymentsToolbar, text="View Quarterly Info", command=openQuarterly)
+    viewQuarterlyButt.pack(side="left", padx=5, pady=5)
+
+    runPayrollButt = tk.Button(paymentsToolbar, text="Run Payroll", command=openRunPayroll)
+    runPayrollButt.pack(side="left", padx=5, pady=5)
+
+    paymentsToolbar.pack(side="top", fill="x")
+
 
 # *** Quarterly Payments Toolbar ***
 
-quarterlyToolbar = tk.Frame(quarterlyFrame.scrollable_frame, bg="gray", pady=5)
 
-viewAllPaymentsButt = tk.Button(quarterlyToolbar, text="View Payments", command=openPayments)
-viewAllPaymentsButt.pack(side="left", padx=5, pady=5)
+def buildQuarterlyToolbar():
+    """ Builds the toolbar of the quarterly reports page """
+
+    quarterlyToolbar = tk.Frame(quarterlyFrame.scrollable_frame, bg="gray", pady=5)
+
+    viewAllPaymentsButt = tk.Button(quarterlyToolbar, text="View Payments", command=openPayments)
+    viewAllPaymentsButt.pack(side="left", padx=5, pady=5)
+    exportLedgerButt = tk.Button(quarterlyToolbar, text="Export Payments", command=exportLedger)
+    exportLedgerButt.pack(side="right", padx=5, pady=5)
+
+    quarterlyToolbar.pack(side="top", fill="x")
 
-quarterlyToolbar.pack(side="top", fill="x")
 
 # *** Hidden Payments Toolbar ***
 
-hiddenPaymentsToolbar = tk.Frame(hiddenPaymentsFrame.scrollable_frame, bg="gray", pady=5)
 
-viewAllPaymentsButt = tk.Button(hiddenPaymentsToolbar, text="View All Payments", command=openPayments)
-viewAllPaymentsButt.pack(side="left", padx=5, pady=5)
-revealPaymentButt = tk.Button(hiddenPaymentsToolbar, text="Reveal Payment", command=revealPayment)
-revealPaymentButt.pack(side="left", padx=5, pady=5)
-deletePaymentButt = tk.Button(hiddenPaymentsToolbar, text="Delete Payment", command=deletePayment, fg="red")
-deletePaymentButt.pack(side="left", padx=5, pady=5)
+def buildHiddenPaymentsToolbar():
+    """ Builds the toolbar of the hidden payments page """
+
+    hiddenPaymentsToolbar = tk.Frame(hiddenPaymentsFrame.scrollable_frame, bg="gray", pady=5)
+
+    viewAllPaymentsButt = tk.Button(hiddenPaymentsToolbar, text="View All Payments", command=openPayments)
+    viewAllPaymentsButt.pack(side="left", padx=5, pady=5)
+    revealPaymentButt = tk.Button(hiddenPaymentsToolbar, text="Reveal Payment", command=revealPayment)
+    revealPaymentButt.pack(side="left", padx=5, pady=5)
+    deletePaymentButt = tk.Button(hiddenPaymentsToolbar, text="Delete Payment", command=deletePayment, fg="red")
+    deletePaymentButt.pack(side="left", padx=5, pady=5)
+
+    hiddenPaymentsToolbar.pack(side="top", fill="x")
 
-hiddenPaymentsToolbar.pack(side="top", fill="x")
 
 # *** Positions Toolbar ***
-positionsToolbar = tk.Frame(positionsFrame.scrollable_frame, bg="gray", pady=5)
 
-newPositionButt = tk.Button(positionsToolbar, text="New Position", command=openNewPosition)
-newPositionButt.pack(side="left", padx=5, pady=5)
-editPositionButt = tk.Button(positionsToolbar, text="Edit Position", command=openEditPosition)
-editPositionButt.pack(side="left", padx=5, pady=5)
-hidePositionButt = tk.Button(positionsToolbar, text="Hide Position", command=hidePosition)
-hidePositionButt.pack(side="left", padx=5, pady=5)
-viewHiddenPositionsButt = tk.Button(positionsToolbar, text="View Hidden Positions", command=openHiddenPositions)
-viewHiddenPositionsButt.pack(side="left", padx=5, pady=5)
-deletePositionButt = tk.Button(positionsToolbar, text="Delete Position", command=deletePosition, fg="red")
-deletePositionButt.pack(side="left", padx=5, pady=5)
 
-positionsToolbar.pack(side="top", fill="x")
+def buildPositionsToolbar():
+    """ Builds the toolbar of the positions page """
+
+    positionsToolbar = tk.Frame(positionsFrame.scrollable_frame, bg="gray", pady=5)
+
+    newPositionButt = tk.Button(positionsToolbar, text="New Position", command=openNewPosition)
+    newPositionButt.pack(side="left", padx=5, pady=5)
+    editPositionButt = tk.Button(positionsToolbar, text="Edit Position", command=openEditPosition)
+    editPositionButt.pack(side="left", padx=5, pady=5)
+    hidePositionButt = tk.Button(positionsToolbar, text="Hide Position", command=hidePosition)
+    hidePositionButt.pack(side="left", padx=5, pady=5)
+    viewHiddenPositionsButt = tk.Button(positionsToolbar, text="View Hidden Positions", command=openHiddenPositions)
+    viewHiddenPositionsButt.pack(side="left", padx=5, pady=5)
+    deletePositionButt = tk.Button(positionsToolbar, text="Delete Position", command=deletePosition, fg="red")
+    deletePositionButt.pack(side="left", padx=5, pady=5)
+
+    positionsToolbar.pack(side="top", fill="x")
+
 
 # *** Hidden Positions Toolbar ***
-hiddenPositionsToolbar = tk.Frame(hiddenPositionsFrame.scrollable_frame, bg="gray", pady=5)
 
-viewAllPositionsButt = tk.Button(hiddenPositionsToolbar, text="View All Positions", command=openPositions)
-viewAllPositionsButt.pack(side="left", padx=5, pady=5)
-revealPositionButt = tk.Button(hiddenPositionsToolbar, text="Reveal Position", command=revealPosition)
-revealPositionButt.pack(side="left", padx=5, pady=5)
-deletePositionButt = tk.Button(hiddenPositionsToolbar, text="Delete Position", command=deletePosition, fg="red")
-deletePositionButt.pack(side="left", padx=5, pady=5)
 
-hiddenPositionsToolbar.pack(side="top", fill="x")
+def buildHiddenPositionsToolbar():
+    """ Builds the toolbar of the hidden positions page """
+
+    hiddenPositionsToolbar = tk.Frame(hiddenPositionsFrame.scrollable_frame, bg="gray", pady=5)
+
+    viewAllPositionsButt = tk.Button(hiddenPositionsToolbar, text="View All Positions", command=openPositions)
+    viewAllPositionsButt.pack(side="left", padx=5, pady=5)
+    revealPositionButt = tk.Button(hiddenPositionsToolbar, text="Reveal Position", command=revealPosition)
+    revealPositionButt.pack(side="left", padx=5, pady=5)
+    deletePositionButt = tk.Button(hiddenPositionsToolbar, text="Delete Position", command=deletePosition, fg="red")
+    deletePositionButt.pack(side="left", padx=5, pady=5)
+
+    hiddenPositionsToolbar.pack(side="top", fill="x")
+
 
 # ***** Tables *****
 
-employeesTable = tk.Frame(employeesFrame.scrollable_frame)
-hiddenEmployeesTable = tk.Frame(hiddenEmployeesFrame.scrollable_frame)
+# Headers of each kind of table, and the columns shown under them (see employeeRow, paymentRow and positionRow)
+EmployeeHeaders = ["Name", "Position", "Gross Pay", "Salary", "Hourly Rate", "Housing Allowance", "HSA", "Federal WH",
+                   "Self-Employment WH", "Pay Interval", "Primary Email Address", "Self-Employed"]
+EmployeeColumnNames = ["employeeName", "EmployeePosition", "EmployeeGrossPay", "EmployeeSalary", "EmployeeHourlyRate",
+                       "EmployeeHousingAllowance", "EmployeeHSA", "EmployeeFedWH", "EmployeeSEWH",
+                       "EmployeePayInterval", "EmployeePrimaryEmail", "EmployeeIsSE"]
+EmployeePreviewHeaders = ["Name", "Salary", "Hourly Rate", "Housing Allowance", "HSA", "Primary Email Address"]
+EmployeePreviewColumnNames = ["employeeName", "EmployeeSalary", "EmployeeHourlyRate", "EmployeeHousingAllowance",
+                              "EmployeeHSA", "EmployeePrimaryEmail"]
+PaymentHeaders = ["Date", "Name", "Hours", "Gross Pay", "Housing", "HSA", "Social-Security", "Medicare",
+                  "Self-Employment", "Federal", "Net Pay", "FICA"]
+PaymentColumnNames = ["PaymentDate", "EmployeeName", "PaymentHours", "PaymentGrossPay", "PaymentHousing", "PaymentHSA",
+                      "PaymentSSTax", "PaymentMedicareTax", "PaymentSETax", "PaymentFedWH", "PaymentNetPay", "FICA"]
+PositionHeaders = ["Name", "Salary", "Hourly Rate", "Housing Allowance", "HSA", "Self-Employment WH", "Federal WH",
+                   "Self-Employed"]
+PositionColumnNames = ["PositionName", "PositionSalary", "PositionHourlyRate", "PositionHousingAllowance",
+                       "PositionHSA", "PositionSEWH", "PositionFedWH", "PositionIsSE"]
+# An employee's payment history adds running year-to-date totals to the payment columns (see PaymentHistoryPages)
+PaymentHistoryHeaders = PaymentHeaders + ["YTD Gross Pay", "YTD Federal", "YTD Net Pay"]
+PaymentHistoryColumnNames = PaymentColumnNames + ["YTDPaymentGrossPay", "YTDPaymentFedWH", "YTDPaymentNetPay"]
+PositionPreviewHeaders = PositionHeaders[:-1]
+PositionPreviewColumnNames = PositionColumnNames[:-1]
+
+# Every table built so far, by the kind of record it shows. They are patched as records change (see onEmployeeEvent)
+EmployeeTables = []
+PaymentTables = []
+PositionTables = []
+
+# The tables of each page, created by the page's builder the first time it is opened (see Page)
+employeesTable = None
+hiddenEmployeesTable = None
+paymentsTable = None
+hiddenPaymentsTable = None
+monthlyTotalTable = None
+quarterlyTotalTable = None
+positionsTable = None
+hiddenPositionsTable = None
+
+
+def newTable(page, headers, variable, kindTables, height=20):
+    """ Creates a Table.VirtualTable of [headers] on [page], loaded by the worker. Selecting a row sets [variable], and
+    the table is patched along with the rest of [kindTables] """
+
+    table = Table.VirtualTable(page.scrollable_frame, headers, variable, height=height, worker=worker)
+    page.tables.append(table)
+    kindTables.append(table)
+    return table
+
+
+def buildEmployeesPage():
+    """ Builds the employees page the first time it is opened """
+
+    global employeesTable
+
+    buildEmployeesToolbar()
+    employeesTable = newTable(employeesFrame, EmployeeHeaders, selectedEmployee, EmployeeTables)
+    employeesTable.pack(fill="x", pady=(0, 20))
+
+
+def buildHiddenEmployeesPage():
+    """ Builds the hidden employees page the first time it is opened """
+
+    global hiddenEmployeesTable
+
+    buildHiddenEmployeesToolbar()
+    hiddenEmployeesTable = newTable(hiddenEmployeesFrame, EmployeeHeaders, selectedEmployee, EmployeeTables)
+    hiddenEmployeesTable.pack(fill="x", pady=(0, 20))
+
+
+def buildPaymentsPage():
+    """ Builds the payments page the first time it is opened """
+
+    global paymentsTable
 
-paymentsTable = tk.Frame(paymentsFrame.scrollable_frame)
-hiddenPaymentsTable = tk.Frame(hiddenPaymentsFrame.scrollable_frame)
-monthlyTotalTable = tk.Frame(quarterlyFrame.scrollable_frame)
-quarterlyTotalTable = tk.Frame(quarterlyFrame.scrollable_frame)
+    buildPaymentsToolbar()
+    paymentsTable = newTable(paymentsFrame, PaymentHeaders, selectedPayment, PaymentTables)
+    paymentsTable.pack(fill="x", pady=(0, 20))
+
+
+def buildHiddenPaymentsPage():
+    """ Builds the hidden payments page the first time it is opened """
+
+    global hiddenPaymentsTable
+
+    buildHiddenPaymentsToolbar()
+    hiddenPaymentsTable = newTable(hiddenPaymentsFrame, PaymentHeaders, selectedPayment, PaymentTables)
+    hiddenPaymentsTable.pack(fill="x", pady=(0, 20))
+
+
+def buildQuarterlyPage():
+    """ Builds the quarterly reports page the first time it is opened. Its tables are filled in by
+    buildQuarterlyTables() """
+
+    global monthlyTotalTable, quarterlyTotalTable
+
+    buildQuarterlyToolbar()
+    monthlyTotalTable = tk.Frame(quarterlyFrame.scrollable_frame)
+    quarterlyTotalTable = tk.Frame(quarterlyFrame.scrollable_frame)
+
+
+def buildPositionsPage():
+    """ Builds the positions page the first time it is opened """
+
+    global positionsTable
+
+    buildPositionsToolbar()
+    positionsTable = newTable(positionsFrame, PositionHeaders, selectedPosition, PositionTables)
+    positionsTable.pack(fill="x", pady=(0, 20))
+
+
+def buildHiddenPositionsPage():
+    """ Builds the hidden positions page the first time it is opened """
+
+    global hiddenPositionsTable
+
+    buildHiddenPositionsToolbar()
+    hiddenPositionsTable = newTable(hiddenPositionsFrame, PositionHeaders, selectedPosition, PositionTables)
+    hiddenPositionsTable.pack(fill="x", pady=(0, 20))
 
-positionsTable = tk.Frame(positionsFrame.scrollable_frame)
-hiddenPositionsTable = tk.Frame(hiddenPositionsFrame.scrollable_frame)
 
 #     **********
 
@@ -591,6 +1100,9 @@ mainMenu.add_cascade(label="Payments", menu=paymentsMenu)
 paymentsMenu.add_command(label="View Payments", command=openPayments)
 paymentsMenu.add_command(label="New Payment", command=openNewPayment)
 paymentsMenu.add_command(label="View Hidden Payments", command=openHiddenPayments)
+paymentsMenu.add_command(label="Run Payroll", command=openRunPayroll)
+paymentsMenu.add_command(label="Generate Paystubs", command=generatePaystubs)
+paymentsMenu.add_command(label="Check YTD Totals", command=checkYTDTotals)
 
 positionsMenu = tk.Menu(mainMenu)
 mainMenu.add_cascade(label="Positions", menu=positionsMenu)
@@ -604,362 +1116,384 @@ positionsMenu.add_command(label="Open Hidden Positions", command=openHiddenPosit
 # *** Home Page ***
 
 
-def homeBuildEmployeesPreview(rowCount):
-    """ Creates a quick view of the employees table for the homepage, using the [rowCount] most recent employees """
+def employeeRow(employee, columnNames, positions):
+    """ Returns the cell values of [employee] for each of [columnNames]. [positions] maps PositionIDs to Positions """
+
+    values = []
+    for columnName in columnNames:
+        # If you need the employeeName, Concat the first name to the last name
+        if columnName == "employeeName":
+            value = employee.getFN_LN()
+        elif columnName == "EmployeeGrossPay":
+            value = employee.EmployeeSalary + employee.EmployeeHousingAllowance
+        elif columnName == "EmployeePosition":
+            if employee.PositionID in positions:
+                value = positions[employee.PositionID].PositionName
+            else:
+                value = ""
+        elif columnName == "EmployeeIsSE":
+            if employee.EmployeeIsSE == 0:
+                value = "No"
+            else:
+                value = "Yes"
+        else:
+            value = getattr(employee, columnName)
+        if isinstance(value, decimal.Decimal):
+            value = Format.formatMoney(value)
+        values.append(value)
+    return employee.EmployeeID, values
+
+
+def paymentRow(payment, columnNames, employees):
+    """ Returns the cell values of [payment] for each of [columnNames]. [employees] maps EmployeeIDs to Employees """
+
+    values = []
+    for columnName in columnNames:
+        # If you need the employeeName, Concat the first name to the last name
+        if columnName == "EmployeeName":
+            if payment.EmployeeID in employees:
+                value = employees[payment.EmployeeID].getFN_LN()
+            else:
+                value = None
+        # FICA is SS + Medicare
+        elif columnName == "FICA":
+            value = (payment.PaymentSSTax + payment.PaymentMedicareTax) * 2
+        # Format Dates to be readable for Americans
+        elif columnName == "PaymentDate":
+            value = Format.formatDate(payment.PaymentDate)
+        else:
+            value = getattr(payment, columnName)
+        # Add dollar signs to dollar amounts only
+        if isinstance(value, decimal.Decimal) and not (columnName == "PaymentHours"):
+            value = Format.formatMoney(value)
+        values.append(value)
+    return payment.PaymentID, values
+
+
+def positionRow(position, columnNames):
+    """ Returns the cell values of [position] for each of [columnNames] """
+
+    values = []
+    for columnName in columnNames:
+        if columnName == 'PositionIsSE':
+            if position.PositionIsSE == 0:
+                value = 'No'
+            else:
+                value = 'Yes'
+        else:
+            value = getattr(position, columnName)
+        if isinstance(value, decimal.Decimal):
+            value = Format.formatMoney(value)
+        values.append(value)
+    return position.PositionID, values
 
-    global selectedEmployee
 
-    # sets the height and width of the table
-    height = rowCount + 1
-    width = 7
+def buildEmployeeRows(employees, columnNames):
+    """ Returns the table rows for [employees], loading every referenced position with one query """
 
-    # used to label the first row of the table
-    headers = ["Select", "Name", "Salary", "Hourly Rate", "Housing Allowance", "HSA", "Primary Email Address"]
+    positions = MySQL.getPositions([employee.PositionID for employee in employees
+                                    if employee.PositionID is not None])
+    return [employeeRow(employee, columnNames, positions) for employee in employees]
 
-    MySQL.establishConnection()
 
-    # Creates a label using each entry in the headers list
-    for index in range(len(headers)):
-        b = tk.Label(homeEmployeesPreview, text=headers[index], borderwidth=2, relief="solid", padx=5)
-        b.grid(row=0, column=index, sticky="nesw")
-
-    # Determines the columns from the table to pull for each grid
-    columnNames = ["employeeName", "EmployeeSalary", "EmployeeHourlyRate", "EmployeeHousingAllowance", "EmployeeHSA",
-                   "EmployeePrimaryEmail"]
-    mostRecentEmployeeID = MySQL.getMax("Employees", "EmployeeID")
-    for i in range(1, height):  # Rows
-        columnNamesIndex = 0
-        # ensures there is still an employee to list and that it is not hidden
-        if not (mostRecentEmployeeID == 0) and not \
-                (MySQL.getEmployeeValue(mostRecentEmployeeID, "EmployeeIsHidden") == 1):
-            homeEmployeeSelectButt = tk.Radiobutton(homeEmployeesPreview, value=mostRecentEmployeeID,
-                                                    variable=selectedEmployee, relief="solid", anchor="center")
-            homeEmployeeSelectButt.grid(row=i, column=0, sticky="ew")
-            for j in range(1, width):  # Columns
-                # If you need the employeeName, Concat the first name to the last name
-                if columnNames[columnNamesIndex] == "employeeName":
-                    value = MySQL.getEmployeeFN_LN(mostRecentEmployeeID)
-                elif columnNames[columnNamesIndex] == "EmployeeGrossPay":
-                    value = MySQL.getEmployeeValue(mostRecentEmployeeID, 'EmployeeSalary') + \
-                            MySQL.getEmployeeValue(mostRecentEmployeeID, 'EmployeeHousingAllowance')
-                else:
-                    value = MySQL.getEmployeeValue(mostRecentEmployeeID, columnNames[columnNamesIndex])
-                if isinstance(value, decimal.Decimal):
-                    value = "$" + str(value)
-                # ensures there is a value in the specified cell
-                if value is not None:
-                    b = tk.Label(homeEmployeesPreview, text=value, relief="solid", padx=5)
-                else:
-                    b = tk.Label(homeEmployeesPreview, text=' ', relief='solid', padx=5)
-                b.grid(row=i, column=j, sticky="nesw")
-                # Increments columnNamesIndex to get the next column name
-                columnNamesIndex += 1
-        # Updates the mostRecentEmployeeID to get the next most recent employee
-        mostRecentEmployeeID = MySQL.getNextHighest("Employees", "EmployeeID", mostRecentEmployeeID)
-    MySQL.closeConnection()
+def buildPaymentRows(payments, columnNames):
+    """ Returns the table rows for [payments], loading every referenced employee with one query """
 
-    homeEmployeesPreview.pack(pady=(0, 20))
+    employees = MySQL.getEmployees([payment.EmployeeID for payment in payments])
+    return [paymentRow(payment, columnNames, employees) for payment in payments]
 
 
-def homeBuildPaymentsPreview(rowCount):
-    """ Creates a quick view of the Payments table, using the [rowCount] most recent payments """
+def showsHidden(isHidden, hidden):
+    """ Returns True if a record whose IsHidden column is [isHidden] belongs in a table of [hidden] records (True for
+    hidden, False for shown, None for both) """
 
-    global selectedPayment
+    return hidden is None or bool(isHidden) == hidden
 
-    # sets the height and width of the table
-    height = rowCount + 1
-    width = 13
 
-    # used to label the first row of the table
-    headers = ["Select", "Date", "Name", "Hours", "Gross Pay", "Housing", "HSA", "Social-Security", "Medicare",
-               "Self-Employment", "Federal", "Net Pay", "FICA"]
+class RecordPages:
+    """ Page loader for a Table.VirtualTable of records (see Table.VirtualTable), showing [columnNames] of the records
+    that are [hidden] (True), shown (False) or both (None).
 
-    MySQL.establishConnection()
+    Rows are sorted newest first, so single rows can be patched into the table as records change """
 
-    # Creates a label using each entry in the headers list
-    for index in range(len(headers)):
-        b = tk.Label(homePaymentsPreview, text=headers[index], borderwidth=2, relief="solid", padx=5)
-        b.grid(row=0, column=index, sticky="nesw")
-
-    # Determines the columns from the table to pull for each grid
-    columnNames = ["PaymentDate", "EmployeeName", "PaymentHours", "PaymentGrossPay", "PaymentHousing", "PaymentHSA",
-                   "PaymentSSTax", "PaymentMedicareTax", "PaymentSETax", "PaymentFedWH", "PaymentNetPay", "FICA"]
-    PaymentIDs = MySQL.getPaymentIDsByDate()
-    rowIndex = 0
-    for paymentID in PaymentIDs:
-        mostRecentPaymentID = str(paymentID).split("(", 1)[1].split(",", 1)[0]
-        columnNamesIndex = 0
-        # ensures there is still a payment to list and that it is not hidden
-        if not (mostRecentPaymentID == 0) and not (
-                MySQL.getPaymentValue(mostRecentPaymentID, "PaymentIsHidden") == 1):
-            homePaymentSelectButt = tk.Radiobutton(homePaymentsPreview, value=mostRecentPaymentID,
-                                                   variable=selectedPayment, relief="solid", anchor="center")
-            homePaymentSelectButt.grid(row=rowIndex, column=0, sticky="ew")
-            for j in range(1, width):  # Columns
-                # If you need the employeeName, Concat the first name to the last name
-                if columnNames[columnNamesIndex] == "EmployeeName":
-                    value = MySQL.getEmployeeFN_LN(MySQL.getPaymentValue(mostRecentPaymentID, "EmployeeID"))
-                # FICA is SS + Medicare
-                elif columnNames[columnNamesIndex] == "FICA":
-                    value = (MySQL.getPaymentValue(mostRecentPaymentID, "PaymentSSTax") + \
-                             MySQL.getPaymentValue(mostRecentPaymentID, "PaymentMedicareTax")) * 2
-                # Format Dates to be readable for Americans
-                elif columnNames[columnNamesIndex] == "PaymentDate":
-                    value = MySQL.formatDate(MySQL.getPaymentValue(mostRecentPaymentID, "PaymentDate"))
-                else:
-                    value = MySQL.getPaymentValue(mostRecentPaymentID, columnNames[columnNamesIndex])
-                # Add dollar signs to dollar amounts only
-                if (isinstance(value, decimal.Decimal)) and not (columnNames[columnNamesIndex] == "PaymentHours"):
-                    value = "$" + str(value)
-                # ensures there is a value in the specified cell
-                if value is not None:
-                    b = tk.Label(homePaymentsPreview, text=value, relief="solid", padx=5)
-                else:
-                    b = tk.Label(homePaymentsPreview, text=' ', relief='solid', padx=5)
-                b.grid(row=rowIndex, column=j, sticky="nesw")
-                # Increments columnNamesIndex to get the next column name
-                columnNamesIndex += 1
-        # Updates the mostRecentPaymentID to get the next most recent employee
-        rowIndex += 1
-        if rowIndex >= 5:
-            break
-    MySQL.closeConnection()
+    def __init__(self, columnNames, hidden=False):
+        self.columnNames = columnNames
+        self.hidden = hidden
 
-    homePaymentsPreview.pack(pady=(0, 20))
+    def includes(self, record):
+        """ Returns True if [record] belongs in the table """
 
+        return showsHidden(getattr(record, type(record).__name__ + "IsHidden"), self.hidden)
 
-def homeBuildPositionsPreview(rowCount):
-    """ Creates a quick view of the Positions table, using the [rowCount] most recent positions """
+    def row(self, record):
+        """ Returns the table row of [record] """
 
-    global selectedPosition
+        return self.rows([record])[0]
 
-    # sets the height and width of the table
-    height = rowCount + 1
-    width = 8
+    def patch(self, table, record, recordID, row):
+        """ Shows [row], the new row of [record], in [table], or removes the row of [recordID] when [row] is None """
 
-    # used to label the first row of the table
-    headers = ["Select", "Name", "Salary", "Hourly Rate", "Housing Allowance", "HSA", "Self-Employment WH",
-               "Federal WH"]
+        if row is not None:
+            table.putRow(row)
+        else:
+            table.removeRow(recordID)
 
-    MySQL.establishConnection()
 
-    # Creates a label using each entry in the headers list
-    for index in range(len(headers)):
-        b = tk.Label(homePositionsPreview, text=headers[index], borderwidth=2, relief="solid", padx=5)
-        b.grid(row=0, column=index, sticky="nesw")
+class EmployeePages(RecordPages):
+    """ Page loader for tables of employees, newest first """
 
-    # Determines the columns from the table to pull for each grid
-    columnNames = ["PositionName", "PositionSalary", "PositionHourlyRate", "PositionHousingAllowance", "PositionHSA",
-                   "PositionSEWH", "PositionFedWH"]
-    mostRecentPositionID = MySQL.getMax("Positions", "PositionID")
+    def __call__(self, beforeID, rowCount):
+        with MySQL.connection():
+            employees = MySQL.getEmployeePage(rowCount, hidden=self.hidden, beforeID=beforeID)
+            rows = self.rows(employees)
+        if not employees:
+            return rows, None
+        return rows, employees[-1].EmployeeID
 
-    for i in range(1, height):  # Rows
-        # Tracks the index of columnNames to pull for each cell
-        columnNamesIndex = 0
+    def rows(self, employees):
+        return [row + (employee.EmployeeID,)
+                for row, employee in zip(buildEmployeeRows(employees, self.columnNames), employees)]
 
-        # ensures there is still an employee to list and that it is not hidden
-        if not (mostRecentPositionID == 0) and not (
-                MySQL.getPositionValue(mostRecentPositionID, "PositionIsHidden") == 1):
-            homePositionSelectButt = tk.Radiobutton(homePositionsPreview, value=mostRecentPositionID,
-                                                    variable=selectedPosition, relief="solid", anchor="center")
-            homePositionSelectButt.grid(row=i, column=0, sticky="ew")
 
-            for j in range(1, width):  # Columns
+class PaymentPages(RecordPages):
+    """ Page loader for tables of payments, newest first. Pass [employeeID] for one employee's payments only """
 
-                # Gets the value of each cell
-                value = MySQL.getPositionValue(mostRecentPositionID, columnNames[columnNamesIndex])
+    def __init__(self, columnNames, hidden=False, employeeID=None):
+        super().__init__(columnNames, hidden)
+        self.employeeID = None if employeeID is None else int(employeeID)
 
-                # If its a decimal value, it needs a dollar sign
-                if isinstance(value, decimal.Decimal):
-                    value = "$" + str(value)
+    def __call__(self, after, rowCount):
+        with MySQL.connection():
+            payments = MySQL.getPaymentPage(rowCount, hidden=self.hidden, EmployeeID=self.employeeID, after=after)
+            rows = self.rows(payments)
+        if not payments:
+            return rows, None
+        return rows, (payments[-1].PaymentDate, payments[-1].PaymentID)
 
-                # ensures there is a value in the specified cell, then places it in the table
-                if value is not None:
-                    b = tk.Label(homePositionsPreview, text=value, relief="solid", padx=5)
-                else:
-                    b = tk.Label(homePositionsPreview, text=' ', relief='solid', padx=5)
-                b.grid(row=i, column=j, sticky="nesw")
+    def includes(self, payment):
+        return super().includes(payment) and (self.employeeID is None or payment.EmployeeID == self.employeeID)
 
-                # Increments columnNamesIndex to get the next column name
-                columnNamesIndex += 1
+    def rows(self, payments):
+        return [row + ((payment.PaymentDate, payment.PaymentID),)
+                for row, payment in zip(buildPaymentRows(payments, self.columnNames), payments)]
 
-        # Updates the mostRecentPositionID to get the next most recent employee
-        mostRecentPositionID = MySQL.getNextHighest("Positions", "PositionID", mostRecentPositionID)
 
-    MySQL.closeConnection()
+class PaymentHistoryPages(PaymentPages):
+    """ Page loader for one employee's payment history, newest first, with the running year-to-date totals of
+    MySQL.getPaymentHistory() after the payment columns. Each page is loaded with one query """
+
+    def __call__(self, after, rowCount):
+        with MySQL.connection():
+            history = MySQL.getPaymentHistory(self.employeeID, rowCount, hidden=self.hidden, after=after)
+            rows = self.rows(history)
+        if not history:
+            return rows, None
+        payment = history[-1][0]
+        return rows, (payment.PaymentDate, payment.PaymentID)
+
+    def rows(self, history):
+        payments = [payment for payment, totals in history]
+        columnNames = [columnName for columnName in self.columnNames if not columnName.startswith("YTD")]
+        rows = []
+        for (paymentID, values), (payment, totals) in zip(buildPaymentRows(payments, columnNames), history):
+            for columnName in self.columnNames[len(columnNames):]:
+                values.append(Format.formatMoney(totals[columnName[len("YTD"):]]))
+            rows.append((paymentID, values, (payment.PaymentDate, payment.PaymentID)))
+        return rows
+
+    def row(self, record):
+        # The table is reloaded instead, see patch()
+        return None
+
+    def patch(self, table, record, recordID, row):
+        # A change to one of the employee's payments, even a hidden one, changes the running totals of every later
+        # row, so the table is reloaded rather than patched
+        if (record is not None and record.EmployeeID == self.employeeID) or table.tree.exists(str(recordID)):
+            table.reload()
+
+
+class PositionPages(RecordPages):
+    """ Page loader for tables of positions, newest first """
+
+    def __call__(self, beforeID, rowCount):
+        positions = MySQL.getPositionPage(rowCount, hidden=self.hidden, beforeID=beforeID)
+        rows = self.rows(positions)
+        if not positions:
+            return rows, None
+        return rows, positions[-1].PositionID
+
+    def rows(self, positions):
+        return [positionRow(position, self.columnNames) + (position.PositionID,) for position in positions]
+
+
+# Counts the patches started for each record, so only the latest one is applied if several finish out of order
+PatchCounts = {}
+
+
+def patchTables(tables, getRecord, recordID):
+    """ Updates the row of [recordID] in each of [tables] that has been built: the record is loaded with
+    getRecord(recordID) on the worker, then shown where it belongs and removed from the others. getRecord returns None
+    for deleted records """
+
+    built = [(table, table.loadPage) for table in tables if isinstance(table.loadPage, RecordPages)]
+    if not built:
+        return
+    key = (getRecord, recordID)
+    PatchCounts[key] = count = PatchCounts.get(key, 0) + 1
+
+    def loadRows(token):
+        # Runs on the worker: the record, and its new row in each table or None where it does not belong
+        with MySQL.connection():
+            record = getRecord(recordID)
+            return record, [(table, pages, pages.row(record) if record is not None and pages.includes(record) else None)
+                            for table, pages in built]
+
+    def patch(result):
+        if PatchCounts.get(key) != count:
+            return
+        del PatchCounts[key]
+        record, rows = result
+        for table, pages, row in rows:
+            if table.loadPage is not pages:
+                # The table was rebuilt while the row was loading, so its new pages have the record already
+                continue
+            pages.patch(table, record, recordID, row)
+
+    worker.submit(loadRows, patch)
+
+
+def reloadTables(tables):
+    """ Reloads every table of [tables] that has been built """
+
+    for table in tables:
+        if table.loadPage is not None:
+            table.reload()
+
+
+@Diagnostics.tracked
+def onEmployeeEvent(event, employeeID):
+    """ Patches the employee tables after an employee is added, changed, hidden, revealed or deleted """
+
+    if employeeID is None:
+        reloadTables(EmployeeTables)
+    else:
+        patchTables(EmployeeTables, MySQL.getEmployee, employeeID)
+    if event == "employee-changed":
+        # Payment rows show the employee's name
+        reloadTables(PaymentTables)
+
+
+@Diagnostics.tracked
+def onPaymentEvent(event, paymentID):
+    """ Patches the payment tables after a payment is added, changed, hidden, revealed or deleted """
+
+    if paymentID is None:
+        reloadTables(PaymentTables)
+    else:
+        patchTables(PaymentTables, MySQL.getPayment, paymentID)
+
+
+@Diagnostics.tracked
+def onPositionEvent(event, positionID):
+    """ Patches the position tables after a position is added, changed, hidden, revealed or deleted """
+
+    if positionID is None:
+        reloadTables(PositionTables)
+    else:
+        patchTables(PositionTables, MySQL.getPosition, positionID)
+    if event == "position-changed":
+        # Employee rows show the position's name
+        reloadTables(EmployeeTables)
+
+
+def homeBuildEmployeesPreview(rowCount):
+    """ Creates a quick view of the employees table for the homepage, using the [rowCount] most recent employees """
+
+    homeEmployeesPreview.show(EmployeePages(EmployeePreviewColumnNames, hidden=False), rowCount, paged=False)
 
-    homePositionsPreview.pack(pady=(0, 20))
 
+def homeBuildPaymentsPreview(rowCount):
+    """ Creates a quick view of the Payments table, using the [rowCount] most recent payments """
 
-homeEmployeesLabel = tk.Label(homeFrame.scrollable_frame, text="Recent Employees", pady=20, padx=20)
-homeEmployeesPreview = tk.Frame(homeFrame.scrollable_frame)
-homeViewEmployeesButt = tk.Button(homeFrame.scrollable_frame, text="View Employees", justify="center",
-                                  command=openEmployees)
+    homePaymentsPreview.show(PaymentPages(PaymentColumnNames, hidden=False), rowCount, paged=False)
+
+
+def homeBuildPositionsPreview(rowCount):
+    """ Creates a quick view of the Positions table, using the [rowCount] most recent positions """
 
-homePaymentsLabel = tk.Label(homeFrame.scrollable_frame, text="Recent Payments", pady=20, padx=20, underline=1)
-homePaymentsPreview = tk.Frame(homeFrame.scrollable_frame)
-homeViewPaymentsButt = tk.Button(homeFrame.scrollable_frame, text="View Payments", justify="center",
-                                 command=openPayments)
+    homePositionsPreview.show(PositionPages(PositionPreviewColumnNames, hidden=False), rowCount, paged=False)
 
-homePositionsLabel = tk.Label(homeFrame.scrollable_frame, text="Recent Positions", pady=20, padx=20, underline=1)
-homePositionsPreview = tk.Frame(homeFrame.scrollable_frame)
-homeViewPositionsButt = tk.Button(homeFrame.scrollable_frame, text="View Positions", justify="center",
-                                  command=openPositions)
 
 f1 = tkinter.font.Font()
 f1.configure(underline=True)
 f1.configure(size=20)
 f2 = tkinter.font.Font()
 f2.configure(size=15)
-homeEmployeesLabel.configure(font=f1)
-homePaymentsLabel.configure(font=f1)
-homePositionsLabel.configure(font=f1)
 
+# The home page previews, created by buildHomePage()
+homeEmployeesPreview = None
+homePaymentsPreview = None
+homePositionsPreview = None
 
-#    ******
 
-# *** Employees Pages ***
+def buildHomePage():
+    """ Builds the home page. Its previews are loaded by loadHomePage() once the database has been checked """
 
+    global homeEmployeesPreview, homePaymentsPreview, homePositionsPreview
 
-def buildEmployeesTable(rowCount):
-    """ Creates the employees table, using up to [rowCount] employees (usually 50) """
+    buildHomeToolbar()
 
-    global selectedEmployee
+    homeEmployeesLabel = tk.Label(homeFrame.scrollable_frame, text="Recent Employees", pady=20, padx=20, font=f1)
+    homeEmployeesPreview = newTable(homeFrame, EmployeePreviewHeaders, selectedEmployee, EmployeeTables, height=5)
+    homeViewEmployeesButt = tk.Button(homeFrame.scrollable_frame, text="View Employees", justify="center",
+                                      command=openEmployees)
 
-    # sets the height and width of the table
-    height = rowCount + 1
-    width = 13
+    homePaymentsLabel = tk.Label(homeFrame.scrollable_frame, text="Recent Payments", pady=20, padx=20, underline=1,
+                                 font=f1)
+    homePaymentsPreview = newTable(homeFrame, PaymentHeaders, selectedPayment, PaymentTables, height=5)
+    homeViewPaymentsButt = tk.Button(homeFrame.scrollable_frame, text="View Payments", justify="center",
+                                     command=openPayments)
 
-    # used to label the first row of the table
-    headers = ["Select", "Name", "Position", "Gross Pay", "Salary", "Hourly Rate", "Housing Allowance", "HSA",
-               "Federal WH", "Self-Employment WH", "Pay Interval", "Primary Email Address", "Self-Employed"]
+    homePositionsLabel = tk.Label(homeFrame.scrollable_frame, text="Recent Positions", pady=20, padx=20, underline=1,
+                                  font=f1)
+    homePositionsPreview = newTable(homeFrame, PositionPreviewHeaders, selectedPosition, PositionTables, height=5)
+    homeViewPositionsButt = tk.Button(homeFrame.scrollable_frame, text="View Positions", justify="center",
+                                      command=openPositions)
 
-    MySQL.establishConnection()
+    homeEmployeesLabel.pack(fill="x")
+    homeEmployeesPreview.pack(fill="x", pady=(0, 20))
+    homeViewEmployeesButt.pack()
+    homePaymentsLabel.pack(fill="x")
+    homePaymentsPreview.pack(fill="x", pady=(0, 20))
+    homeViewPaymentsButt.pack()
+    homePositionsLabel.pack(fill="x")
+    homePositionsPreview.pack(fill="x", pady=(0, 20))
+    homeViewPositionsButt.pack()
 
-    # Creates a label using each entry in the headers list
-    for index in range(len(headers)):
-        b = tk.Label(employeesTable, text=headers[index], borderwidth=2, relief="solid", padx=5)
-        b.grid(row=0, column=index, sticky="nesw")
-
-    # Determines the columns from the table to pull for each grid
-    columnNames = ["employeeName", "EmployeePosition", "EmployeeGrossPay", "EmployeeSalary", "EmployeeHourlyRate",
-                   "EmployeeHousingAllowance", "EmployeeHSA", "EmployeeFedWH", "EmployeeSEWH", "EmployeePayInterval",
-                   "EmployeePrimaryEmail", "EmployeeIsSE"]
-    mostRecentEmployeeID = MySQL.getMax("Employees", "EmployeeID")
-    for i in range(1, height):  # Rows
-        columnNamesIndex = 0
-        # ensures there is still an employee to list and that it is not hidden
-        if not (mostRecentEmployeeID == 0) and not \
-                (MySQL.getEmployeeValue(mostRecentEmployeeID, "EmployeeIsHidden") == 1):
-            employeeSelectButt = tk.Radiobutton(employeesTable, value=mostRecentEmployeeID,
-                                                variable=selectedEmployee, relief="solid", anchor="center")
-            employeeSelectButt.grid(row=i, column=0, sticky="ew")
-            for j in range(1, width):  # Columns
-                # If you need the employeeName, Concat the first name to the last name
-                if columnNames[columnNamesIndex] == "employeeName":
-                    value = MySQL.getEmployeeFN_LN(mostRecentEmployeeID)
-                elif columnNames[columnNamesIndex] == "EmployeeGrossPay":
-                    value = MySQL.getEmployeeValue(mostRecentEmployeeID, 'EmployeeSalary') + \
-                            MySQL.getEmployeeValue(mostRecentEmployeeID, 'EmployeeHousingAllowance')
-                elif columnNames[columnNamesIndex] == "EmployeePosition":
-                    if MySQL.getEmployeeValue(mostRecentEmployeeID, "PositionID") is not None:
-                        value = MySQL.getPositionValue(MySQL.getEmployeeValue(mostRecentEmployeeID, "PositionID"),
-                                                       "PositionName")
-                    else:
-                        value = ""
-                elif columnNames[columnNamesIndex] == "EmployeeIsSE":
-                    if MySQL.getEmployeeValue(mostRecentEmployeeID, columnNames[columnNamesIndex]) == 0:
-                        value = "No"
-                    else:
-                        value = "Yes"
-                else:
-                    value = MySQL.getEmployeeValue(mostRecentEmployeeID, columnNames[columnNamesIndex])
-                if isinstance(value, decimal.Decimal):
-                    value = "$" + str(value)
-                # ensures there is a value in the specified cell
-                if value is not None:
-                    b = tk.Label(employeesTable, text=value, relief="solid", padx=5)
-                else:
-                    b = tk.Label(employeesTable, text=' ', relief='solid', padx=5)
-                b.grid(row=i, column=j, sticky="nesw")
-                # Increments columnNamesIndex to get the next column name
-                columnNamesIndex += 1
-        # Updates the mostRecentEmployeeID to get the next most recent employee
-        mostRecentEmployeeID = MySQL.getNextHighest("Employees", "EmployeeID", mostRecentEmployeeID)
-    MySQL.closeConnection()
 
-    employeesTable.pack(pady=(0, 20))
+def loadHomePage():
+    """ Loads the home page previews """
 
+    homeBuildEmployeesPreview(5)
+    homeBuildPaymentsPreview(5)
+    homeBuildPositionsPreview(5)
 
-def buildHiddenEmployeesTable(rowCount):
-    """ Creates the Hidden Employees table, using up to [rowCount] employees (usually 50) """
 
-    global selectedEmployee
+#    ******
 
-    # sets the height and width of the table
-    height = rowCount + 1
-    width = 13
+# *** Employees Pages ***
 
-    # used to label the first row of the table
-    headers = ["Select", "Name", "Position", "Gross Pay", "Salary" "Hourly Rate", "Housing Allowance", "HSA",
-               "Federal WH",
-               "Self-Employment WH", "Pay Interval", "Primary Email Address", "Self-Employed"]
 
-    MySQL.establishConnection()
+def buildEmployeesTable(rowCount):
+    """ Creates the employees table, loading [rowCount] employees (usually 50) at a time as it is scrolled """
 
-    # Creates a label using each entry in the headers list
-    for index in range(len(headers)):
-        b = tk.Label(hiddenEmployeesTable, text=headers[index], borderwidth=2, relief="solid", padx=5)
-        b.grid(row=0, column=index, sticky="nesw")
-
-    # Determines the columns from the table to pull for each grid
-    columnNames = ["employeeName", "EmployeePosition", "EmployeeGrossPay", "EmployeeSalary", "EmployeeHourlyRate",
-                   "EmployeeHousingAllowance", "EmployeeHSA", "EmployeeFedWH", "EmployeeSEWH", "EmployeePayInterval",
-                   "EmployeePrimaryEmail", "EmployeeIsSE"]
-    mostRecentEmployeeID = MySQL.getMax("Employees", "EmployeeID")
-    for i in range(1, height):  # Rows
-        columnNamesIndex = 0
-        # ensures there is still an employee to list and that it is not hidden
-        if not (mostRecentEmployeeID == 0) and \
-                (MySQL.getEmployeeValue(mostRecentEmployeeID, "EmployeeIsHidden") == 1):
-            employeeSelectButt = tk.Radiobutton(hiddenEmployeesTable, value=mostRecentEmployeeID,
-                                                variable=selectedEmployee, relief="solid", anchor="center")
-            employeeSelectButt.grid(row=i, column=0, sticky="ew")
-            for j in range(1, width):  # Columns
-                # If you need the employeeName, Concat the first name to the last name
-                if columnNames[columnNamesIndex] == "employeeName":
-                    value = MySQL.getEmployeeFN_LN(mostRecentEmployeeID)
-                elif columnNames[columnNamesIndex] == "EmployeePosition":
-                    if MySQL.getEmployeeValue(mostRecentEmployeeID, "PositionID") is not None:
-                        value = MySQL.getPositionValue(MySQL.getEmployeeValue(mostRecentEmployeeID, "PositionID"),
-                                                       "PositionName")
-                    else:
-                        value = ""
-                elif columnNames[columnNamesIndex] == "EmployeeGrossPay":
-                    value = MySQL.getEmployeeValue(mostRecentEmployeeID, 'EmployeeSalary') + \
-                            MySQL.getEmployeeValue(mostRecentEmployeeID, 'EmployeeHousingAllowance')
-                elif columnNames[columnNamesIndex] == "EmployeeIsSE":
-                    if MySQL.getEmployeeValue(mostRecentEmployeeID, columnNames[columnNamesIndex]) == 0:
-                        value = "No"
-                    else:
-                        value = "Yes"
-                else:
-                    value = MySQL.getEmployeeValue(mostRecentEmployeeID, columnNames[columnNamesIndex])
-                if isinstance(value, decimal.Decimal):
-                    value = "$" + str(value)
-                # ensures there is a value in the specified cell
-                if value is not None:
-                    b = tk.Label(hiddenEmployeesTable, text=value, relief="solid", padx=5)
-                else:
-                    b = tk.Label(hiddenEmployeesTable, text=' ', relief='solid', padx=5)
-                b.grid(row=i, column=j, sticky="nesw")
-                # Increments columnNamesIndex to get the next column name
-                columnNamesIndex += 1
-        # Updates the mostRecentEmployeeID to get the next most recent employee
-        mostRecentEmployeeID = MySQL.getNextHighest("Employees", "EmployeeID", mostRecentEmployeeID)
-    MySQL.closeConnection()
+    employeesTable.show(EmployeePages(EmployeeColumnNames, hidden=False), rowCount)
 
-    hiddenEmployeesTable.pack(pady=(0, 20))
+
+def buildHiddenEmployeesTable(rowCount):
+    """ Creates the Hidden Employees table, loading [rowCount] employees (usually 50) at a time as it is scrolled """
+
+    hiddenEmployeesTable.show(EmployeePages(EmployeeColumnNames, hidden=True), rowCount)
 
 
 def buildAddEditEmployee(employeeID):
@@ -967,11 +1501,10 @@ def buildAddEditEmployee(employeeID):
 
     MySQL.establishConnection()
 
+    @Diagnostics.tracked
     def fillPositionInfo(self):
         # After a position is selected, autofills financial info from Postiions Table
 
-        MySQL.establishConnection()
-
         Position = UserEmployeeValues[21].get()
 
         if Position == '':
@@ -983,6 +1516,8 @@ def buildAddEditEmployee(employeeID):
                            'PositionFedWH', 'PositionSEWH', 'PositionIsSE', 'PositionPayInterval']
         PositionIndex = 0
 
+        position = MySQL.getPosition(PositionID)
+
         for EmployeeIndex in range(22, 30):
             if PositionID == 0:
                 if PositionColumns[PositionIndex] == 'PositionIsSE':
@@ -990,7 +1525,7 @@ def buildAddEditEmployee(employeeID):
                 else:
                     value = ''
             else:
-                value = MySQL.getPositionValue(PositionID, PositionColumns[PositionIndex])
+                value = getattr(position, PositionColumns[PositionIndex])
             if value is not None:
                 UserEmployeeValues[EmployeeIndex].set(value)
             PositionIndex += 1
@@ -1004,6 +1539,7 @@ def buildAddEditEmployee(employeeID):
     # PrintInfoButton = tk.Button(addEditEmployeeFrame.scrollable_frame, text="Print Values", command=printValues)
     # PrintInfoButton.grid(row=0, column=3)
 
+    @Diagnostics.tracked
     def submitEmployee():
         # Creates a new employee or edits the current employee
 
@@ -1086,19 +1622,12 @@ def buildAddEditEmployee(employeeID):
 
         # If employeeID != 0, edit the existing employee
         else:
-            for i in range(0, 7):
-                if EmployeeValues[i] is not None:
-                    EmployeeValues[i] = MySQL.addQuote(EmployeeValues[i])
-            for i in range(8, 21):
-                if EmployeeValues[i] is not None:
-                    EmployeeValues[i] = MySQL.addQuote(EmployeeValues[i])
-            if EmployeeValues[29] is not None:
-                EmployeeValues[29] = MySQL.addQuote(EmployeeValues[29])
+            # Only the changed columns are written, in one UPDATE
+            changes = {}
             for i in range(len(EmployeeColumns)):
-                if EmployeeValues[i] is not None:
-                    MySQL.editTable('Employees', employeeID, EmployeeColumns[i], str(EmployeeValues[i]))
+                changes[EmployeeColumns[i]] = None if EmployeeValues[i] == 'NULL' else EmployeeValues[i]
+            MySQL.updateEmployee(employeeID, changes)
 
-        refreshEmployeeTables()
         openEmployees()
 
     # Used to track the order and name of each column in the table
@@ -1156,41 +1685,38 @@ def buildAddEditEmployee(employeeID):
 
     else:
         # Autofill values with existing data after converting it to more readable format for the user
+        employee = MySQL.getEmployee(employeeID)
         for index in range(len(EmployeeColumns)):
             UserEmployeeValues.append(tk.StringVar())
+            employeeValue = getattr(employee, EmployeeColumns[index])
             if EmployeeColumns[index] == 'EmployeeGender':
-                if MySQL.getEmployeeValue(employeeID, EmployeeColumns[index]) == 'M':
+                if employeeValue == 'M':
                     value = 'Male'
-                elif MySQL.getEmployeeValue(employeeID, EmployeeColumns[index]) == 'F':
+                elif employeeValue == 'F':
                     value = 'Female'
-                elif MySQL.getEmployeeValue(employeeID, EmployeeColumns[index]) == 'O':
+                elif employeeValue == 'O':
                     value = 'Other'
                 else:
                     value = ''
             elif EmployeeColumns[index] == 'EmployeeMaritalStatus':
-                if MySQL.getEmployeeValue(employeeID, EmployeeColumns[index]) == 'M':
+                if employeeValue == 'M':
                     value = 'Married'
-                elif MySQL.getEmployeeValue(employeeID, EmployeeColumns[index]) == 'S':
+                elif employeeValue == 'S':
                     value = 'Single'
                 else:
                     value = ''
             elif EmployeeColumns[index] == 'EmployeeBirthdate':
-                if MySQL.getEmployeeValue(employeeID, EmployeeColumns[index]) is not None:
-                    value = str(MySQL.getEmployeeValue(employeeID, EmployeeColumns[index]))[5:7] + '-' + \
-                            str(MySQL.getEmployeeValue(employeeID, EmployeeColumns[index]))[8:10] + '-' + \
-                            str(MySQL.getEmployeeValue(employeeID, EmployeeColumns[index]))[:4]
+                if employeeValue is not None:
+                    value = str(employeeValue)[5:7] + '-' + str(employeeValue)[8:10] + '-' + str(employeeValue)[:4]
                 else:
                     value = 'MM-DD-YYYY'
             elif EmployeeColumns[index] == 'PositionID':
-                if MySQL.getEmployeeValue(employeeID, EmployeeColumns[index]) is not None:
-                    value = MySQL \
-                                .getPositionValue(MySQL.getEmployeeValue(employeeID, EmployeeColumns[index]),
-                                                  'PositionName') + ' (ID=' \
-                            + str(MySQL.getEmployeeValue(employeeID, EmployeeColumns[index])) + ')'
+                if employeeValue is not None:
+                    value = MySQL.getPosition(employeeValue).PositionName + ' (ID=' + str(employeeValue) + ')'
                 else:
                     value = ''
             else:
-                value = str(MySQL.getEmployeeValue(employeeID, EmployeeColumns[index]))
+                value = str(employeeValue)
             if value != 'None':
                 UserEmployeeValues[index].set(value)
             else:
@@ -1233,13 +1759,8 @@ def buildAddEditEmployee(employeeID):
             DropdownsIndex += 1
         elif EmployeeColumns[EmployeeColumnsIndex] == 'PositionID':
             Positions = []
-            mostRecentPositionID = MySQL.getMax('Positions', 'PositionID')
-            while mostRecentPositionID != 0:
-                positionName = MySQL.getPositionValue(mostRecentPositionID, 'PositionName')
-                mostRecentPositionIDStr = str(mostRecentPositionID)
-                Positions.append(positionName + ' (ID=' +
-                                 mostRecentPositionIDStr + ')')
-                mostRecentPositionID = MySQL.getNextHighest('Positions', 'PositionID', mostRecentPositionID)
+            for position in MySQL.getPositionPage(hidden=None):
+                Positions.append(position.PositionName + ' (ID=' + str(position.PositionID) + ')')
             Dropdowns.append(
                 tk.OptionMenu(addEditEmployeeFrame.scrollable_frame, UserEmployeeValues[EmployeeColumnsIndex],
                               UserEmployeeValues[EmployeeColumnsIndex].get(), *Positions, command=fillPositionInfo))
@@ -1302,202 +1823,24 @@ def buildAddEditEmployee(employeeID):
 
 
 def buildPaymentsTable(rowCount):
-    """ Creates the Payments table, using the [rowCount] most recent payments """
-
-    global selectedPayment
-
-    for widget in paymentsTable.winfo_children():
-        widget.destroy()
-
-    # sets the height and width of the table
-    height = rowCount + 1
-    width = 13
-
-    # used to label the first row of the table
-    headers = ["Select", "Date", "Name", "Hours", "Gross Pay", "Housing", "HSA", "Social-Security", "Medicare",
-               "Self-Employment", "Federal", "Net Pay", "FICA"]
-
-    MySQL.establishConnection()
+    """ Creates the Payments table, loading the most recent payments [rowCount] at a time as it is scrolled """
 
-    # Creates a label using each entry in the headers list
-    for index in range(len(headers)):
-        b = tk.Label(paymentsTable, text=headers[index], borderwidth=2, relief="solid", padx=5)
-        b.grid(row=0, column=index, sticky="nesw")
-
-    # Determines the columns from the table to pull for each grid
-    columnNames = ["PaymentDate", "EmployeeName", "PaymentHours", "PaymentGrossPay", "PaymentHousing", "PaymentHSA",
-                   "PaymentSSTax", "PaymentMedicareTax", "PaymentSETax", "PaymentFedWH", "PaymentNetPay", "FICA"]
-    PaymentIDs = MySQL.getPaymentIDsByDate()
-    rowIndex = 0
-    for paymentID in PaymentIDs:  # Rows
-        mostRecentPaymentID = str(paymentID).split("(", 1)[1].split(",", 1)[0]
-        columnNamesIndex = 0
-        # ensures there is still an employee to list and that it is not hidden
-        if not (mostRecentPaymentID == 0) and not (
-                MySQL.getPaymentValue(mostRecentPaymentID, "PaymentIsHidden") == 1):
-            PaymentSelectButt = tk.Radiobutton(paymentsTable, value=mostRecentPaymentID,
-                                               variable=selectedPayment, relief="solid", anchor="center")
-            PaymentSelectButt.grid(row=rowIndex, column=0, sticky="ew")
-            for j in range(1, width):  # Columns
-                # If you need the employeeName, Concat the first name to the last name
-                if columnNames[columnNamesIndex] == "EmployeeName":
-                    value = MySQL.getEmployeeFN_LN(MySQL.getPaymentValue(mostRecentPaymentID, "EmployeeID"))
-                # FICA is SS + Medicare
-                elif columnNames[columnNamesIndex] == "FICA":
-                    value = (MySQL.getPaymentValue(mostRecentPaymentID, "PaymentSSTax") + \
-                             MySQL.getPaymentValue(mostRecentPaymentID, "PaymentMedicareTax")) * 2
-                # Format Dates to be readable for Americans
-                elif columnNames[columnNamesIndex] == "PaymentDate":
-                    value = MySQL.formatDate(MySQL.getPaymentValue(mostRecentPaymentID, "PaymentDate"))
-                else:
-                    value = MySQL.getPaymentValue(mostRecentPaymentID, columnNames[columnNamesIndex])
-                # Add dollar signs to dollar amounts only
-                if (isinstance(value, decimal.Decimal)) and not (columnNames[columnNamesIndex] == "PaymentHours"):
-                    value = "$" + str(value)
-                # ensures there is a value in the specified cell
-                if value is not None:
-                    b = tk.Label(paymentsTable, text=value, relief="solid", padx=5)
-                else:
-                    b = tk.Label(paymentsTable, text=' ', relief='solid', padx=5)
-                b.grid(row=rowIndex, column=j, sticky="nesw")
-                # Increments columnNamesIndex to get the next column name
-                columnNamesIndex += 1
-        # Updates the mostRecentPaymentID to get the next most recent employee
-        # mostRecentPaymentID = MySQL.getNextHighest("Payments", "PaymentID", mostRecentPaymentID)
-        rowIndex += 1
-    MySQL.closeConnection()
-
-    paymentsTable.pack(pady=(0, 20))
+    paymentsTable.setHeaders(PaymentHeaders)
+    paymentsTable.show(PaymentPages(PaymentColumnNames, hidden=False), rowCount)
 
 
 def buildHiddenPaymentsTable(rowCount):
-    """ Creates the Hidden Payments table, using the [rowCount] most recent payments """
-
-    global selectedPayment
-
-    # sets the height and width of the table
-    height = rowCount + 1
-    width = 13
-
-    # used to label the first row of the table
-    headers = ["Select", "Date", "Name", "Hours", "Gross Pay", "Housing", "HSA", "Social-Security", "Medicare",
-               "Self-Employment", "Federal", "Net Pay", "FICA"]
-
-    MySQL.establishConnection()
-
-    # Creates a label using each entry in the headers list
-    for index in range(len(headers)):
-        b = tk.Label(hiddenPaymentsTable, text=headers[index], borderwidth=2, relief="solid", padx=5)
-        b.grid(row=0, column=index, sticky="nesw")
-
-    # Determines the columns from the table to pull for each grid
-    columnNames = ["PaymentDate", "EmployeeName", "PaymentHours", "PaymentGrossPay", "PaymentHousing", "PaymentHSA",
-                   "PaymentSSTax", "PaymentMedicareTax", "PaymentSETax", "PaymentFedWH", "PaymentNetPay", "FICA"]
-    PaymentIDs = MySQL.getPaymentIDsByDate()
-    rowIndex = 0
-    for paymentID in PaymentIDs:  # Rows
-        mostRecentPaymentID = str(paymentID).split("(", 1)[1].split(",", 1)[0]
-        columnNamesIndex = 0
-        # ensures there is still a payment to list and that it is not hidden
-        if not (mostRecentPaymentID == 0) and (MySQL.getPaymentValue(mostRecentPaymentID, "PaymentIsHidden") == 1):
-            PaymentSelectButt = tk.Radiobutton(hiddenPaymentsTable, value=mostRecentPaymentID,
-                                               variable=selectedPayment, relief="solid", anchor="center")
-            PaymentSelectButt.grid(row=rowIndex, column=0, sticky="ew")
-            for j in range(1, width):  # Columns
-                # If you need the employeeName, Concat the first name to the last name
-                if columnNames[columnNamesIndex] == "EmployeeName":
-                    value = MySQL.getEmployeeFN_LN(MySQL.getPaymentValue(mostRecentPaymentID, "EmployeeID"))
-                # FICA is SS + Medicare
-                elif columnNames[columnNamesIndex] == "FICA":
-                    value = (MySQL.getPaymentValue(mostRecentPaymentID, "PaymentSSTax") + \
-                             MySQL.getPaymentValue(mostRecentPaymentID, "PaymentMedicareTax")) * 2
-                # Format Dates to be readable for Americans
-                elif columnNames[columnNamesIndex] == "PaymentDate":
-                    value = MySQL.formatDate(MySQL.getPaymentValue(mostRecentPaymentID, "PaymentDate"))
-                else:
-                    value = MySQL.getPaymentValue(mostRecentPaymentID, columnNames[columnNamesIndex])
-                # Add dollar signs to dollar amounts only
-                if (isinstance(value, decimal.Decimal)) and not (columnNames[columnNamesIndex] == "PaymentHours"):
-                    value = "$" + str(value)
-                # ensures there is a value in the specified cell
-                if value is not None:
-                    b = tk.Label(hiddenPaymentsTable, text=value, relief="solid", padx=5)
-                else:
-                    b = tk.Label(hiddenPaymentsTable, text=' ', relief='solid', padx=5)
-                b.grid(row=rowIndex, column=j, sticky="nesw")
-                # Increments columnNamesIndex to get the next column name
-                columnNamesIndex += 1
-        # Updates the mostRecentPaymentID to get the next most recent employee
-        rowIndex += 1
-    MySQL.closeConnection()
-
-    hiddenPaymentsTable.pack(pady=(0, 20))
-
-
-def buildEmployeePaymentsTable(employeeID):
-    """ Creates the Payments table, using the [rowCount] most recent payments """
-
-    global selectedPayment
+    """ Creates the Hidden Payments table, loading the most recent payments [rowCount] at a time as it is scrolled """
 
-    for widget in paymentsTable.winfo_children():
-        widget.destroy()
+    hiddenPaymentsTable.show(PaymentPages(PaymentColumnNames, hidden=True), rowCount)
 
-    # sets the width of the table
-    width = 13
 
-    # used to label the first row of the table
-    headers = ["Select", "Date", "Name", "Hours", "Gross Pay", "Housing", "HSA", "Social-Security", "Medicare",
-               "Self-Employment", "Federal", "Net Pay", "FICA"]
+def buildEmployeePaymentsTable(employeeID, rowCount=Table.PageSize):
+    """ Creates the Payments table from the payment history of [employeeID], with running YTD totals, loading the most
+    recent [rowCount] at a time as it is scrolled """
 
-    MySQL.establishConnection()
-
-    # Creates a label using each entry in the headers list
-    for index in range(len(headers)):
-        b = tk.Label(paymentsTable, text=headers[index], borderwidth=2, relief="solid", padx=5)
-        b.grid(row=0, column=index, sticky="nesw")
-
-    # Determines the columns from the table to pull for each grid
-    columnNames = ["PaymentDate", "EmployeeName", "PaymentHours", "PaymentGrossPay", "PaymentHousing", "PaymentHSA",
-                   "PaymentSSTax", "PaymentMedicareTax", "PaymentSETax", "PaymentFedWH", "PaymentNetPay", "FICA"]
-    PaymentIDs = MySQL.getEmployeePaymentIDsByDate(employeeID)
-    rowIndex = 0
-    for paymentID in PaymentIDs:  # Rows
-        mostRecentPaymentID = str(paymentID).split("(", 1)[1].split(",", 1)[0]
-        columnNamesIndex = 0
-        # ensures there is still an employee to list and that it is not hidden
-        if not (mostRecentPaymentID == 0) \
-                and not (MySQL.getPaymentValue(mostRecentPaymentID, "PaymentIsHidden") == 1):
-            PaymentSelectButt = tk.Radiobutton(paymentsTable, value=mostRecentPaymentID,
-                                               variable=selectedPayment, relief="solid", anchor="center")
-            PaymentSelectButt.grid(row=rowIndex, column=0, sticky="ew")
-            for j in range(1, width):  # Columns
-                # If you need the employeeName, Concat the first name to the last name
-                if columnNames[columnNamesIndex] == "EmployeeName":
-                    value = MySQL.getEmployeeFN_LN(MySQL.getPaymentValue(mostRecentPaymentID, "EmployeeID"))
-                # FICA is SS + Medicare
-                elif columnNames[columnNamesIndex] == "FICA":
-                    value = (MySQL.getPaymentValue(mostRecentPaymentID, "PaymentSSTax") + \
-                             MySQL.getPaymentValue(mostRecentPaymentID, "PaymentMedicareTax")) * 2
-                # Format Dates to be readable for Americans
-                elif columnNames[columnNamesIndex] == "PaymentDate":
-                    value = MySQL.formatDate(MySQL.getPaymentValue(mostRecentPaymentID, "PaymentDate"))
-                else:
-                    value = MySQL.getPaymentValue(mostRecentPaymentID, columnNames[columnNamesIndex])
-                # Add dollar signs to dollar amounts only
-                if (isinstance(value, decimal.Decimal)) and not (columnNames[columnNamesIndex] == "PaymentHours"):
-                    value = "$" + str(value)
-                # ensures there is a value in the specified cell
-                if value is not None:
-                    b = tk.Label(paymentsTable, text=value, relief="solid", padx=5)
-                else:
-                    b = tk.Label(paymentsTable, text=' ', relief='solid', padx=5)
-                b.grid(row=rowIndex, column=j, sticky="nesw")
-                # Increments columnNamesIndex to get the next column name
-                columnNamesIndex += 1
-        rowIndex += 1
-    MySQL.closeConnection()
-
-    paymentsTable.pack(pady=(0, 20))
+    paymentsTable.setHeaders(PaymentHistoryHeaders)
+    paymentsTable.show(PaymentHistoryPages(PaymentHistoryColumnNames, hidden=False, employeeID=employeeID), rowCount)
 
 
 def buildAddEditPayment(paymentID, employeeID=0):
@@ -1516,16 +1859,17 @@ def buildAddEditPayment(paymentID, employeeID=0):
             print(UserPaymentColumns[valueIndex] + ": " + UserPaymentValues[
                 valueIndex].get() + " (Index=" + valueIndexstr + ")")
 
+    @Diagnostics.tracked
     def calculatePayroll():
         # After the user selects an employee, autofills all entries.
 
-        MySQL.establishConnection()
-
         if UserPaymentValues[0].get() != '':
             EmployeeID = UserPaymentValues[0].get().split('(ID=', 1)[1].split(')')[0]
         else:
             return
 
+        MySQL.establishConnection()
+
         UserPaymentValues[1].set('Payroll')
 
         # Disable unneeded Entry Points
@@ -1533,72 +1877,23 @@ def buildAddEditPayment(paymentID, employeeID=0):
         Entries[6].config(state='normal')
         Entries[7].config(state='disabled')
 
-        # Get Employee Values from Employees Table
-        EmployeeSalary = decimal.Decimal(MySQL.getEmployeeValue(EmployeeID, "EmployeeSalary"))
-        EmployeeHourlyRate = decimal.Decimal(MySQL.getEmployeeValue(EmployeeID, "EmployeeHourlyRate"))
-        EmployeePayInterval = MySQL.getEmployeeValue(EmployeeID, "EmployeePayInterval")
-        EmployeePayIntervalStr = str(EmployeePayInterval)  # Must be string for if statements later
-        EmployeeHousingAllowance = decimal.Decimal(MySQL.getEmployeeValue(EmployeeID, "EmployeeHousingAllowance"))
-        EmployeeHSA = decimal.Decimal(MySQL.getEmployeeValue(EmployeeID, "EmployeeHSA"))
-        EmployeeIsSE = MySQL.getEmployeeValue(EmployeeID, "EmployeeIsSE")
-        EmployeeFedWH = decimal.Decimal(MySQL.getEmployeeValue(EmployeeID, "EmployeeFedWH"))
-        EmployeeSEWH = decimal.Decimal(MySQL.getEmployeeValue(EmployeeID, "EmployeeSEWH"))
-
         if not UserPaymentValues[4].get() == '':
             PaymentHours = decimal.Decimal(UserPaymentValues[4].get())
         else:
             PaymentHours = 0
 
-        # collection of if statements sets PaymentGrossPay, PaymentHousing, PaymentHSA, and PaymentFedWH
-        PaymentGrossPay = 0
-        if not (EmployeeHourlyRate == 0) and not (PaymentHours == 0):
-            PaymentGrossPay += EmployeeHourlyRate * PaymentHours
-        if EmployeePayIntervalStr == "BiWeekly":
-            PaymentGrossPay += (EmployeeSalary / 26) + (EmployeeHousingAllowance / 26)
-            PaymentHousing = EmployeeHousingAllowance / 26
-            PaymentHSA = EmployeeHSA / 26
-            PaymentFedWH = EmployeeFedWH / 26
-            PaymentSEWH = EmployeeSEWH / 26
-        elif (EmployeePayIntervalStr == 'Monthly') or (EmployeePayIntervalStr == 'None'):
-            PaymentGrossPay += (EmployeeSalary / 12) + (EmployeeHousingAllowance / 12)
-            PaymentHousing = EmployeeHousingAllowance / 12
-            PaymentHSA = EmployeeHSA / 12
-            PaymentFedWH = EmployeeFedWH / 12
-            PaymentSEWH = EmployeeSEWH / 12
-        elif EmployeePayIntervalStr == "SemiMonthly":
-            PaymentGrossPay += (EmployeeSalary / 24) + (EmployeeHousingAllowance / 24)
-            PaymentHousing = EmployeeHousingAllowance / 24
-            PaymentHSA = EmployeeHSA / 24
-            PaymentFedWH = EmployeeFedWH / 24
-            PaymentSEWH = EmployeeSEWH / 24
-        elif EmployeePayIntervalStr == "Weekly":
-            PaymentGrossPay += (EmployeeSalary / 52) + (EmployeeHousingAllowance / 52)
-            PaymentHousing = EmployeeHousingAllowance / 52
-            PaymentHSA = EmployeeHSA / 52
-            PaymentFedWH = EmployeeFedWH / 52
-            PaymentSEWH = EmployeeSEWH / 52
-        PaymentSalary = PaymentGrossPay - PaymentHousing
-
-        # If statement determines PaymentSSTax, PaymentMedicareTax, and PaymentSETax
-        if EmployeeIsSE == 0:
-            PaymentSSTax = (PaymentGrossPay - PaymentHSA) * MySQL.SocialSecurityTaxRate
-            PaymentMedicareTax = (PaymentGrossPay - PaymentHSA) * MySQL.MedicareTaxRate
-            PaymentSEWH = 0
-        else:
-            PaymentSSTax = 0
-            PaymentMedicareTax = 0
-
-        PaymentNetPay = PaymentGrossPay - PaymentHSA - PaymentSSTax - PaymentMedicareTax - PaymentSEWH - PaymentFedWH
+        # The pay math lives in Payroll.py, shared with pay runs
+        paycheck = Payroll.calculatePaycheck(MySQL.getEmployee(EmployeeID), PaymentHours)
 
-        UserPaymentValues[5].set(round(PaymentSalary, 2))
-        UserPaymentValues[6].set(round(PaymentHousing, 2))
-        UserPaymentValues[7].set(round(PaymentGrossPay, 2))
-        UserPaymentValues[8].set(round(PaymentHSA, 2))
-        UserPaymentValues[9].set(round(PaymentSSTax, 2))
-        UserPaymentValues[10].set(round(PaymentMedicareTax, 2))
-        UserPaymentValues[11].set(round(PaymentSEWH, 2))
-        UserPaymentValues[12].set(round(PaymentFedWH, 2))
-        UserPaymentValues[13].set(round(PaymentNetPay, 2))
+        UserPaymentValues[5].set(paycheck.PaymentSalary)
+        UserPaymentValues[6].set(paycheck.PaymentHousing)
+        UserPaymentValues[7].set(paycheck.PaymentGrossPay)
+        UserPaymentValues[8].set(paycheck.PaymentHSA)
+        UserPaymentValues[9].set(paycheck.PaymentSSTax)
+        UserPaymentValues[10].set(paycheck.PaymentMedicareTax)
+        UserPaymentValues[11].set(paycheck.PaymentSEWH)
+        UserPaymentValues[12].set(paycheck.PaymentFedWH)
+        UserPaymentValues[13].set(paycheck.PaymentNetPay)
 
         MySQL.closeConnection()
 
@@ -1649,14 +1944,14 @@ def buildAddEditPayment(paymentID, employeeID=0):
     def refreshTaxes():
         # refreshes SSWH and MedWH
 
-        MySQL.establishConnection()
-
         if UserPaymentValues[0].get() != '':
             EmployeeID = UserPaymentValues[0].get().split('(ID=', 1)[1].split(')')[0]
         else:
             return
 
-        EmployeeIsSE = MySQL.getEmployeeValue(EmployeeID, "EmployeeIsSE")
+        MySQL.establishConnection()
+
+        EmployeeIsSE = MySQL.getEmployee(EmployeeID).EmployeeIsSE
 
         PaymentGrossPay = decimal.Decimal(UserPaymentValues[7].get())
         if UserPaymentValues[8].get() != '':
@@ -1689,6 +1984,7 @@ def buildAddEditPayment(paymentID, employeeID=0):
     """PrintInfoButton = tk.Button(addEditPaymentFrame.scrollable_frame, text="Print Values", command=printValues)
     PrintInfoButton.grid(padx=15, row=0, column=6)"""
 
+    @Diagnostics.tracked
     def submitPayment():
         # Creates a new payment or edits the current payment
         global paymentSubmitted
@@ -1700,28 +1996,13 @@ def buildAddEditPayment(paymentID, employeeID=0):
             return
         else:
             PaymentValues.append(UserPaymentValues[0].get().split('(ID=', 1)[1].split(')')[0])
-        # Date -  Case 1: MM-DD-YYYY or MM/DD/YYYY
-        if (UserPaymentValues[2].get()[2] == '-') and (UserPaymentValues[2].get()[5] == '-') \
-                or (UserPaymentValues[2].get()[2] == '/') and (UserPaymentValues[2].get()[5] == '/'):
-            PaymentValues.append(
-                UserPaymentValues[2].get()[6:10] + UserPaymentValues[2].get()[:2] + UserPaymentValues[2].get()[3:5])
-        # Case 2: M-DD-YYYY or M/DD/YYYY
-        elif (UserPaymentValues[2].get()[1] == '-') and (UserPaymentValues[2].get()[4] == '-') \
-                or (UserPaymentValues[2].get()[1] == '/') and (UserPaymentValues[2].get()[4] == '/'):
-            PaymentValues.append(
-                UserPaymentValues[2].get()[5:9] + '0' + UserPaymentValues[2].get()[0] + UserPaymentValues[2].get()[
-                                                                                        2:4])
-        # Case 3: MM-D-YYYY or MM/D/YYYY
-        elif (UserPaymentValues[2].get()[2] == '-') and (UserPaymentValues[2].get()[4] == '-') \
-                or (UserPaymentValues[2].get()[2] == '/') and (UserPaymentValues[2].get()[4] == '/'):
-            PaymentValues.append(
-                UserPaymentValues[2].get()[5:9] + UserPaymentValues[2].get()[:2] + '0' + UserPaymentValues[2].get()[3])
-        # Case 4: M-D-YYYY or M/D/YYYY
-        elif (UserPaymentValues[2].get()[1] == '-') and (UserPaymentValues[2].get()[3] == '-') \
-                or (UserPaymentValues[2].get()[1] == '/') and (UserPaymentValues[2].get()[3] == '/'):
-            PaymentValues.append(
-                UserPaymentValues[2].get()[4:8] + '0' + UserPaymentValues[2].get()[0] + '0' +
-                UserPaymentValues[2].get()[2])
+        # Date, as MM/DD/YYYY, M-D-YYYY, YYYY-MM-DD or Format.DateFormat
+        try:
+            PaymentValues.append(Format.parseDate(UserPaymentValues[2].get()).strftime("%Y%m%d"))
+        except ValueError:
+            tkinter.messagebox.showinfo("Submit Payment", "Date must be entered as MM/DD/YYYY.")
+            paymentSubmitted = False
+            return
         userTime = str(UserPaymentValues[3].get())
         if userTime[1] == ':':
             if timeOfDay.get() == 0:
@@ -1766,21 +2047,21 @@ def buildAddEditPayment(paymentID, employeeID=0):
             PaymentColumns = ["EmployeeID", "PaymentDate", "PaymentTime", "PaymentHours", "PaymentHousing",
                               "PaymentGrossPay", "PaymentHSA", "PaymentSSTax", "PaymentMedicareTax", "PaymentSETax",
                               "PaymentFedWH", "PaymentNetPay"]
-            # for some reason, when updating a table's time value it requires quotes, whereas when adding a new entry it
-            # does not require quotes.
-            PaymentValues[2] = MySQL.addQuote(PaymentValues[2])
+            # Only the changed columns are written, in one UPDATE
+            changes = {}
             for i in range(len(PaymentValues)):
-                if PaymentValues[i] is not None:
-                    MySQL.editTable('Payments', paymentID, PaymentColumns[i], str(PaymentValues[i]))
+                changes[PaymentColumns[i]] = None if PaymentValues[i] == 'NULL' else PaymentValues[i]
+            MySQL.updatePayment(paymentID, changes)
         paymentSubmitted = True
 
+    @Diagnostics.tracked
     def submitAndReload():
         global paymentSubmitted
         submitPayment()
         if paymentSubmitted == True:
-            refreshPaymentTables()
             openPayments()
 
+    @Diagnostics.tracked
     def addAnother():
         submitPayment()
         buildAddEditPayment(0)
@@ -1858,19 +2139,19 @@ def buildAddEditPayment(paymentID, employeeID=0):
                                     relief="solid") \
             .grid(pady=30, row=0, column=0, columnspan=2, sticky="nsew")
         # Autofill values with data from Payments table
+        payment = MySQL.getPayment(paymentID)
         for index in range(len(UserPaymentColumns)):
             UserPaymentValues.append(tk.StringVar())
             if UserPaymentColumns[index] == 'EmployeeID':
-                value = str(MySQL.getEmployeeFN_LN(MySQL.getPaymentValue(paymentID, 'EmployeeID'))) + ' (ID=' \
-                        + str(MySQL.getPaymentValue(paymentID, 'EmployeeID')) + ')'
+                value = str(MySQL.getEmployeeFN_LN(payment.EmployeeID)) + ' (ID=' + str(payment.EmployeeID) + ')'
             elif UserPaymentColumns[index] == 'PaymentType':
                 value = ''
             elif UserPaymentColumns[index] == 'PaymentDate':
-                value = str(MySQL.getPaymentValue(paymentID, UserPaymentColumns[index]))[5:7] + '-' + \
-                        str(MySQL.getPaymentValue(paymentID, UserPaymentColumns[index]))[8:10] + '-' + \
-                        str(MySQL.getPaymentValue(paymentID, UserPaymentColumns[index]))[:4]
+                value = str(payment.PaymentDate)[5:7] + '-' + \
+                        str(payment.PaymentDate)[8:10] + '-' + \
+                        str(payment.PaymentDate)[:4]
             elif UserPaymentColumns[index] == 'PaymentTime':
-                paymentTime = str(MySQL.getPaymentValue(paymentID, UserPaymentColumns[index]))
+                paymentTime = str(payment.PaymentTime)
                 if paymentTime[1] == ':':
                     paymentTime = '0' + paymentTime
                 if (int(paymentTime[:2]) < 12) and (int(paymentTime[:2]) >= 1):
@@ -1891,10 +2172,9 @@ def buildAddEditPayment(paymentID, employeeID=0):
                     hourStr = str(hour)
                 value = hourStr + paymentTime[2:5]
             elif UserPaymentColumns[index] == 'PaymentSalary':
-                value = decimal.Decimal(MySQL.getPaymentValue(paymentID, 'PaymentGrossPay')) - \
-                        decimal.Decimal(MySQL.getPaymentValue(paymentID, 'PaymentHousing'))
+                value = decimal.Decimal(payment.PaymentGrossPay) - decimal.Decimal(payment.PaymentHousing)
             else:
-                value = str(MySQL.getPaymentValue(paymentID, UserPaymentColumns[index]))
+                value = str(getattr(payment, UserPaymentColumns[index]))
             if value != 'None':
                 UserPaymentValues[index].set(value)
             else:
@@ -1903,6 +2183,7 @@ def buildAddEditPayment(paymentID, employeeID=0):
     rowIndex = 1
     columnIndex = 0
 
+    @Diagnostics.tracked
     def selectPaymentType(self):
         if UserPaymentValues[1].get() == 'Payroll':
             Entries[5].config(state='normal')
@@ -1950,13 +2231,8 @@ def buildAddEditPayment(paymentID, employeeID=0):
         # Decide where there are special cases for entry widgets (tk.OptionMenu instead of tk.Entry)
         if UserPaymentColumns[PaymentColumnsIndex] == 'EmployeeID':
             Employees = []
-            mostRecentEmployeeID = MySQL.getMax('Employees', 'EmployeeID')
-            while mostRecentEmployeeID != 0:
-                employeeName = MySQL.getEmployeeFN_LN(mostRecentEmployeeID)
-                mostRecentEmployeeIDStr = str(mostRecentEmployeeID)
-                Employees.append(employeeName + ' (ID=' +
-                                 mostRecentEmployeeIDStr + ')')
-                mostRecentEmployeeID = MySQL.getNextHighest('Employees', 'EmployeeID', mostRecentEmployeeID)
+            for employee in MySQL.getEmployeePage(hidden=None):
+                Employees.append(employee.getFN_LN() + ' (ID=' + str(employee.EmployeeID) + ')')
             Entries.append(
                 tk.OptionMenu(addEditPaymentFrame.scrollable_frame, UserPaymentValues[PaymentColumnsIndex],
                               UserPaymentValues[PaymentColumnsIndex].get(), *Employees))
@@ -2032,13 +2308,12 @@ def buildAddEditPayment(paymentID, employeeID=0):
     MySQL.closeConnection()
 
 
+@Diagnostics.tracked
 def buildQuarterlyTables():
     """ Builds MonthlyTotalTable and QuarterlyTotalTable and places them in QuarterlyFrame """
 
     global selectedPayment
 
-    MySQL.establishConnection()
-
     for widget in monthlyTotalTable.winfo_children():
         widget.destroy()
 
@@ -2062,22 +2337,36 @@ def buildQuarterlyTables():
 
     # Used to determine what Column to pull value from
     PaymentColumns = ['PaymentSSTax', 'PaymentMedicareTax', 'PaymentFedWH', 'PaymentSETax']
-    # Used to determine what month condition to pass to getMonthlyTotals
-    MonthConditions = ['01', '02', '03', '04', '05', '06', '07', '08', '09', '10', '11', '12']
+    Year = getReportYear()
+
+    # Every monthly and quarterly total comes from this one query, run on the worker
+    PageWork.append(worker.submit(lambda token: MySQL.getQuarterlyReport(Year),
+                                  lambda report: fillQuarterlyTables(report, Months, PaymentColumns)))
+
+
+def getReportYear():
+    """ Returns the year the quarterly page shows: the year of the selected payment, or this year if none is
+    selected """
+
     if selectedPayment.get() != 0:
-        Year = str(MySQL.getPaymentValue(selectedPayment.get(), 'PaymentDate'))[:4]
-    else:
-        Year = str(datetime.datetime.now().today())[:4]
+        return MySQL.getPayment(selectedPayment.get()).PaymentDate.year
+    return datetime.date.today().year
+
+
+def fillQuarterlyTables(report, Months, PaymentColumns):
+    """ Fills MonthlyTotalTable and QuarterlyTotalTable with the totals of [report] once buildQuarterlyTables() has
+    loaded it """
 
     # Calculates values and populates table
     for monthIndex in range(len(Months)):
+        monthTotals = report.month(monthIndex + 1)
         # Used to store all totals for each row
         Totals = []
         for columnIndex in range(len(PaymentColumns)):
             if (PaymentColumns[columnIndex] == 'PaymentSSTax') or (PaymentColumns[columnIndex] == 'PaymentMedicareTax'):
-                Total = MySQL.getMonthlyTotal(MonthConditions[monthIndex], Year, PaymentColumns[columnIndex]) * 2
+                Total = monthTotals[PaymentColumns[columnIndex]] * 2
             else:
-                Total = MySQL.getMonthlyTotal(MonthConditions[monthIndex], Year, PaymentColumns[columnIndex])
+                Total = monthTotals[PaymentColumns[columnIndex]]
             Totals.append(Total)
             cell = tk.Label(monthlyTotalTable, text=str(Totals[columnIndex]), borderwidth=2, relief="solid", padx=15)
             cell.grid(row=(monthIndex + 1), column=(columnIndex + 1), sticky="nesw")
@@ -2101,157 +2390,213 @@ def buildQuarterlyTables():
         label = tk.Label(quarterlyTotalTable, text=Quarters[i], borderwidth=2, relief="solid", padx=15)
         label.grid(row=(i + 1), column=0, sticky="nesw")
 
-    # Total SS Column
     for i in range(1, 5):
-        value = MySQL.getQuarterlyTotal(i, Year, 'PaymentSSTax') * 2
+        quarterTotals = report.quarter(i)
+
+        # Total SS Column
+        value = quarterTotals['PaymentSSTax'] * 2
         label = tk.Label(quarterlyTotalTable, text=value, borderwidth=2, relief="solid", padx=15)
         label.grid(row=i, column=1, sticky="nesw")
 
-    # Total Medicare Column
-    for i in range(1, 5):
-        value = MySQL.getQuarterlyTotal(i, Year, 'PaymentMedicareTax') * 2
+        # Total Medicare Column
+        value = quarterTotals['PaymentMedicareTax'] * 2
         label = tk.Label(quarterlyTotalTable, text=value, borderwidth=2, relief="solid", padx=15)
         label.grid(row=i, column=2, sticky="nesw")
 
-    # Total Federal Column
-    for i in range(1, 5):
-        federal = MySQL.getQuarterlyTotal(i, Year, 'PaymentFedWH')
-        se = MySQL.getQuarterlyTotal(i, Year, 'PaymentSETax')
-        value = federal + se
+        # Total Federal Column
+        value = quarterTotals['PaymentFedWH'] + quarterTotals['PaymentSETax']
         label = tk.Label(quarterlyTotalTable, text=value, borderwidth=2, relief="solid", padx=15)
         label.grid(row=i, column=3, sticky="nesw")
 
-    # Total Pay and FICA Pay Columns
-    for i in range(1, 5):
-        total = MySQL.getQuarterlyTotal(i, Year, 'PaymentGrossPay')
+        # Total Pay and FICA Pay Columns
+        total = quarterTotals['PaymentGrossPay']
         label = tk.Label(quarterlyTotalTable, text=total, borderwidth=2, relief="solid", padx=15)
         label.grid(row=i, column=5, sticky="nesw")
-        fica = total - MySQL.getSEGrossPay(i, Year)
+        fica = total - quarterTotals['SEGrossPay']
         label = tk.Label(quarterlyTotalTable, text=fica, borderwidth=2, relief="solid", padx=15)
         label.grid(row=i, column=4, sticky="nesw")
 
     quarterlyTotalTable.pack(pady=15)
 
-    MySQL.closeConnection()
-
-
-# *** Positions Pages ***
-
 
-def buildPositionsTable(rowCount):
-    """ Creates the Positions table, using the [rowCount] most recent positions """
+# *** Run Payroll Page ***
+
+
+def buildRunPayroll():
+    """ Builds the Run Payroll page, which pays a whole group of employees at once """
+
+    # Groups that can be paid: everyone, each pay interval, and each position
+    Groups = {'All Employees': (None, None)}
+    for interval in Payroll.PayPeriods:
+        Groups[interval + ' Employees'] = (None, interval)
+    for position in MySQL.getPositionPage():
+        Groups[position.PositionName + ' (ID=' + str(position.PositionID) + ')'] = (position.PositionID, None)
+
+    selectedGroup = tk.StringVar()
+    selectedGroup.set('All Employees')
+    paymentDate = tk.StringVar()
+    paymentDate.set(datetime.date.today().strftime('%m/%d/%Y'))
+    paymentTime = tk.StringVar()
+    paymentTime.set(datetime.datetime.now().strftime('%H:%M'))
+
+    previewTable = Table.VirtualTable(runPayrollFrame.scrollable_frame,
+                                      ["Name", "Hours", "Gross Pay", "Housing", "HSA", "Social-Security", "Medicare",
+                                       "Self-Employment", "Federal", "Net Pay"], selectedEmployee)
+    paychecks = []
+    # Hours entered for each hourly employee, by EmployeeID. Kept while the page is open, so previewing another group
+    # does not lose them
+    hoursWorked = {}
+    # The hours the shown preview was computed with, and the hourly employees of its group that were left out
+    previewed = {"hours": None, "unpaid": []}
+    hoursFrame = tk.Frame(runPayrollFrame.scrollable_frame)
+
+    def readDate():
+        # Returns the entered date as a datetime.date, or None if it is not a date
+        try:
+            return Format.parseDate(paymentDate.get())
+        except ValueError:
+            tkinter.messagebox.showinfo("Run Payroll", "Payment Date must be entered as MM/DD/YYYY.")
+            return None
+
+    def readTime():
+        # Returns the entered time as a datetime.time, or None if it is not a time
+        try:
+            return Format.parseTime(paymentTime.get())
+        except ValueError:
+            tkinter.messagebox.showinfo("Run Payroll", "Payment Time must be entered as HH:MM (24 hour).")
+            return None
+
+    def readHours():
+        # Returns {EmployeeID: hours} of the hourly employees with hours entered, or None if one is not a number
+        hours = {}
+        for employeeID, (name, hoursVar) in hoursWorked.items():
+            text = hoursVar.get().strip()
+            if not text:
+                continue
+            try:
+                hours[employeeID] = decimal.Decimal(text)
+            except decimal.InvalidOperation:
+                tkinter.messagebox.showinfo("Run Payroll", "Hours for " + name + " must be a number.")
+                return None
+            if not hours[employeeID].is_finite() or hours[employeeID] < 0:
+                tkinter.messagebox.showinfo("Run Payroll", "Hours for " + name + " must be a number.")
+                return None
+        return hours
+
+    @Diagnostics.tracked
+    def previewPayroll():
+        # Computes the pay run on the worker and lists every paycheck without saving anything
+        positionID, interval = Groups[selectedGroup.get()]
+        hours = readHours()
+        if hours is None:
+            return
 
-    global selectedPosition
+        def prepare(token):
+            with MySQL.connection():
+                group = Payroll.getPayrollEmployees(positionID, interval)
+                prepared = Payroll.preparePayroll(positionID, interval, hours)
+                employees = MySQL.getEmployees([employee.EmployeeID for employee in group])
+            hourly = [employee for employee in group if employee.EmployeeHourlyRate]
+            return prepared, employees, hourly, hours
+
+        PageWork.append(worker.submit(prepare, showPreview))
+
+    def showPreview(result):
+        prepared, employees, hourly, hours = result
+        paychecks[:] = prepared
+        previewed["hours"] = hours
+        paid = {paycheck.EmployeeID for paycheck in paychecks}
+        previewed["unpaid"] = [employee for employee in hourly if employee.EmployeeID not in paid]
+
+        # One hours entry per hourly employee of the group
+        for widget in hoursFrame.winfo_children():
+            widget.destroy()
+        if hourly:
+            tk.Label(hoursFrame, text="Hours worked this period (then Preview again)") \
+                .grid(pady=(0, 5), row=0, column=0, columnspan=2)
+        for row, employee in enumerate(hourly, 1):
+            if employee.EmployeeID not in hoursWorked:
+                hoursWorked[employee.EmployeeID] = (employee.getFN_LN(), tk.StringVar())
+            tk.Label(hoursFrame, text=employee.getFN_LN()).grid(padx=5, row=row, column=0, sticky="e")
+            tk.Entry(hoursFrame, textvariable=hoursWorked[employee.EmployeeID][1], width=8) \
+                .grid(padx=5, row=row, column=1, sticky="w")
+        hoursFrame.grid(pady=(10, 0), row=3, column=0, columnspan=4)
+
+        rows = []
+        for paycheck in paychecks:
+            values = [employees[paycheck.EmployeeID].getFN_LN(), str(paycheck.PaymentHours)]
+            for column in ["PaymentGrossPay", "PaymentHousing", "PaymentHSA", "PaymentSSTax", "PaymentMedicareTax",
+                           "PaymentSEWH", "PaymentFedWH", "PaymentNetPay"]:
+                values.append(Format.formatMoney(getattr(paycheck, column)))
+            rows.append((paycheck.EmployeeID, values))
+        previewTable.showRows(rows)
+        previewTable.grid(pady=20, row=4, column=0, columnspan=4)
+
+    @Diagnostics.tracked
+    def submitPayroll():
+        # Saves the previewed pay run as payments in one transaction
+        PaymentDate = readDate()
+        if PaymentDate is None:
+            return
+        PaymentTime = readTime()
+        if PaymentTime is None:
+            return
+        if not paychecks:
+            tkinter.messagebox.showinfo("Run Payroll", "Preview the pay run first. There is no one to pay yet.")
+            return
+        hours = readHours()
+        if hours is None:
+            return
+        if hours != previewed["hours"]:
+            tkinter.messagebox.showinfo("Run Payroll", "The hours have changed since the preview. Preview again "
+                                                       "before running payroll.")
+            return
+        total = sum(paycheck.PaymentNetPay for paycheck in paychecks)
+        message = "Pay " + str(len(paychecks)) + " employees a total net pay of " + Format.formatMoney(total) + \
+                  " on " + Format.formatDate(PaymentDate) + "?"
+        if previewed["unpaid"]:
+            message += "\n\n" + str(len(previewed["unpaid"])) + " hourly employees with no hours entered are not " \
+                       "paid: " + ", ".join(employee.getFN_LN() for employee in previewed["unpaid"])
+        if tkinter.messagebox.askquestion("Run Payroll Confirmation", message) != 'yes':
+            return
+        # Saved on the worker, and not cancelled by changing pages once the user has confirmed it
+        worker.submit(lambda token, paid=list(paychecks): Payroll.submitPayroll(paid, PaymentDate, PaymentTime))
+        openPayments()
+
+    tk.Label(runPayrollFrame.scrollable_frame, text="Run Payroll", font=f1, borderwidth=2, relief="solid") \
+        .grid(pady=30, row=0, column=0, columnspan=2, sticky="nsew")
+
+    tk.Label(runPayrollFrame.scrollable_frame, text="Employees").grid(pady=(15, 5), padx=5, row=1, column=0)
+    tk.Label(runPayrollFrame.scrollable_frame, text="Payment Date").grid(pady=(15, 5), padx=5, row=1, column=1)
+    tk.Label(runPayrollFrame.scrollable_frame, text="Payment Time (24 Hour)").grid(pady=(15, 5), padx=5, row=1,
+                                                                                   column=2)
+    tk.OptionMenu(runPayrollFrame.scrollable_frame, selectedGroup, selectedGroup.get(), *Groups) \
+        .grid(padx=5, row=2, column=0, sticky="ew")
+    tk.Entry(runPayrollFrame.scrollable_frame, textvariable=paymentDate, width=12) \
+        .grid(padx=5, row=2, column=1, sticky="ew")
+    tk.Entry(runPayrollFrame.scrollable_frame, textvariable=paymentTime, width=8) \
+        .grid(padx=5, row=2, column=2, sticky="ew")
+
+    buttons = tk.Frame(runPayrollFrame.scrollable_frame)
+    tk.Button(buttons, text="Preview", command=previewPayroll, font=f2).pack(side="left", padx=5)
+    tk.Button(buttons, text="Run Payroll", command=submitPayroll, font=f2).pack(side="left", padx=5)
+    tk.Button(buttons, text="Cancel", command=openPayments, font=f2).pack(side="left", padx=5)
+    buttons.grid(pady=20, padx=5, row=2, column=3)
 
-    # sets the height and width of the table
-    height = rowCount + 1
-    width = 9
 
-    # used to label the first row of the table
-    headers = ["Select", "Name", "Salary", "Hourly Rate", "Housing Allowance", "HSA", "Self-Employment WH",
-               "Federal WH",
-               "Self-Employed"]
+# *** Positions Pages ***
 
-    MySQL.establishConnection()
 
-    # Creates a label using each entry in the headers list
-    for index in range(len(headers)):
-        b = tk.Label(positionsTable, text=headers[index], borderwidth=2, relief="solid", padx=5)
-        b.grid(row=0, column=index, sticky="nesw")
-
-    # Determines the columns from the table to pull for each grid
-    columnNames = ["PositionName", "PositionSalary", "PositionHourlyRate", "PositionHousingAllowance", "PositionHSA",
-                   "PositionSEWH", "PositionFedWH", "PositionIsSE"]
-    mostRecentPositionID = MySQL.getMax("Positions", "PositionID")
-    for i in range(1, height):  # Rows
-        columnNamesIndex = 0
-        # ensures there is still a position to list and that it is not hidden
-        if not (mostRecentPositionID == 0) and not (
-                MySQL.getPositionValue(mostRecentPositionID, "PositionIsHidden") == 1):
-            PositionSelectButt = tk.Radiobutton(positionsTable, value=mostRecentPositionID,
-                                                variable=selectedPosition, relief="solid", anchor="center")
-            PositionSelectButt.grid(row=i, column=0, sticky="ew")
-            for j in range(1, width):  # Columns
-                if columnNames[columnNamesIndex] == 'PositionIsSE':
-                    if MySQL.getPositionValue(mostRecentPositionID, columnNames[columnNamesIndex]) == 0:
-                        value = 'No'
-                    else:
-                        value = 'Yes'
-                else:
-                    value = MySQL.getPositionValue(mostRecentPositionID, columnNames[columnNamesIndex])
-                if isinstance(value, decimal.Decimal):
-                    value = "$" + str(value)
-                # ensures there is a value in the specified cell
-                if value is not None:
-                    b = tk.Label(positionsTable, text=value, relief="solid", padx=5)
-                else:
-                    b = tk.Label(positionsTable, text=' ', relief='solid', padx=5)
-                b.grid(row=i, column=j, sticky="nesw")
-                # Increments columnNamesIndex to get the next column name
-                columnNamesIndex += 1
-        # Updates the mostRecentPositionID to get the next most recent employee
-        mostRecentPositionID = MySQL.getNextHighest("Positions", "PositionID", mostRecentPositionID)
-    MySQL.closeConnection()
+def buildPositionsTable(rowCount):
+    """ Creates the Positions table, loading the most recent positions [rowCount] at a time as it is scrolled """
 
-    positionsTable.pack(pady=(0, 20))
+    positionsTable.show(PositionPages(PositionColumnNames, hidden=False), rowCount)
 
 
 def buildHiddenPositionsTable(rowCount):
-    """ Creates the Hidden Positions table, using the [rowCount] most recent positions """
-
-    global selectedPosition
-
-    # sets the height and width of the table
-    height = rowCount + 1
-    width = 9
+    """ Creates the Hidden Positions table, loading the most recent positions [rowCount] at a time as it is scrolled """
 
-    # used to label the first row of the table
-    headers = ["Select", "Name", "Salary", "Hourly Rate", "Housing Allowance", "HSA", "Self-Employment WH",
-               "Federal WH",
-               "Self-Employed"]
-
-    MySQL.establishConnection()
-
-    # Creates a label using each entry in the headers list
-    for index in range(len(headers)):
-        b = tk.Label(hiddenPositionsTable, text=headers[index], borderwidth=2, relief="solid", padx=5)
-        b.grid(row=0, column=index, sticky="nesw")
-
-    # Determines the columns from the table to pull for each grid
-    columnNames = ["PositionName", "PositionSalary", "PositionHourlyRate", "PositionHousingAllowance", "PositionHSA",
-                   "PositionSEWH", "PositionFedWH", "PositionIsSE"]
-    mostRecentPositionID = MySQL.getMax("Positions", "PositionID")
-    for i in range(1, height):  # Rows
-        columnNamesIndex = 0
-        # ensures there is still a position to list and that it is hidden
-        if not (mostRecentPositionID == 0) and (
-                MySQL.getPositionValue(mostRecentPositionID, "PositionIsHidden") == 1):
-            PositionSelectButt = tk.Radiobutton(hiddenPositionsTable, value=mostRecentPositionID,
-                                                variable=selectedPosition, relief="solid", anchor="center")
-            PositionSelectButt.grid(row=i, column=0, sticky="ew")
-            for j in range(1, width):  # Columns
-                if columnNames[columnNamesIndex] == 'PositionIsSE':
-                    if MySQL.getPositionValue(mostRecentPositionID, columnNames[columnNamesIndex]) == 0:
-                        value = 'No'
-                    else:
-                        value = 'Yes'
-                else:
-                    value = MySQL.getPositionValue(mostRecentPositionID, columnNames[columnNamesIndex])
-                if isinstance(value, decimal.Decimal):
-                    value = "$" + str(value)
-                # ensures there is a value in the specified cell
-                if value is not None:
-                    b = tk.Label(hiddenPositionsTable, text=value, relief="solid", padx=5)
-                else:
-                    b = tk.Label(hiddenPositionsTable, text=' ', relief='solid', padx=5)
-                b.grid(row=i, column=j, sticky="nesw")
-                # Increments columnNamesIndex to get the next column name
-                columnNamesIndex += 1
-        # Updates the mostRecentPositionID to get the next most recent employee
-        mostRecentPositionID = MySQL.getNextHighest("Positions", "PositionID", mostRecentPositionID)
-    MySQL.closeConnection()
-
-    hiddenPositionsTable.pack(pady=(0, 20))
+    hiddenPositionsTable.show(PositionPages(PositionColumnNames, hidden=True), rowCount)
 
 
 def buildAddEditPosition(positionID):
@@ -2265,6 +2610,7 @@ def buildAddEditPosition(positionID):
             print(PositionColumns[valueIndex] + ": " + UserPositionValues[
                 valueIndex].get() + " (Index=" + valueIndexstr + ")")
 
+    @Diagnostics.tracked
     def submitPosition():
         # Creates a new position or edits the current position
         MySQL.establishConnection()
@@ -2296,10 +2642,11 @@ def buildAddEditPosition(positionID):
 
         # If positionID != 0, edit the existing position
         else:
-            PositionValues[0] = MySQL.addQuote(PositionValues[0])
-            PositionValues[8] = MySQL.addQuote(PositionValues[8])
+            # Only the changed columns are written, in one UPDATE
+            changes = {}
             for i in range(len(PositionColumns)):
-                MySQL.editTable('Positions', positionID, PositionColumns[i], str(PositionValues[i]))
+                changes[PositionColumns[i]] = None if PositionValues[i] == 'NULL' else PositionValues[i]
+            MySQL.updatePosition(positionID, changes)
 
         MySQL.closeConnection()
         openPositions()
@@ -2343,9 +2690,10 @@ def buildAddEditPosition(positionID):
                                      borderwidth=2, relief="solid") \
             .grid(pady=30, row=0, column=0, columnspan=2, sticky="nsew")
         # Autofill values with existing data
+        position = MySQL.getPosition(positionID)
         for i in range(len(PositionColumns)):
             UserPositionValues.append(tk.StringVar())
-            value = MySQL.getPositionValue(positionID, PositionColumns[i])
+            value = getattr(position, PositionColumns[i])
             if value is not None:
                 UserPositionValues[i].set(value)
             else:
@@ -2407,34 +2755,82 @@ def buildAddEditPosition(positionID):
     CancelButton = tk.Button(addEditPositionFrame.scrollable_frame, text="Cancel", command=openPositions, font=f2)
     CancelButton.grid(pady=50, padx=5, row=rowIndex, column=columnIndex)
 
+    MySQL.closeConnection()
+
 
 # ***** On Start *****
 
-# Build home page
-homeEmployeesLabel.pack(fill="x")
-homeBuildEmployeesPreview(5)
-homeViewEmployeesButt.pack()
-homePaymentsLabel.pack(fill="x")
-homeBuildPaymentsPreview(5)
-homeViewPaymentsButt.pack()
-homePositionsLabel.pack(fill="x")
-homeBuildPositionsPreview(5)
-homeViewPositionsButt.pack()
-
-# Place Frames in root
-homeFrame.place(in_=root, x=0, y=0, relwidth=1, relheight=1)
-employeesFrame.place(in_=root, x=0, y=0, relwidth=1, relheight=1)
-hiddenEmployeesFrame.place(in_=root, x=0, relwidth=1, relheight=1)
-addEditEmployeeFrame.place(in_=root, x=0, relwidth=1, relheight=1)
-paymentsFrame.place(in_=root, x=0, y=0, relwidth=1, relheight=1)
-hiddenPaymentsFrame.place(in_=root, x=0, relwidth=1, relheight=1)
-quarterlyFrame.place(in_=root, x=0, relwidth=1, relheight=1)
-addEditPaymentFrame.place(in_=root, x=0, relwidth=1, relheight=1)
-positionsFrame.place(in_=root, x=0, y=0, relwidth=1, relheight=1)
-hiddenPositionsFrame.place(in_=root, x=0, y=0, relwidth=1, relheight=1)
-addEditPositionFrame.place(in_=root, x=0, y=0, relwidth=1, relheight=1)
-
-homeFrame.lift()
-root.mainloop()
+# Pages build their widgets the first time they are opened
+homeFrame.build = buildHomePage
+employeesFrame.build = buildEmployeesPage
+hiddenEmployeesFrame.build = buildHiddenEmployeesPage
+paymentsFrame.build = buildPaymentsPage
+hiddenPaymentsFrame.build = buildHiddenPaymentsPage
+quarterlyFrame.build = buildQuarterlyPage
+positionsFrame.build = buildPositionsPage
+hiddenPositionsFrame.build = buildHiddenPositionsPage
+
+# Tables are patched as records change, instead of being rebuilt. Events are sent by the thread that committed the
+# change, usually the worker, so the handlers are moved onto the Tk thread
+Events.subscribeKind("employee", worker.onMainThread(onEmployeeEvent))
+Events.subscribeKind("payment", worker.onMainThread(onPaymentEvent))
+Events.subscribeKind("position", worker.onMainThread(onPositionEvent))
+
+
+def markStartup(step):
+    """ Records that [step] of startup is done, for printStartupTimes() """
+
+    StartupTimes.append((step, time.perf_counter() - LaunchTime))
+
+
+def printStartupTimes():
+    """ Prints how long each step of startup took after launch """
+
+    for step, seconds in StartupTimes:
+        print("OpenPay startup: " + step + " after " + str(round(seconds * 1000)) + " ms")
+    interactive = dict(StartupTimes).get("window interactive")
+    if interactive is not None and interactive > StartupTarget:
+        print("OpenPay startup: the window took longer than " + str(round(StartupTarget * 1000)) +
+              " ms to become interactive")
+
+
+def onSchemaChecked(applied):
+    """ Loads the home page once the database has been checked and migrated (see main) """
+
+    markStartup("database migrated" if applied else "database checked")
+    loadHomePage()
+    worker.whenIdle(lambda: (markStartup("home page loaded"), printStartupTimes()))
+
+
+def onStartupFailed(error):
+    """ Reports that the database could not be reached or set up, and closes OpenPay """
+
+    tkinter.messagebox.showerror("OpenPay", "Could not open the OpenPay database:\n\n" + str(error))
+    root.destroy()
+
+
+def main(launchTime=None):
+    """ Runs OpenPay until its window is closed. Pass the perf_counter() time OpenPay was launched at as [launchTime]
+    to include the time spent importing it in the startup timing report.
+
+    The window is shown before anything is read from MySQL: the database is checked and the home page previews are
+    loaded by the worker afterwards, and the other pages are only built when they are first opened """
+
+    global LaunchTime
+
+    if launchTime is not None:
+        LaunchTime = launchTime
+    markStartup("modules loaded")
+    showPage(homeFrame)
+    markStartup("home page built")
+    root.after_idle(markStartup, "window interactive")
+    with Diagnostics.action("startup"):
+        worker.submit(lambda token: Migrations.migrate(), onSchemaChecked, onStartupFailed)
+    root.mainloop()
+    worker.shutdown()
+
+
+if __name__ == "__main__":
+    main()
 
 #       **********
@@ -0,0 +1,147 @@
+import decimal
+import MySQL
+
+PayPeriods = {"BiWeekly": 26, "Monthly": 12, "SemiMonthly": 24, "Weekly": 52}
+# Number of paychecks per year for each EmployeePayInterval
+
+DefaultPayInterval = "Monthly"
+# Interval used for employees with no (or an unknown) EmployeePayInterval
+
+
+class Paycheck:
+    """ One employee's computed paycheck, rounded to the cent the way the payment form shows it """
+
+    __slots__ = ("EmployeeID", "PaymentHours", "PaymentSalary", "PaymentHousing", "PaymentGrossPay", "PaymentHSA",
+                 "PaymentSSTax", "PaymentMedicareTax", "PaymentSEWH", "PaymentFedWH", "PaymentNetPay")
+
+    def __init__(self, values):
+        for column, value in zip(self.__slots__, values):
+            setattr(self, column, value)
+
+    def __repr__(self):
+        return "Paycheck(" + ", ".join(column + "=" + repr(getattr(self, column)) for column in self.__slots__) + ")"
+
+
+def getPayPeriods(PayInterval):
+    """ Returns the number of paychecks per year for PayInterval """
+
+    return PayPeriods.get(str(PayInterval), PayPeriods[DefaultPayInterval])
+
+
+def calculatePayroll(employees, hours=None):
+    """ Computes a paycheck for every Employee record in employees and returns them as Paychecks, in the same order.
+
+    hours maps EmployeeID to the hours worked this period, for hourly pay. The whole run is computed column by column
+    with Decimal arithmetic in the same order of operations as the payment form, so results match it to the cent """
+
+    if hours is None:
+        hours = {}
+
+    # Columns of the pay run, one entry per employee
+    employeeIDs = [employee.EmployeeID for employee in employees]
+    salaries = [decimal.Decimal(employee.EmployeeSalary) for employee in employees]
+    hourlyRates = [decimal.Decimal(employee.EmployeeHourlyRate) for employee in employees]
+    housingAllowances = [decimal.Decimal(employee.EmployeeHousingAllowance) for employee in employees]
+    HSAs = [decimal.Decimal(employee.EmployeeHSA) for employee in employees]
+    fedWHs = [decimal.Decimal(employee.EmployeeFedWH) for employee in employees]
+    SEWHs = [decimal.Decimal(employee.EmployeeSEWH) for employee in employees]
+    isSE = [employee.EmployeeIsSE != 0 for employee in employees]
+    periods = [getPayPeriods(employee.EmployeePayInterval) for employee in employees]
+    worked = [decimal.Decimal(hours.get(employeeID) or 0) for employeeID in employeeIDs]
+
+    # Hourly pay, then the period's share of each yearly amount
+    hourlyPay = [rate * hoursWorked if rate != 0 and hoursWorked != 0 else decimal.Decimal(0)
+                 for rate, hoursWorked in zip(hourlyRates, worked)]
+    grossPay = [hourly + ((salary / period) + (housing / period))
+                for hourly, salary, housing, period in zip(hourlyPay, salaries, housingAllowances, periods)]
+    housingPay = [housing / period for housing, period in zip(housingAllowances, periods)]
+    HSAPay = [HSA / period for HSA, period in zip(HSAs, periods)]
+    fedWHPay = [fedWH / period for fedWH, period in zip(fedWHs, periods)]
+    SEWHPay = [SEWH / period for SEWH, period in zip(SEWHs, periods)]
+    salaryPay = [gross - housing for gross, housing in zip(grossPay, housingPay)]
+
+    # Employees pay SS and Medicare on pay after HSA; the self-employed have SE withholding instead
+    taxable = [gross - HSA for gross, HSA in zip(grossPay, HSAPay)]
+    SSTax = [decimal.Decimal(0) if SE else amount * MySQL.SocialSecurityTaxRate for amount, SE in zip(taxable, isSE)]
+    medicareTax = [decimal.Decimal(0) if SE else amount * MySQL.MedicareTaxRate for amount, SE in zip(taxable, isSE)]
+    SEWHPay = [SEWH if SE else decimal.Decimal(0) for SEWH, SE in zip(SEWHPay, isSE)]
+
+    netPay = [gross - HSA - SS - medicare - SEWH - fedWH
+              for gross, HSA, SS, medicare, SEWH, fedWH in zip(grossPay, HSAPay, SSTax, medicareTax, SEWHPay, fedWHPay)]
+
+    paychecks = []
+    for row in zip(employeeIDs, worked, salaryPay, housingPay, grossPay, HSAPay, SSTax, medicareTax, SEWHPay, fedWHPay,
+                   netPay):
+        paychecks.append(Paycheck(row[:2] + tuple(round(amount, 2) for amount in row[2:])))
+    return paychecks
+
+
+def calculatePaycheck(employee, hours=0):
+    """ Computes the paycheck for a single Employee record """
+
+    return calculatePayroll([employee], {employee.EmployeeID: hours})[0]
+
+
+def getPayInterval(employee):
+    """ Returns the pay interval employee is actually paid on, treating a missing or unknown interval as
+    DefaultPayInterval """
+
+    if str(employee.EmployeePayInterval) in PayPeriods:
+        return str(employee.EmployeePayInterval)
+    return DefaultPayInterval
+
+
+def preparePayroll(PositionID=None, PayInterval=None, hours=None):
+    """ Computes the paychecks for a pay run without saving them. Every visible employee is paid, or only those with
+    PositionID and/or PayInterval if given. Employees whose gross pay comes to zero (like hourly staff with no hours)
+    are left out """
+
+    employees = getPayrollEmployees(PositionID, PayInterval)
+    return [paycheck for paycheck in calculatePayroll(employees, hours) if paycheck.PaymentGrossPay != 0]
+
+
+def getPayrollEmployees(PositionID=None, PayInterval=None):
+    """ Returns the Employee records a pay run for PositionID and/or PayInterval covers: every visible employee, or
+    only those with PositionID and/or PayInterval if given """
+
+    employees = []
+    for employee in MySQL.getEmployeePage(hidden=False):
+        if PositionID is not None and employee.PositionID != int(PositionID):
+            continue
+        if PayInterval is not None and getPayInterval(employee) != PayInterval:
+            continue
+        employees.append(employee)
+    return employees
+
+
+def submitPayroll(paychecks, PaymentDate, PaymentTime):
+    """ Saves paychecks as payments dated PaymentDate (a datetime.date) at PaymentTime, in one transaction. Returns the
+    number of payments added """
+
+    payments = []
+    for paycheck in paychecks:
+        payments.append({
+            "EmployeeID": paycheck.EmployeeID,
+            "PaymentDate": PaymentDate,
+            "PaymentTime": PaymentTime,
+            "PaymentHours": paycheck.PaymentHours,
+            "PaymentGrossPay": paycheck.PaymentGrossPay,
+            "PaymentHousing": paycheck.PaymentHousing,
+            "PaymentHSA": paycheck.PaymentHSA,
+            "PaymentSSTax": paycheck.PaymentSSTax,
+            "PaymentMedicareTax": paycheck.PaymentMedicareTax,
+            # Payments keep SE withholding in PaymentSETax, as the payment form does
+            "PaymentSETax": paycheck.PaymentSEWH,
+            "PaymentFedWH": paycheck.PaymentFedWH,
+            "PaymentNetPay": paycheck.PaymentNetPay
+        })
+    return MySQL.addPayments(payments)
+
+
+def runPayroll(PaymentDate, PaymentTime, PositionID=None, PayInterval=None, hours=None):
+    """ Computes and saves a whole pay run (see preparePayroll) in one transaction. Returns the Paychecks paid """
+
+    with MySQL.transaction():
+        paychecks = preparePayroll(PositionID, PayInterval, hours)
+        submitPayroll(paychecks, PaymentDate, PaymentTime)
+    return paychecks
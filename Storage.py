@@ -0,0 +1,400 @@
+import datetime
+import decimal
+import re
+import sqlite3
+import threading
+import time
+import mysql.connector
+import mysql.connector.errorcode
+import mysql.connector.pooling
+
+# The databases OpenPay can keep its tables in. MySQL.py runs every query through one backend (see MySQL.getBackend()),
+# which hands out connections and cursors and knows its own SQL dialect. The SQL in MySQL.py and Migrations.py is
+# written for MySQL, and SQLiteBackend translates it as it runs.
+
+Error = (mysql.connector.Error, sqlite3.Error)
+# Errors raised by the database drivers of either backend
+
+BusyTimeout = 30
+# Seconds a SQLite connection waits for another connection to finish writing before giving up
+
+SQLiteStatementCache = 256
+# Compiled statements each SQLite connection keeps, the in-process counterpart of MySQL's prepared statements
+
+MoneyPlaces = decimal.Decimal("0.01")
+# Every DECIMAL column of OpenPay has two decimal places. SQLite has no exact decimal type and stores them as floating
+# point numbers, so values read back from SQLite are rounded to this.
+
+
+class MySQLBackend:
+    """ OpenPay's tables on a MySQL server. Connections are borrowed from a pool, so the server is only logged into
+    once per connection instead of once per query """
+
+    name = "MySQL"
+
+    Statements = {}
+    # MySQL versions of MySQL.Statements, by name. MySQL.py's statements are already MySQL
+
+    def __init__(self, login, poolSize, attempts, delay, onReset=None, database="OpenPay"):
+        self.login = login
+        # The database OpenPay's tables are in, ex. a separate one for benchmarks
+        self.database = database
+        self.poolSize = poolSize
+        self.attempts = attempts
+        self.delay = delay
+        # Called whenever the pool is rebuilt, since the prepared statements of its connections are gone
+        self.onReset = onReset
+        self.pool = None
+        # Guards creating the pool, so two worker threads starting at once do not both create it
+        self.poolLock = threading.Lock()
+
+    def getPool(self):
+        """ Returns the connection pool, creating it on first use.
+
+        The pool is created lazily because the OpenPay database has to exist before a pooled connection can select
+        it """
+
+        with self.poolLock:
+            if self.pool is None:
+                self.pool = mysql.connector.pooling.MySQLConnectionPool(pool_name=self.database,
+                                                                       pool_size=self.poolSize,
+                                                                       pool_reset_session=False,
+                                                                       database=self.database, **self.login)
+        return self.pool
+
+    def resetPool(self):
+        # Drops the pool after the server dropped its connections, so the next checkout builds a new one
+        self.pool = None
+        if self.onReset is not None:
+            self.onReset()
+        time.sleep(self.delay)
+
+    def checkConnection(self, connection):
+        """ Health check for a borrowed connection. Pings the server, reconnecting once if the connection went stale
+        while it sat in the pool. Returns True if the connection is usable """
+
+        try:
+            connection.ping(reconnect=True, attempts=1, delay=0)
+            return True
+        except mysql.connector.Error:
+            return False
+
+    def connect(self):
+        """ Takes a healthy connection out of the pool.
+
+        If the server has dropped the pooled connections (restart, timeout, network blip) the pool is rebuilt and the
+        checkout is retried up to attempts times """
+
+        for attempt in range(self.attempts):
+            try:
+                connection = self.getPool().get_connection()
+            except mysql.connector.errors.PoolError:
+                # Every connection is lent out, which only happens if one was never returned
+                raise
+            except mysql.connector.Error:
+                if attempt == self.attempts - 1:
+                    raise
+                self.resetPool()
+                continue
+            if self.checkConnection(connection):
+                return connection
+            connection.close()
+            self.resetPool()
+        raise mysql.connector.errors.InterfaceError("Could not reach the MySQL server after " + str(self.attempts) +
+                                                    " attempts")
+
+    def release(self, connection):
+        """ Returns a connection from connect() to the pool """
+
+        connection.close()
+
+    def cursor(self, connection):
+        """ Returns a buffered cursor on connection, for statements built on the fly """
+
+        return connection.cursor(buffered=True)
+
+    def preparedCursor(self, connection):
+        """ Returns a cursor that runs its statement as a server-side prepared statement """
+
+        return connection.cursor(prepared=True)
+
+    def streamingCursor(self, connection):
+        """ Returns an unbuffered cursor, which reads rows from the server as they are fetched instead of all at once.
+        Every row must be fetched before the connection runs another statement """
+
+        return connection.cursor(buffered=False)
+
+    def session(self, connection):
+        """ Returns (pooled connection, server session id) for connection. Prepared statements live as long as the
+        session, and a reconnect starts a new one """
+
+        pooled = getattr(connection, "_cnx", connection)
+        return pooled, pooled.connection_id
+
+    def openDatabase(self):
+        """ Connects to the OpenPay database, creating it first if the server does not have one """
+
+        try:
+            self.getPool()
+        except mysql.connector.Error as error:
+            if error.errno != mysql.connector.errorcode.ER_BAD_DB_ERROR:
+                raise
+            # The pool cannot select a database that does not exist yet
+            self.createDatabase()
+
+    def createDatabase(self):
+        """ Create the database if it has not already been created """
+
+        # This connection is made outside of the pool, since pooled connections select the OpenPay database on connect
+        serverConnection = mysql.connector.connect(**self.login)
+        serverCursor = serverConnection.cursor()
+        serverCursor.execute("CREATE DATABASE IF NOT EXISTS " + self.database)
+        serverCursor.close()
+        serverConnection.close()
+
+    def listDatabases(self, cursor):
+        """ Returns a row for every database on the server """
+
+        cursor.execute("SHOW DATABASES")
+        return cursor.fetchall()
+
+    def isMissingTable(self, error):
+        """ Returns True if error was raised by a query on a table that does not exist """
+
+        return isinstance(error, mysql.connector.Error) and error.errno == mysql.connector.errorcode.ER_NO_SUCH_TABLE
+
+    def lock(self, cursor, name, timeout):
+        """ Takes the server-wide lock called name, waiting up to timeout seconds for another connection to release
+        it. Returns True if the lock was taken """
+
+        cursor.execute("SELECT GET_LOCK(%s, %s)", (name, timeout))
+        return bool(cursor.fetchone()[0])
+
+    def unlock(self, cursor, name):
+        """ Releases a lock taken with lock() """
+
+        cursor.execute("SELECT RELEASE_LOCK(%s)", (name,))
+        cursor.fetchall()
+
+
+class SQLiteBackend:
+    """ OpenPay's tables in a SQLite database file, opened inside the OpenPay process. There is no server to install
+    or run and no network between OpenPay and its data, which suits single-seat installs, tests and benchmarks.
+
+    Each thread keeps one connection open for as long as it runs, so connecting costs nothing after the first query.
+    The file is in WAL mode, so worker threads can read while another thread writes. The MySQL statements of MySQL.py
+    and Migrations.py are translated by SQLiteCursor (see translate()) """
+
+    name = "SQLite"
+
+    Statements = {
+        "tableExists": "SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name = %s COLLATE NOCASE",
+        "indexExists": "SELECT COUNT(*) FROM sqlite_master "
+                       "WHERE type = 'index' AND tbl_name = %s COLLATE NOCASE AND name = %s COLLATE NOCASE",
+        "columnExists": "SELECT COUNT(*) FROM pragma_table_info(%s) WHERE name = %s COLLATE NOCASE",
+    }
+    # SQLite versions of the MySQL.Statements that read MySQL's information_schema
+
+    def __init__(self, path):
+        self.path = path
+        self.local = threading.local()
+        # Translated statements by MySQL statement, shared by every connection
+        self.translations = {}
+        # One lock per lock() name, see lock()
+        self.locks = {}
+        self.locksLock = threading.Lock()
+
+    def connect(self):
+        """ Returns the calling thread's connection, opening it on first use """
+
+        connection = getattr(self.local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=BusyTimeout, detect_types=sqlite3.PARSE_DECLTYPES,
+                                         cached_statements=SQLiteStatementCache)
+            connection.execute("PRAGMA journal_mode = WAL")
+            # WAL only needs to sync on checkpoints to stay consistent after a crash
+            connection.execute("PRAGMA synchronous = NORMAL")
+            # MySQL enforces the FOREIGN KEY clauses of the schema; SQLite only does when asked to
+            connection.execute("PRAGMA foreign_keys = ON")
+            self.local.connection = connection
+        return connection
+
+    def release(self, connection):
+        """ Keeps the connection open for the thread's next query. Changes have already been committed or rolled back
+        by MySQL.closeConnection() """
+
+    def close(self):
+        """ Closes the calling thread's connection, ex. before moving or deleting the database file. The next query
+        opens a new one """
+
+        connection = getattr(self.local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self.local.connection = None
+
+    def cursor(self, connection):
+        """ Returns a cursor on connection that runs MySQL statements """
+
+        return SQLiteCursor(self, connection.cursor())
+
+    def preparedCursor(self, connection):
+        """ Returns a cursor for one named statement. sqlite3 already keeps each connection's compiled statements (see
+        SQLiteStatementCache), so this is an ordinary cursor """
+
+        return self.cursor(connection)
+
+    def streamingCursor(self, connection):
+        """ Returns an ordinary cursor. SQLite already steps through a result as its rows are fetched """
+
+        return self.cursor(connection)
+
+    def session(self, connection):
+        """ Returns (connection, 0). A SQLite connection is never reconnected, so its session never changes """
+
+        return connection, 0
+
+    def openDatabase(self):
+        """ Opens the database file, which SQLite creates if it does not exist """
+
+        self.connect()
+
+    def createDatabase(self):
+        """ Creates the database file if it has not already been created """
+
+        self.connect()
+
+    def listDatabases(self, cursor):
+        """ Returns a row for the database file """
+
+        return [(self.path,)]
+
+    def isMissingTable(self, error):
+        """ Returns True if error was raised by a query on a table that does not exist """
+
+        return isinstance(error, sqlite3.OperationalError) and str(error).startswith("no such table")
+
+    def lock(self, cursor, name, timeout):
+        """ Takes the lock called name, waiting up to timeout seconds for another thread to release it. Returns True if
+        the lock was taken.
+
+        The lock only covers this process: a database file is meant to be used by one copy of OpenPay at a time """
+
+        with self.locksLock:
+            lock = self.locks.setdefault(name, threading.Lock())
+        return lock.acquire(timeout=timeout)
+
+    def unlock(self, cursor, name):
+        """ Releases a lock taken with lock() """
+
+        self.locks[name].release()
+
+    def translate(self, statement):
+        """ Returns statement, written for MySQL, in SQLite's dialect. Translations are kept, so each statement is
+        translated once """
+
+        translated = self.translations.get(statement)
+        if translated is None:
+            translated = statement.replace("%s", "?")
+            for pattern, replacement in Translations:
+                translated = pattern.sub(replacement, translated)
+            self.translations[statement] = translated
+        return translated
+
+
+def replaceAutoIncrement(match):
+    # SQLite only numbers rows automatically for a column declared INTEGER PRIMARY KEY, so the table's PRIMARY KEY
+    # clause moves onto the column
+    column = match.group(1)
+    statement = match.group(0).replace(column + " INT NOT NULL AUTO_INCREMENT",
+                                       column + " INTEGER PRIMARY KEY AUTOINCREMENT", 1)
+    return re.sub(r",\s*PRIMARY KEY\s*\(\s*" + column + r"\s*\)", "", statement, count=1)
+
+
+Translations = [
+    # CREATE TABLE ... ID INT NOT NULL AUTO_INCREMENT ... PRIMARY KEY ( ID )
+    (re.compile(r"(\w+) INT NOT NULL AUTO_INCREMENT.*", re.DOTALL), replaceAutoIncrement),
+    # SQLite always adds columns at the end
+    (re.compile(r" AFTER \w+$"), ""),
+    (re.compile(r"\bYEAR\(([\w.]+)\)"), r"CAST(strftime('%Y', \1) AS INTEGER)"),
+    (re.compile(r"\bMONTH\(([\w.]+)\)"), r"CAST(strftime('%m', \1) AS INTEGER)"),
+    # SQLite sums whole numbers to an int, so sums are made floating point to be read back as decimal.Decimal like
+    # MySQL's (see readRow())
+    (re.compile(r"\bSUM\(([\w.]+)\)"), r"SUM(\1 * 1.0)"),
+    # SQLite's MAX() and MIN() with several arguments are MySQL's GREATEST() and LEAST()
+    (re.compile(r"\bGREATEST\("), "MAX("),
+    (re.compile(r"\bLEAST\("), "MIN("),
+    (re.compile(r"\bON DUPLICATE KEY UPDATE\b"), "ON CONFLICT DO UPDATE SET"),
+    (re.compile(r"\bVALUES\((\w+)\)"), r"excluded.\1"),
+]
+# (pattern, replacement) pairs applied in order by SQLiteBackend.translate(), after %s placeholders become ?
+
+
+class SQLiteCursor:
+    """ A sqlite3 cursor that runs MySQL statements with %s placeholders, and returns DECIMAL columns and sums as
+    decimal.Decimal the way mysql.connector does """
+
+    def __init__(self, backend, cursor):
+        self.backend = backend
+        self.cursor = cursor
+
+    @property
+    def rowcount(self):
+        return self.cursor.rowcount
+
+    @property
+    def lastrowid(self):
+        return self.cursor.lastrowid
+
+    @property
+    def description(self):
+        return self.cursor.description
+
+    def execute(self, statement, params=()):
+        self.cursor.execute(self.backend.translate(statement), tuple(params))
+
+    def executemany(self, statement, rows):
+        self.cursor.executemany(self.backend.translate(statement), [tuple(row) for row in rows])
+
+    def fetchone(self):
+        row = self.cursor.fetchone()
+        return None if row is None else readRow(row)
+
+    def fetchmany(self, size):
+        return [readRow(row) for row in self.cursor.fetchmany(size)]
+
+    def fetchall(self):
+        return [readRow(row) for row in self.cursor.fetchall()]
+
+    def __iter__(self):
+        for row in self.cursor:
+            yield readRow(row)
+
+    def close(self):
+        self.cursor.close()
+
+
+def readRow(row):
+    # Floating point values only come from money columns and their sums, see MoneyPlaces
+    return tuple(readMoney(value) if isinstance(value, float) else value for value in row)
+
+
+def readMoney(value):
+    # Returns a floating point amount read from SQLite as a decimal.Decimal of MoneyPlaces
+    return decimal.Decimal(repr(value)).quantize(MoneyPlaces)
+
+
+def readTime(value):
+    # TIME columns come back as datetime.timedelta, like mysql.connector returns them
+    hours, minutes, seconds = value.decode().split(":")
+    return datetime.timedelta(hours=int(hours), minutes=int(minutes), seconds=float(seconds))
+
+
+# Values are stored in SQLite as the text MySQL would show for them, and read back as the types mysql.connector returns
+sqlite3.register_adapter(decimal.Decimal, str)
+sqlite3.register_adapter(datetime.date, datetime.date.isoformat)
+sqlite3.register_adapter(datetime.datetime, lambda value: value.isoformat(" "))
+sqlite3.register_adapter(datetime.time, datetime.time.isoformat)
+sqlite3.register_converter("DECIMAL", lambda value: decimal.Decimal(value.decode()).quantize(MoneyPlaces))
+sqlite3.register_converter("DATE", lambda value: datetime.date.fromisoformat(value.decode()))
+sqlite3.register_converter("DATETIME", lambda value: datetime.datetime.fromisoformat(value.decode()))
+sqlite3.register_converter("TIME", readTime)
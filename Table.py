@@ -0,0 +1,308 @@
+import collections
+import tkinter.font
+from tkinter import ttk
+
+import Diagnostics
+
+PageSize = 50
+# Rows loaded at a time when no page size is given
+
+MaxPages = 20
+# Pages a table keeps loaded at once. Scrolling past them unloads the page farthest from the view, so a table uses
+# the same memory however far it is scrolled
+
+LoadMargin = .1
+# Fraction of the loaded rows left past the view when the next page is loaded
+
+MinColumnWidth = 60
+# Narrowest a column starts out, in pixels
+
+
+class VirtualTable(ttk.Frame):
+    """ A table of rows that are loaded a page at a time as it is scrolled, drawn by a ttk.Treeview.
+
+    Rows come from a page loader, a function called as loadPage(key, rowCount) that returns (rows, nextKey). rows is a
+    list of (ID, values) pairs and nextKey is passed back to load the page after them, ex. the last EmployeeID of an
+    employee page for MySQL.getEmployeePage(beforeID=...). The first page is loaded with key None, and a page shorter
+    than rowCount is the last one.
+
+    A row may also be an (ID, values, sortKey) triple, where rows are shown in descending sortKey order. Tables with
+    sort keys can be patched one row at a time with putRow() and removeRow() instead of being reloaded.
+
+    Selecting a row sets variable to the row's ID, like the Select buttons of the old tables.
+
+    Given a Worker.Worker, pages are loaded on its threads and inserted when they arrive, so the Tk thread does not
+    wait on the database. Without one they are loaded in place """
+
+    def __init__(self, container, headers, variable=None, height=20, worker=None):
+        super().__init__(container)
+        self.variable = variable
+        self.worker = worker
+        self.loadPage = None
+        self.pageSize = PageSize
+        self.paged = True
+        # Loaded pages in display order, as [key the page was loaded with, row IDs, key of the next page]
+        self.pages = collections.deque()
+        # Keys of the pages unloaded from the top, most recently unloaded last
+        self.unloaded = []
+        self.sortKeys = {}
+        self.finished = True
+        self.scheduled = False
+        # True while a page is being loaded by the worker, and the Token to cancel it
+        self.loading = False
+        self.token = None
+        # Counts reloads and cancels, so a page that arrives after its table was reloaded is thrown away
+        self.generation = 0
+
+        self.headers = None
+        self.tree = ttk.Treeview(self, show="headings", height=height, selectmode="browse")
+        self.setHeaders(headers)
+
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=self.onScroll)
+        self.scrollbar.pack(side="right", fill="y")
+        self.tree.pack(side="left", fill="both", expand=True)
+
+        self.tree.bind("<<TreeviewSelect>>", self.onSelect)
+
+    def setHeaders(self, headers):
+        """ Changes the table's columns to headers, removing every row if they are different """
+
+        if list(headers) == self.headers:
+            return
+        self.clear()
+        self.headers = list(headers)
+        columns = [str(index) for index in range(len(headers))]
+        self.tree.configure(columns=columns)
+        font = tkinter.font.nametofont("TkHeadingFont")
+        for column, header in zip(columns, headers):
+            self.tree.heading(column, text=header)
+            self.tree.column(column, anchor="center", width=max(MinColumnWidth, font.measure(header) + 20))
+
+    def show(self, loadPage, pageSize=PageSize, paged=True):
+        """ Replaces the table's rows with the first page from loadPage. With paged=False only the first page is ever
+        shown, as in the home page previews """
+
+        self.loadPage = loadPage
+        self.pageSize = pageSize
+        self.paged = paged
+        self.reload()
+
+    def showRows(self, rows):
+        """ Replaces the table's rows with rows, a list of (ID, values) pairs that are already in memory """
+
+        self.show(lambda key, rowCount: (rows, None), max(len(rows), 1), paged=False)
+
+    def reload(self):
+        """ Loads the first page again, keeping the selected row selected if it is on it """
+
+        self.clear()
+        if self.loadPage is not None:
+            self.finished = False
+            self.loadNext()
+
+    def cancel(self):
+        """ Stops loading the page being loaded, ex. when the table's page is left. The next scroll loads it again """
+
+        self.generation += 1
+        self.loading = False
+        if self.token is not None:
+            self.token.cancel()
+            self.token = None
+
+    def resume(self):
+        """ Loads the first page if it was cancelled before it arrived """
+
+        if not self.pages and not self.finished:
+            self.loadNext()
+
+    def clear(self):
+        """ Removes every row """
+
+        self.cancel()
+        self.tree.delete(*self.tree.get_children())
+        self.pages.clear()
+        self.unloaded = []
+        self.sortKeys = {}
+        self.finished = True
+
+    def insertPage(self, rows, index):
+        """ Inserts rows at index (a row number, or 'end'), skipping any already shown by another page. Returns the IDs
+        inserted """
+
+        IDs = []
+        for row in rows:
+            iid = str(row[0])
+            if self.tree.exists(iid):
+                continue
+            self.tree.insert('', index if index == 'end' else index + len(IDs), iid=iid, values=self.cells(row[1]))
+            if len(row) > 2:
+                self.sortKeys[iid] = row[2]
+            IDs.append(iid)
+        return IDs
+
+    def cells(self, values):
+        # Treeview shows None as "None"
+        return ['' if value is None else value for value in values]
+
+    def forget(self, IDs):
+        # Deletes the rows with IDs from the tree
+        self.tree.delete(*IDs)
+        for iid in IDs:
+            self.sortKeys.pop(iid, None)
+
+    def putRow(self, row):
+        """ Shows row, an (ID, values, sortKey) triple, in place: an existing row with ID is updated, and a new row is
+        inserted in sort order if it falls within the loaded pages. Returns True if the row is shown """
+
+        iid = str(row[0])
+        if self.tree.exists(iid) and self.sortKeys.get(iid) == row[2]:
+            self.tree.item(iid, values=self.cells(row[1]))
+            return True
+        if self.tree.exists(iid):
+            # Its sort key changed, so it moves
+            self.dropRow(iid)
+
+        # Finds the first loaded row that sorts after the new one
+        index = 0
+        for page in self.pages:
+            for pageIndex in range(len(page[1])):
+                if self.sortKeys.get(page[1][pageIndex], row[2]) < row[2]:
+                    break
+                index += 1
+            else:
+                continue
+            break
+        else:
+            if not self.finished:
+                # It belongs to a page that has not been loaded yet
+                return False
+            page = self.pages[-1] if self.pages else None
+            pageIndex = len(page[1]) if page else 0
+        if index == 0 and self.unloaded:
+            # It belongs to a page unloaded above the view
+            return False
+
+        if page is None:
+            page = [None, [], None]
+            self.pages.append(page)
+        self.tree.insert('', index, iid=iid, values=self.cells(row[1]))
+        self.sortKeys[iid] = row[2]
+        page[1].insert(pageIndex, iid)
+
+        if not self.paged and len(self.tree.get_children()) > self.pageSize:
+            # Tables of one page, like the home page previews, keep their size
+            last = self.pages[-1][1].pop()
+            self.forget([last])
+        return True
+
+    def dropRow(self, iid):
+        # Deletes one shown row and its place in its page
+        self.forget([iid])
+        for page in self.pages:
+            if iid in page[1]:
+                page[1].remove(iid)
+
+    def removeRow(self, ID):
+        """ Removes the row with ID, if it is shown. Returns True if it was """
+
+        iid = str(ID)
+        if not self.tree.exists(iid):
+            return False
+        self.dropRow(iid)
+        if not self.paged and self.loadPage is not None:
+            # Tables of one page are filled back up to their size
+            self.reload()
+        return True
+
+    def request(self, key, insert):
+        """ Loads the page with key and passes it to insert(key, rows, nextKey), on the worker if there is one """
+
+        if self.worker is None:
+            insert(key, *self.loadPage(key, self.pageSize))
+            return
+
+        loadPage = self.loadPage
+        pageSize = self.pageSize
+        generation = self.generation
+
+        def done(page):
+            if generation == self.generation:
+                self.loading = False
+                self.token = None
+                insert(key, *page)
+
+        def failed(error):
+            if generation == self.generation:
+                self.loading = False
+                self.token = None
+            self.worker.report(error)
+
+        self.loading = True
+        self.token = self.worker.submit(lambda token: loadPage(key, pageSize), done, failed)
+
+    def loadNext(self):
+        """ Loads the page after the last one shown """
+
+        if self.finished or self.loadPage is None or self.loading:
+            return
+        self.request(self.pages[-1][2] if self.pages else None, self.insertNext)
+
+    def insertNext(self, key, rows, nextKey):
+        # Shows a page loaded by loadNext() below the loaded pages
+        self.pages.append([key, self.insertPage(rows, 'end'), nextKey])
+        self.finished = not self.paged or len(rows) < self.pageSize or nextKey is None
+        if len(self.pages) == 1 and self.variable is not None and self.tree.exists(str(self.variable.get())):
+            # Keeps the selected row selected after a reload
+            self.tree.selection_set(str(self.variable.get()))
+
+        if len(self.pages) > MaxPages:
+            # Unloads the top page and scrolls up by as many rows, so the rows in view stay in place
+            key, IDs, nextKey = self.pages.popleft()
+            self.unloaded.append(key)
+            self.forget(IDs)
+            self.tree.yview_scroll(-len(IDs), "units")
+
+    def loadPrevious(self):
+        """ Loads the page above the first one shown again, after it was unloaded by scrolling down """
+
+        if not self.unloaded or self.loading:
+            return
+        self.request(self.unloaded[-1], self.insertPrevious)
+
+    def insertPrevious(self, key, rows, nextKey):
+        # Shows a page loaded by loadPrevious() above the loaded pages
+        self.unloaded.pop()
+        IDs = self.insertPage(rows, 0)
+        self.pages.appendleft([key, IDs, nextKey])
+        self.tree.yview_scroll(len(IDs), "units")
+
+        if len(self.pages) > MaxPages:
+            # Unloads the bottom page. It is loaded again from the page above it when scrolled back to
+            key, IDs, nextKey = self.pages.pop()
+            self.forget(IDs)
+            self.finished = False
+
+    def onScroll(self, first, last):
+        # Moves the scrollbar, and loads the next or previous page when the view comes near the end of the loaded rows
+        self.scrollbar.set(first, last)
+        if self.scheduled:
+            return
+        if float(last) >= 1 - LoadMargin and not self.finished:
+            self.scheduled = True
+            self.after_idle(self.loadScheduled, self.loadNext)
+        elif float(first) <= LoadMargin and self.unloaded:
+            self.scheduled = True
+            self.after_idle(self.loadScheduled, self.loadPrevious)
+
+    def loadScheduled(self, load):
+        # Runs a page load scheduled by onScroll
+        self.scheduled = False
+        with Diagnostics.action("scrollTable"):
+            load()
+
+    def onSelect(self, event):
+        # Sets variable to the ID of the selected row
+        selection = self.tree.selection()
+        if selection and self.variable is not None:
+            self.variable.set(int(selection[0]))
@@ -0,0 +1,112 @@
+import decimal
+import itertools
+import types
+import unittest
+
+import MySQL
+import Payroll
+
+# Checks that Payroll.calculatePayroll matches the payment form's original calculation to the cent. formPaycheck() below
+# is that calculation as it was written in OpenPay.py before Payroll.py existed, so a change to Payroll.py that moves
+# any amount by a cent fails here.
+
+Intervals = ("BiWeekly", "Monthly", "SemiMonthly", "Weekly", None)
+# Every pay interval the form handled. None is paid monthly
+
+Amounts = {"EmployeeSalary": ("0", "41234.57", "100000"), "EmployeeHourlyRate": ("0", "17.33"),
+           "EmployeeHousingAllowance": ("0", "12345.67"), "EmployeeHSA": ("0", "1850.01"),
+           "EmployeeFedWH": ("0", "3999.99"), "EmployeeSEWH": ("0", "7777.77")}
+# Values of each yearly amount tested, chosen so the period's share does not come to whole cents
+
+Hours = ("0", "12.5", "80")
+
+
+def makeEmployee(EmployeeID, interval, isSE, amounts):
+    # An Employee record with only the columns the pay calculation reads
+    employee = types.SimpleNamespace(EmployeeID=EmployeeID, EmployeePayInterval=interval, EmployeeIsSE=isSE)
+    for column, value in amounts.items():
+        setattr(employee, column, decimal.Decimal(value))
+    return employee
+
+
+def formPaycheck(employee, hours):
+    """ The payment form's calculatePayroll from before Payroll.py, without the form. Returns the amounts it showed:
+    salary, housing, gross pay, HSA, SS tax, Medicare tax, SE withholding, federal withholding and net pay """
+
+    PaymentHours = decimal.Decimal(hours) if hours != '' else 0
+    periods = {"BiWeekly": 26, "Monthly": 12, "None": 12, "SemiMonthly": 24, "Weekly": 52}[
+        str(employee.EmployeePayInterval)]
+
+    PaymentGrossPay = 0
+    if not (employee.EmployeeHourlyRate == 0) and not (PaymentHours == 0):
+        PaymentGrossPay += employee.EmployeeHourlyRate * PaymentHours
+    PaymentGrossPay += (employee.EmployeeSalary / periods) + (employee.EmployeeHousingAllowance / periods)
+    PaymentHousing = employee.EmployeeHousingAllowance / periods
+    PaymentHSA = employee.EmployeeHSA / periods
+    PaymentFedWH = employee.EmployeeFedWH / periods
+    PaymentSEWH = employee.EmployeeSEWH / periods
+    PaymentSalary = PaymentGrossPay - PaymentHousing
+
+    if employee.EmployeeIsSE == 0:
+        PaymentSSTax = (PaymentGrossPay - PaymentHSA) * MySQL.SocialSecurityTaxRate
+        PaymentMedicareTax = (PaymentGrossPay - PaymentHSA) * MySQL.MedicareTaxRate
+        PaymentSEWH = 0
+    else:
+        PaymentSSTax = 0
+        PaymentMedicareTax = 0
+
+    PaymentNetPay = PaymentGrossPay - PaymentHSA - PaymentSSTax - PaymentMedicareTax - PaymentSEWH - PaymentFedWH
+
+    return [round(amount, 2) for amount in (PaymentSalary, PaymentHousing, PaymentGrossPay, PaymentHSA, PaymentSSTax,
+                                            PaymentMedicareTax, PaymentSEWH, PaymentFedWH, PaymentNetPay)]
+
+
+def paycheckAmounts(paycheck):
+    # A Paycheck's amounts in the order formPaycheck() returns them
+    return [paycheck.PaymentSalary, paycheck.PaymentHousing, paycheck.PaymentGrossPay, paycheck.PaymentHSA,
+            paycheck.PaymentSSTax, paycheck.PaymentMedicareTax, paycheck.PaymentSEWH, paycheck.PaymentFedWH,
+            paycheck.PaymentNetPay]
+
+
+def makeCases():
+    """ Returns [(employee, hours)] for every interval, SE and non-SE, and each combination of Amounts and Hours """
+
+    cases = []
+    columns = list(Amounts)
+    for interval, isSE, hours in itertools.product(Intervals, (0, 1), Hours):
+        for values in itertools.product(*(Amounts[column] for column in columns)):
+            employee = makeEmployee(len(cases) + 1, interval, isSE, dict(zip(columns, values)))
+            cases.append((employee, hours))
+    return cases
+
+
+class PayrollParityTest(unittest.TestCase):
+
+    def checkParity(self, employee, hours, paycheck):
+        self.assertEqual(paycheckAmounts(paycheck), formPaycheck(employee, hours),
+                         "interval " + str(employee.EmployeePayInterval) + ", SE " + str(employee.EmployeeIsSE) +
+                         ", hours " + hours + ", " + repr(employee))
+
+    def testCalculatePaycheck(self):
+        for employee, hours in makeCases():
+            self.checkParity(employee, hours, Payroll.calculatePaycheck(employee, decimal.Decimal(hours)))
+
+    def testCalculatePayroll(self):
+        # A whole run computed at once must give every employee the same paycheck as computing them one at a time
+        cases = makeCases()
+        hours = {employee.EmployeeID: decimal.Decimal(worked) for employee, worked in cases}
+        paychecks = Payroll.calculatePayroll([employee for employee, worked in cases], hours)
+        self.assertEqual(len(paychecks), len(cases))
+        for (employee, worked), paycheck in zip(cases, paychecks):
+            self.assertEqual(paycheck.EmployeeID, employee.EmployeeID)
+            self.checkParity(employee, worked, paycheck)
+
+    def testHoursWithoutHourlyRate(self):
+        # Hours only count for employees with an hourly rate
+        employee = makeEmployee(1, "Weekly", 0, {column: values[-1] for column, values in Amounts.items()})
+        employee.EmployeeHourlyRate = decimal.Decimal(0)
+        self.checkParity(employee, "40", Payroll.calculatePaycheck(employee, decimal.Decimal(40)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,2 @@
+# OpenPay's tests. They need no database or window; run py -m unittest discover -s Tests -p "Test*.py" from the OpenPay
+# folder.
@@ -0,0 +1,149 @@
+import concurrent.futures
+import queue
+import threading
+
+import Diagnostics
+
+Workers = 3
+# Threads running database work. Each borrows its own pooled connection, so this stays below MySQL.PoolSize to leave a
+# connection for the Tk thread's quick lookups
+
+PollInterval = 50
+# Milliseconds between checks for finished work on the Tk thread
+
+
+class Cancelled(Exception):
+    """ Raised inside work whose Token was cancelled, to stop it early """
+
+
+class Token:
+    """ Cancels one piece of work submitted to a Worker.
+
+    Cancelling cannot interrupt a query that is already running, but the work's result is thrown away instead of being
+    shown, and long work that calls check() between steps stops at the next one """
+
+    def __init__(self):
+        self.cancelled = False
+
+    def cancel(self):
+        """ Marks the work as cancelled """
+
+        self.cancelled = True
+
+    def check(self):
+        """ Raises Cancelled if the work was cancelled """
+
+        if self.cancelled:
+            raise Cancelled()
+
+
+class Worker:
+    """ Runs database work on background threads so the Tk mainloop never waits on MySQL.
+
+    Tk widgets may only be used from the thread running mainloop, so results come back through a queue that the Tk
+    thread empties every PollInterval milliseconds with root.after. Work is submitted as submit(work, done): work(token)
+    runs on a worker thread and done(result) then runs on the Tk thread, unless the work was cancelled """
+
+    def __init__(self, root, workers=Workers, indicator=None):
+        self.root = root
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers, thread_name_prefix="OpenPay")
+        # Callables waiting to run on the Tk thread
+        self.calls = queue.Queue()
+        self.mainThread = threading.current_thread()
+        # indicator(busy) is called on the Tk thread whenever work starts or all work finishes, to show a loading
+        # indicator
+        self.indicator = indicator
+        self.busy = 0
+        # Callables waiting for all work to finish, see whenIdle()
+        self.idleCallbacks = []
+        self.closed = False
+        self.root.after(PollInterval, self.poll)
+
+    def submit(self, work, done=None, failed=None, token=None):
+        """ Runs work(token) on a worker thread, then done(result) on the Tk thread. If work raises, failed(error) is
+        called on the Tk thread instead, or the error is reported like any Tk callback error. Returns the work's
+        Token.
+
+        Both run as part of the Diagnostics action that submitted the work, so their queries are counted against it """
+
+        if token is None:
+            token = Token()
+        self.setBusy(1)
+        self.executor.submit(self.run, work, done, failed, token, Diagnostics.current())
+        return token
+
+    def run(self, work, done, failed, token, invocation):
+        # Runs on a worker thread
+        try:
+            token.check()
+            with Diagnostics.within(invocation):
+                result = work(token)
+        except Cancelled:
+            self.call(self.finish, token, None, None, invocation)
+        except Exception as error:
+            self.call(self.finish, token, failed or self.report, error, invocation)
+        else:
+            self.call(self.finish, token, done, result, invocation)
+
+    def finish(self, token, callback, argument, invocation):
+        # Runs on the Tk thread once work is over
+        self.setBusy(-1)
+        if callback is not None and not token.cancelled:
+            with Diagnostics.within(invocation):
+                callback(argument)
+
+    def report(self, error):
+        # Reports an error of work submitted without failed, the way Tk reports errors in callbacks
+        self.root.report_callback_exception(type(error), error, error.__traceback__)
+
+    def setBusy(self, change):
+        # Counts the work running, telling the indicator when it goes from none to some and back
+        self.busy += change
+        if self.indicator is not None and self.busy == (1 if change > 0 else 0):
+            self.indicator(self.busy > 0)
+        if self.busy == 0:
+            callbacks, self.idleCallbacks = self.idleCallbacks, []
+            for callback in callbacks:
+                callback()
+
+    def whenIdle(self, callback):
+        """ Calls callback() on the Tk thread once no work is running, ex. once every table of a page has loaded """
+
+        if self.busy == 0:
+            callback()
+        else:
+            self.idleCallbacks.append(callback)
+
+    def call(self, function, *args):
+        """ Runs function(*args) on the Tk thread. Safe to call from any thread """
+
+        if threading.current_thread() is self.mainThread:
+            function(*args)
+        else:
+            self.calls.put((function, args))
+
+    def onMainThread(self, callback):
+        """ Returns a function that runs callback on the Tk thread with the arguments it is called with, ex. for
+        Events.py subscribers, since events are sent by whichever thread committed the change """
+
+        return lambda *args: self.call(callback, *args)
+
+    def poll(self):
+        # Runs the callables queued by worker threads, then checks again after PollInterval
+        while True:
+            try:
+                function, args = self.calls.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                function(*args)
+            except Exception as error:
+                self.report(error)
+        if not self.closed:
+            self.root.after(PollInterval, self.poll)
+
+    def shutdown(self):
+        """ Stops polling and waits for running work to finish. Work that has not started is dropped """
+
+        self.closed = True
+        self.executor.shutdown(wait=True, cancel_futures=True)